@@ -12,8 +12,8 @@ from sd.api.sdarray import SDArray
 from sd.api.sdgraph import SDGraph
 from sd.api.sdapplication import SDApplication
 
-from paramcopy.pccore import pclog, pcdata, pchelper, pcparam, pccopier, pcnodeid, pcprefs, pcstatemgr, pcinspector
-from paramcopy.pcui import pcuimgr, pctoolbar, paramdlg, copydlg, pastedlg, paramtree, prefsdlg, statesdlg, newstatedlg, clipboardsdlg
+from paramcopy.pccore import pclog, pcdata, pchelper, pcparam, pccopier, pcnodeid, pcprefs, pcstatemgr, pcinspector, pcpasteplan, pcparammeta, pcvalue, pcnoderesolver, pccomputesched, pcjob, pcundo, pclibrary, pcvariationindex, pcdefaults, pcintern, pcfingerprint, pcrecallmerge, pcrecallslots, pcblend, pcrandomizer, pcseedroll, pcsweep, pcpastepresets, pcmulticlip, pcinputlock
+from paramcopy.pcui import pcuimgr, pctoolbar, paramdlg, copydlg, pastedlg, paramtree, prefsdlg, statesdlg, newstatedlg, clipboardsdlg, randomizedlg, sweepdlg
 
 def initializeSDPlugin():
     # module reloads enable modifications without restarting the host, used for development only
@@ -26,6 +26,27 @@ def initializeSDPlugin():
     # importlib.reload(pcprefs)
     # importlib.reload(pcstatemgr)
     # importlib.reload(pcinspector)
+    # importlib.reload(pcpasteplan)
+    # importlib.reload(pcparammeta)
+    # importlib.reload(pcvalue)
+    # importlib.reload(pcnoderesolver)
+    # importlib.reload(pccomputesched)
+    # importlib.reload(pcjob)
+    # importlib.reload(pcundo)
+    # importlib.reload(pcinputlock)
+    # importlib.reload(pclibrary)
+    # importlib.reload(pcvariationindex)
+    # importlib.reload(pcdefaults)
+    # importlib.reload(pcintern)
+    # importlib.reload(pcfingerprint)
+    # importlib.reload(pcrecallmerge)
+    # importlib.reload(pcrecallslots)
+    # importlib.reload(pcblend)
+    # importlib.reload(pcrandomizer)
+    # importlib.reload(pcseedroll)
+    # importlib.reload(pcsweep)
+    # importlib.reload(pcpastepresets)
+    # importlib.reload(pcmulticlip)
 
     # importlib.reload(pcuimgr)
     # importlib.reload(pctoolbar)
@@ -37,6 +58,8 @@ def initializeSDPlugin():
     # importlib.reload(statesdlg)
     # importlib.reload(newstatedlg)
     # importlib.reload(clipboardsdlg)
+    # importlib.reload(randomizedlg)
+    # importlib.reload(sweepdlg)
 
     cleanGlobals()
     pclog.PCLogger.instance().log(pcdata.PCData.APP_NAME + " starting")
@@ -50,10 +73,26 @@ def cleanGlobals():
     pccopier.PCCopier.inst = None
     pcprefs.PCPrefs.inst = None
     pcstatemgr.PCStateMgr.inst = None
+    pcparammeta.PCParamMetaCache.inst = None
+    pccomputesched.PCComputeScheduler.inst = None
+    pcundo.PCUndoMgr.inst = None
+    pcvalue.PCValueCodec.sdTypes = {}
+    pclibrary.PCLibrary.inst = None
+    pcdefaults.PCDefaultsTable.inst = None
+    pcintern.PCIntern.inst = None
+    pcfingerprint.PCLiveFingerprints.inst = None
+    pcrecallslots.PCRecallSlots.inst = None
+    pcseedroll.PCSeedRoller.inst = None
+    pcpastepresets.PCPastePresets.inst = None
+    paramtree.PCParamTreeTemplates.inst = None
 
 def uninitializeSDPlugin():
     pcUiMgr = pcuimgr.PCUIMgr.instance()
     pcUiMgr.removeUI()
+    if pcstatemgr.PCStateMgr.inst:
+        pcstatemgr.PCStateMgr.inst.close()
+    if pclibrary.PCLibrary.inst:
+        pclibrary.PCLibrary.inst.close() # complete pending writes
     cleanGlobals()
     pclog.log(pcdata.PCData.APP_NAME + " ending")
     pclog.PCLogger.destroyLogger()
@@ -0,0 +1,156 @@
+# ---------------
+# ParamCopy - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+try:
+    import numpy
+except ImportError:
+    numpy = None # not shipped with every Designer version, variation blending is then unavailable
+
+from sd.api.sdproperty import SDPropertyCategory
+from sd.api.apiexception import APIException
+
+from paramcopy.pccore.pchelper import PCHelper
+from paramcopy.pccore.pcnoderesolver import PCNodeResolver
+from paramcopy.pccore.pcparam import PCParam
+from paramcopy.pccore.pcvalue import PCValueCodec
+
+class PCVariationBlend:
+    """
+    Weighted blend of two or more variations. Numeric parameters (int, float, double, their vector forms
+    and colors) are interpolated in a single vectorized pass: their stored components are packed once into
+    a (component, variation) matrix, so blending is a matrix product whatever the node count. Other parameters
+    (enums, bools, strings...) and inheritance methods snap to the variation having the highest weight, i.e.
+    half-way between two variations. Parameters are blended over the variations storing them only.
+    Successive evaluations only return the parameters whose blended value changed (see evaluate()).
+    """
+    class Entry:
+    # a (node, property) to blend
+        def __init__(self, node, param, variationCount):
+            self.node = node
+            self.propertyId = param.id
+            self.label = param.label
+            self.encodedValues = [None] * variationCount # per variation, None if not stored by the variation
+            self.inheritanceMethods = [-1] * variationCount
+            self.tag = None # numeric tag if all the stored values are numeric with this same tag, None otherwise
+            self.row = -1 # first row of the components in the packed matrix, -1 if not numeric
+
+    @classmethod
+    def isAvailable(cls):
+        return numpy != None
+
+    def __init__(self, stateSets, resolver = None):
+        self.variationCount = len(stateSets)
+        self.entries = []
+        self.misses = 0 # count of variation nodes which could not be found
+        self.compile(stateSets, resolver if resolver else PCNodeResolver())
+        self.lastBlended = None # blended components of the previous evaluation
+        self.lastChoices = None # variation chosen for snapping in the previous evaluation
+
+    def evaluate(self, weights):
+        # returns the list of (Entry, encoded value, inheritance method) changed since the previous evaluation
+        w = numpy.asarray(weights, dtype = numpy.float64)
+        scores = numpy.where(self.presence, w, -numpy.inf)
+        choices = numpy.argmax(scores, axis = 1)
+
+        blended = self.values @ w
+        totals = self.rowPresence @ w
+        blendable = totals > 0 # components only stored by variations with a null weight snap instead
+        blended = numpy.where(blendable, blended / numpy.where(blendable, totals, 1.0), self.values[numpy.arange(len(self.rowEntries)), choices[self.rowEntries]])
+        blended = numpy.where(self.constantRows, self.constantValues, blended) # exact values where there is nothing to interpolate
+
+        changed = numpy.ones(len(self.entries), dtype = bool) if self.lastChoices is None else choices != self.lastChoices
+        if self.lastBlended is not None and len(blended) > 0:
+            changedRows = blended != self.lastBlended
+            changed[self.rowEntries[changedRows]] = True
+        self.lastBlended = blended
+        self.lastChoices = choices
+
+        changes = []
+        for index in numpy.flatnonzero(changed):
+            entry = self.entries[index]
+            choice = choices[index]
+            if entry.tag:
+                encodedValue = (entry.tag, self.payload(entry, blended))
+            else:
+                encodedValue = entry.encodedValues[choice]
+            changes.append((entry, encodedValue, entry.inheritanceMethods[choice]))
+        return changes
+
+    @classmethod
+    def writeChange(cls, change, skipUnchanged = False, stats = None):
+        entry, encodedValue, inheritanceMethod = change
+        PCParam.view(entry.propertyId, entry.label, inheritanceMethod, encodedValue).writeInto(entry.node, skipUnchanged, stats)
+
+    # --- Private
+    def compile(self, stateSets, resolver):
+        entryDict = {} # key: (package id, graph id, node id, property id), val: Entry
+        for variation, stateSet in enumerate(stateSets):
+            steps, misses = stateSet.recallSteps(resolver)
+            self.misses += misses
+            for nodeState, node in steps:
+                nodeIdentifier = nodeState.nodeIdentifier
+                for propertyId, param in nodeState.effectiveParams().items():
+                    key = (nodeIdentifier.packageId, nodeIdentifier.graphId, nodeIdentifier.nodeId, propertyId)
+                    if key in entryDict:
+                        entry = entryDict[key]
+                    else:
+                        entry = PCVariationBlend.Entry(node, param, self.variationCount) if self.isWritable(node, propertyId) else None
+                        entryDict[key] = entry
+                        if entry:
+                            self.entries.append(entry)
+                    if not entry:
+                        continue
+                    if param.isDecodableFor(node):
+                        entry.encodedValues[variation] = param.encodedValue
+                        entry.inheritanceMethods[variation] = param.inheritanceMethod
+        self.entries = [entry for entry in self.entries if any(encodedValue != None for encodedValue in entry.encodedValues)]
+        self.pack()
+
+    def isWritable(self, node, propertyId):
+        try:
+            prop = node.getPropertyFromId(propertyId, SDPropertyCategory.Input)
+            return prop != None and not PCHelper.isInputParamFunctionDriven(node, prop) # make sure not to copy over a user function
+        except APIException as e:
+            PCHelper.logSDException(e)
+            return False
+
+    def pack(self):
+        rowCount = 0
+        for entry in self.entries:
+            tags = set(encodedValue[0] for encodedValue in entry.encodedValues if encodedValue != None)
+            if len(tags) == 1:
+                tag = tags.pop()
+                if tag in PCValueCodec.NUMERIC_WIDTHS:
+                    entry.tag = tag
+                    entry.row = rowCount
+                    rowCount += PCValueCodec.NUMERIC_WIDTHS[tag]
+
+        self.presence = numpy.array([[encodedValue != None for encodedValue in entry.encodedValues] for entry in self.entries], dtype = bool).reshape(len(self.entries), self.variationCount)
+        self.values = numpy.zeros((rowCount, self.variationCount))
+        self.rowPresence = numpy.zeros((rowCount, self.variationCount))
+        self.rowEntries = numpy.zeros(rowCount, dtype = numpy.intp) # entry index of each row
+        for index, entry in enumerate(self.entries):
+            if entry.tag:
+                width = PCValueCodec.NUMERIC_WIDTHS[entry.tag]
+                rows = slice(entry.row, entry.row + width)
+                self.rowEntries[rows] = index
+                for variation, encodedValue in enumerate(entry.encodedValues):
+                    if encodedValue != None:
+                        self.values[rows, variation] = encodedValue[1] if width > 1 else (encodedValue[1],)
+                        self.rowPresence[rows, variation] = 1.0
+
+        # rows whose stored components are all equal
+        present = self.rowPresence > 0
+        self.constantValues = numpy.max(numpy.where(present, self.values, -numpy.inf), axis = 1, initial = -numpy.inf)
+        self.constantRows = self.constantValues == numpy.min(numpy.where(present, self.values, numpy.inf), axis = 1, initial = numpy.inf)
+
+    def payload(self, entry, blended):
+        width = PCValueCodec.NUMERIC_WIDTHS[entry.tag]
+        components = blended[entry.row:entry.row + width]
+        if entry.tag in PCValueCodec.INT_TAGS:
+            components = [int(c) for c in numpy.rint(components)]
+        else:
+            components = [float(c) for c in components]
+        return components[0] if width == 1 else tuple(components)
@@ -0,0 +1,122 @@
+# ---------------
+# ParamCopy - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+import time
+
+import sd
+if sd.getContext().getSDApplication().getVersion() < "14.0.0":
+    from PySide2.QtCore import QObject, QTimer, QEvent
+    from PySide2.QtWidgets import QApplication
+else:
+    from PySide6.QtCore import QObject, QTimer, QEvent
+    from PySide6.QtWidgets import QApplication
+
+from sd.api.apiexception import APIException
+
+from paramcopy.pccore.pchelper import PCHelper
+from paramcopy.pccore.pcprefs import PCPrefs
+from paramcopy.pccore import pclog
+
+class PCComputeScheduler(QObject):
+    """
+    Graph compute requests issued after ParamCopy operations. Requests are debounced per graph
+    so that a burst of operations results in a single compute. The duration of each compute is
+    measured: graphs whose last compute exceeded the configured budget are only computed once
+    the user has been idle for the configured delay.
+    """
+    inst = None
+
+    USER_ACTIVITY_EVENTS = (QEvent.KeyPress, QEvent.MouseButtonPress, QEvent.MouseButtonRelease, QEvent.MouseMove, QEvent.Wheel)
+
+    class GraphEntry:
+        def __init__(self, graph):
+            self.graph = graph
+            self.pending = False
+            self.lastComputeDuration = 0.0 # in seconds, 0 if never computed
+
+    @classmethod
+    def instance(cls):
+        if not cls.inst:
+            cls.inst = PCComputeScheduler()
+        return cls.inst
+
+    def __init__(self):
+        super().__init__()
+        self.entries = {} # key: graph key (package id, graph id), val: GraphEntry
+        self.lastUserActivity = time.monotonic()
+        self.activityFilterInstalled = False
+        self.timer = QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.onTimer)
+
+    # --- Public
+    def requestCompute(self, graph):
+        if not graph:
+            return
+        graphKey = (PCHelper.getPackageId(graph.getPackage()), graph.getIdentifier())
+        entry = self.entries.get(graphKey)
+        if not entry:
+            entry = PCComputeScheduler.GraphEntry(graph)
+            self.entries[graphKey] = entry
+        entry.graph = graph
+        entry.pending = True
+        self.lastUserActivity = time.monotonic()
+        self.timer.start(PCPrefs.instance().computeDebounceMs) # restarted on each request
+
+    def requestCurrentGraphCompute(self):
+        self.requestCompute(PCHelper.getCurrentGraph())
+
+    def cleanup(self):
+        self.timer.stop()
+        self.setActivityFilter(False)
+        self.entries = {}
+
+    # --- Qt
+    def eventFilter(self, obj, event):
+        if event.type() in PCComputeScheduler.USER_ACTIVITY_EVENTS:
+            self.lastUserActivity = time.monotonic()
+        return False
+
+    # --- Private
+    def onTimer(self):
+        prefs = PCPrefs.instance()
+        budget = prefs.computeBudgetMs / 1000.0
+        idleDelay = prefs.computeIdleDelayMs / 1000.0
+        idleTime = time.monotonic() - self.lastUserActivity
+        deferred = False
+
+        for entry in self.entries.values():
+            if entry.pending:
+                if entry.lastComputeDuration > budget and idleTime < idleDelay:
+                    deferred = True # heavy graph, wait for the user to be idle
+                else:
+                    self.compute(entry)
+
+        self.setActivityFilter(deferred)
+        if deferred:
+            remainingMs = int((idleDelay - idleTime) * 1000)
+            self.timer.start(max(remainingMs, prefs.computeDebounceMs))
+
+    def compute(self, entry):
+        entry.pending = False
+        start = time.perf_counter()
+        try:
+            entry.graph.compute()
+        except APIException as e:
+            PCHelper.logSDException(e)
+        entry.lastComputeDuration = time.perf_counter() - start
+        if entry.lastComputeDuration > PCPrefs.instance().computeBudgetMs / 1000.0:
+            pclog.log("Graph compute took " + str(int(entry.lastComputeDuration * 1000)) + " ms, next computes of this graph will wait for user idle time.")
+
+    def setActivityFilter(self, install):
+        # user activity is only tracked while computes are deferred
+        if install != self.activityFilterInstalled:
+            app = QApplication.instance()
+            if app:
+                if install:
+                    app.installEventFilter(self)
+                else:
+                    app.removeEventFilter(self)
+                self.activityFilterInstalled = install
@@ -10,6 +10,10 @@ from paramcopy.pccore.pchelper import PCHelper
 from paramcopy.pccore.pcnodeid import PCNodeIdentifier
 from paramcopy.pccore.pcstatemgr import PCNodeState
 from paramcopy.pccore.pcparam  import PCParam, PCParamCollection
+from paramcopy.pccore.pcpasteplan import PCPastePlan
+from paramcopy.pccore.pcundo import PCUndoGroup
+from paramcopy.pccore.pclibrary import PCLibrary
+from paramcopy.pccore.pcmulticlip import PCMultiClipboard
 
 class PCCopier:
     inst = None
@@ -27,19 +31,49 @@ class PCCopier:
 
     def __init__(self):
         self.currentClipboard = None
+        self.currentMultiClipboard = None # set when the last copy was a multiple node selection, see setMultiClipboard()
         self.clipboards = {} # key: clipboard name, val=PCNodeState
+        if PCLibrary.isEnabled():
+            # only the library index is loaded, clipboard parameters are loaded on first access
+            library = PCLibrary.instance()
+            for clipboardName, indexEntry in library.entries(PCLibrary.CLIPBOARDS).items():
+                loader = lambda name = clipboardName: library.readPayload(PCLibrary.CLIPBOARDS, name)
+                self.clipboards[clipboardName] = PCNodeState.fromIndex(indexEntry, loader)
 
     def setClipboard(self, node, propertyIds, clipboardName = None):
         clipboard = PCNodeState(node)
         clipboard.storeState(node, propertyIds=propertyIds)
+        replacedClipboards = [self.currentClipboard]
         if clipboardName:
+            replacedClipboards.append(self.clipboards.get(clipboardName))
             self.clipboards[clipboardName] = clipboard
+            if PCLibrary.isEnabled():
+                PCLibrary.instance().saveEntry(PCLibrary.CLIPBOARDS, clipboardName, clipboard.indexData(), { "params": clipboard.state.toData() })
         self.currentClipboard = clipboard
+        for replacedClipboard in replacedClipboards:
+            self.releaseIfUnused(replacedClipboard)
+        self.clearMultiClipboard()
+
+    def setMultiClipboard(self, nodeArray, graph):
+        # copies a whole node selection, which replaces the current clipboard until a single node is copied again
+        multiClipboard = PCMultiClipboard(nodeArray, graph)
+        self.clearMultiClipboard()
+        self.currentMultiClipboard = multiClipboard
+        replacedClipboard = self.currentClipboard
+        self.currentClipboard = None
+        self.releaseIfUnused(replacedClipboard)
+        return multiClipboard
+
+    def clearMultiClipboard(self):
+        if self.currentMultiClipboard:
+            self.currentMultiClipboard.release()
+            self.currentMultiClipboard = None
 
     def setCurrentClipboard(self, clipboardName):
         clipboard = self.clipboards.get(clipboardName)
         if clipboard:
             self.currentClipboard = clipboard
+            self.clearMultiClipboard()
 
     def clipboardExists(self, clipboardName):
         clipboard = self.clipboards.get(clipboardName)
@@ -47,22 +81,34 @@ class PCCopier:
 
     def deleteClipboard(self, clipboardName):
         if self.clipboards.get(clipboardName):
-            del self.clipboards[clipboardName]
+            self.releaseIfUnused(self.clipboards.pop(clipboardName))
+            if PCLibrary.isEnabled():
+                PCLibrary.instance().deleteEntry(PCLibrary.CLIPBOARDS, clipboardName)
             return True
         else:
             return False
 
     def deleteAllClipboards(self):
+        clipboards = self.clipboards
         self.clipboards = {}
+        for clipboard in clipboards.values():
+            self.releaseIfUnused(clipboard)
+        if PCLibrary.isEnabled():
+            PCLibrary.instance().deleteAll(PCLibrary.CLIPBOARDS)
+
+    def releaseIfUnused(self, clipboard):
+        # the current clipboard may also be a named one, its data is released once referenced by neither
+        if clipboard and clipboard != self.currentClipboard and not any(c is clipboard for c in self.clipboards.values()):
+            clipboard.release()
+
+    def compilePastePlan(self, sourceNodeState, destNodes, pasteOptions, propertyIds = None):
+        plan = PCPastePlan(sourceNodeState, pasteOptions, propertyIds)
+        plan.compile(destNodes)
+        return plan
 
-    def pasteNodeStateInto(self, sourceNodeState, destNodes, pasteOptions, propertyIds = None):
-        destNodeCount = destNodes.getSize()
-        for n in range(0, destNodeCount):
-            destNode = destNodes.getItem(n)
-            srcAndDestHaveSameNodeType = sourceNodeState.nodeIdentifier.haveSameNodeType(destNode)
-            doPaste = srcAndDestHaveSameNodeType if pasteOptions.sameTypeAsSource else True
-            if doPaste:
-                copyBaseAndSpecific = srcAndDestHaveSameNodeType or pasteOptions.crossTypeSpecificParamsCopy
-                sourceNodeState.recallInto(destNode, copyBaseAndSpecific, propertyIds)    
+    def pasteNodeStateInto(self, sourceNodeState, destNodes, pasteOptions, propertyIds = None, skipUnchanged = False, stats = None):
+        plan = self.compilePastePlan(sourceNodeState, destNodes, pasteOptions, propertyIds)
+        with PCUndoGroup("Paste"):
+            plan.execute(skipUnchanged, stats)
 
 
@@ -0,0 +1,139 @@
+# ---------------
+# ParamCopy - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+import json, hashlib
+
+from sd.api.apiexception import APIException
+
+from paramcopy.pccore.pchelper import PCHelper
+from paramcopy.pccore.pcparam import PCParam, PCParamCollection
+from paramcopy.pccore.pclibrary import PCLibrary
+from paramcopy.pccore.pcvalue import PCValueCodec
+from paramcopy.pccore import pclog
+
+class PCDefaultsTable:
+    """
+    Shared parameter defaults per node definition, used by node states only storing the parameters
+    which differ from them. A defaults set holds, for each visible input parameter of a definition,
+    the definition default value along with a reference inheritance method, taken from the first node
+    met for this definition. Defaults sets are identified by a digest of their content, so they are
+    never modified once created and can be shared by any number of node states, in memory and on disk.
+    Stored variations referencing each set are counted, a set being removed from the table and the
+    library once the last variation using it is deleted.
+    """
+    inst = None
+
+    @classmethod
+    def instance(cls):
+        if not cls.inst:
+            cls.inst = PCDefaultsTable()
+        return cls.inst
+
+    def __init__(self):
+        self.defaultsSets = {} # key: defaults set id, val: dict (key: property id, val: PCParam)
+        self.defMetaSetIds = {} # key: (definition key, definition metadata signature), val: defaults set id
+        self.refCounts = None # key: defaults set id, val: count of stored variations using it, None until counted (see isCounted())
+
+    def defaultsFor(self, node, defMeta):
+        # returns the id and the content of the defaults set to be used for the given node
+        defMetaKey = (defMeta.defKey, defMeta.signature)
+        defaultsId = self.defMetaSetIds.get(defMetaKey)
+        if not defaultsId:
+            defaultsId = self.addDefaultsSet(self.buildDefaults(node, defMeta))
+            self.defMetaSetIds[defMetaKey] = defaultsId
+        return defaultsId, self.defaultsSets[defaultsId]
+
+    def getDefaults(self, defaultsId):
+        # returns the content of a defaults set, loaded from the library if needed, or None if not found
+        defaults = self.defaultsSets.get(defaultsId)
+        if defaults == None and PCLibrary.isEnabled():
+            data = PCLibrary.instance().readPayload(PCLibrary.DEFAULTS, defaultsId)
+            if data:
+                defaults = PCParamCollection.fromData(data["params"]).params
+                self.defaultsSets[defaultsId] = defaults
+        if defaults == None:
+            pclog.log("Parameter defaults " + defaultsId + " not found.")
+        return defaults
+
+    def persist(self, defaultsIds):
+        # save into the library the given defaults sets, unless already there
+        library = PCLibrary.instance()
+        entries = library.entries(PCLibrary.DEFAULTS)
+        for defaultsId in defaultsIds:
+            if not defaultsId in entries and defaultsId in self.defaultsSets:
+                params = [param.toData() for param in self.defaultsSets[defaultsId].values()]
+                library.saveEntry(PCLibrary.DEFAULTS, defaultsId, {}, { "params": params })
+
+    def isCounted(self):
+        return self.refCounts != None
+
+    def countRefs(self, defaultsIdSets):
+        # initial reference counts, from the defaults set ids used by each stored variation
+        self.refCounts = {}
+        for defaultsIds in defaultsIdSets:
+            self.addRefs(defaultsIds)
+        # sets left in the library by deleted variations, kept in memory as they may be used by node states not stored yet
+        if PCLibrary.isEnabled():
+            library = PCLibrary.instance()
+            for defaultsId in list(library.entries(PCLibrary.DEFAULTS).keys()):
+                if not defaultsId in self.refCounts:
+                    library.deleteEntry(PCLibrary.DEFAULTS, defaultsId)
+
+    def addRefs(self, defaultsIds):
+        for defaultsId in defaultsIds:
+            self.refCounts[defaultsId] = self.refCounts.get(defaultsId, 0) + 1
+
+    def releaseRefs(self, defaultsIds):
+        # removes the defaults sets no longer used by any stored variation
+        for defaultsId in defaultsIds:
+            refCount = self.refCounts.get(defaultsId, 0) - 1
+            if refCount > 0:
+                self.refCounts[defaultsId] = refCount
+            else:
+                self.refCounts.pop(defaultsId, None)
+                self.removeDefaultsSet(defaultsId)
+
+    def removeAll(self):
+        for defaults in self.defaultsSets.values():
+            for param in defaults.values():
+                param.release()
+        self.defaultsSets = {}
+        self.defMetaSetIds = {}
+        self.refCounts = {}
+        if PCLibrary.isEnabled():
+            PCLibrary.instance().deleteAll(PCLibrary.DEFAULTS)
+
+    # --- Private
+    def buildDefaults(self, node, defMeta):
+        defaults = {}
+        for propMeta in defMeta.props:
+            if not propMeta.hidden:
+                try:
+                    encodedValue = PCValueCodec.encode(propMeta.prop.getDefaultValue())
+                    if PCValueCodec.isSerializable(encodedValue): # defaults sets must be storable in the library
+                        inheritanceMethod = PCHelper.getInheritanceMethod(node, propMeta.id)
+                        defaults[propMeta.id] = PCParam(propMeta.id, propMeta.label, inheritanceMethod, encodedValue, propMeta.groupName)
+                except APIException as e:
+                    PCHelper.logSDException(e)
+        return defaults
+
+    def addDefaultsSet(self, defaults):
+        content = json.dumps([param.toData() for param in defaults.values()], separators = (",", ":"))
+        defaultsId = hashlib.blake2b(content.encode("utf-8"), digest_size = 8).hexdigest()
+        if defaultsId in self.defaultsSets:
+            for param in defaults.values(): # identical set already known
+                param.release()
+        else:
+            self.defaultsSets[defaultsId] = defaults
+        return defaultsId
+
+    def removeDefaultsSet(self, defaultsId):
+        defaults = self.defaultsSets.pop(defaultsId, None)
+        if defaults:
+            for param in defaults.values():
+                param.release()
+        self.defMetaSetIds = { key: setId for key, setId in self.defMetaSetIds.items() if setId != defaultsId }
+        if PCLibrary.isEnabled():
+            PCLibrary.instance().deleteEntry(PCLibrary.DEFAULTS, defaultsId)
@@ -0,0 +1,100 @@
+# ---------------
+# ParamCopy - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+import hashlib
+
+from sd.api.apiexception import APIException
+
+from paramcopy.pccore.pchelper import PCHelper
+from paramcopy.pccore.pcvalue import PCValueCodec
+
+class PCFingerprint:
+    """
+    Stable digest of parameter states, a parameter state being its (property id, inheritance method, encoded value)
+    tuple. States are digested in property id order so a stored node state and the live node it comes from give
+    the same fingerprint whenever their parameters match, regardless of storage order. Inheritance methods are
+    digested as ints, as they are stored, whereas they are read from nodes as SDPropertyInheritanceMethod.
+    """
+    @classmethod
+    def digest(cls, stateKeys):
+        stateKeys = [(propertyId, int(inheritanceMethod), encodedValue) for propertyId, inheritanceMethod, encodedValue in stateKeys]
+        content = repr(sorted(stateKeys, key = lambda stateKey: stateKey[0]))
+        return hashlib.blake2b(content.encode("utf-8"), digest_size = 8).hexdigest()
+
+class PCLiveFingerprints:
+    """
+    Cache of the live parameter states of graph nodes, read when matching variations against the graph.
+    Node entries are kept until the node is written by ParamCopy (see invalidate()), changes made through
+    the Designer UI are not tracked.
+    """
+    inst = None
+
+    @classmethod
+    def instance(cls):
+        if not cls.inst:
+            cls.inst = PCLiveFingerprints()
+        return cls.inst
+
+    def __init__(self):
+        self.nodes = {} # key: node id, val: dict (key: (package id, graph id), val: dict (key: property id, val: parameter state))
+
+    def liveStates(self, node, nodeIdentifier, propertyIds):
+        # returns the live states of the given node parameters, only reading from the node the ones not cached yet
+        graphEntries = self.nodes.setdefault(nodeIdentifier.nodeId, {})
+        states = graphEntries.setdefault((nodeIdentifier.packageId, nodeIdentifier.graphId), {})
+        for propertyId in propertyIds:
+            if not propertyId in states:
+                states[propertyId] = self.readState(node, propertyId)
+        return [states[propertyId] for propertyId in propertyIds]
+
+    def invalidate(self, node):
+        # to be called when a node parameter gets written
+        self.nodes.pop(node.getIdentifier(), None)
+
+    def clear(self):
+        self.nodes = {}
+
+    # --- Private
+    def readState(self, node, propertyId):
+        try:
+            return (propertyId, PCHelper.getInheritanceMethod(node, propertyId), PCValueCodec.encode(node.getInputPropertyValueFromId(propertyId)))
+        except APIException as e:
+            PCHelper.logSDException(e)
+            return (propertyId, -1, None)
+
+class PCVariationMatch:
+# How much of a variation matches the live graph, in parameters
+    ACTIVE = 0 # all parameters match
+    PARTIAL = 1
+    STALE = 2 # no parameter matches
+
+    def __init__(self):
+        self.matchedParams = 0
+        self.totalParams = 0
+        self.missingNodes = 0
+
+    def add(self, matchedParams, totalParams):
+        self.matchedParams += matchedParams
+        self.totalParams += totalParams
+
+    def percentage(self):
+        return int(100 * self.matchedParams / self.totalParams) if self.totalParams > 0 else 0
+
+    def status(self):
+        if self.totalParams > 0 and self.matchedParams == self.totalParams:
+            return PCVariationMatch.ACTIVE
+        elif self.matchedParams > 0:
+            return PCVariationMatch.PARTIAL
+        else:
+            return PCVariationMatch.STALE
+
+    def label(self):
+        status = self.status()
+        if status == PCVariationMatch.ACTIVE:
+            return "Active"
+        elif status == PCVariationMatch.PARTIAL:
+            return str(self.percentage()) + "%"
+        else:
+            return "Stale"
@@ -105,6 +105,12 @@ class PCHelper:
     def isBaseParameter(cls, paramId):
         return paramId[0] == '$'
 
+    @classmethod
+    def nodeDefKey(cls, node):
+        # definition ID and Label are used to determine the node type, as for sbsar all the ids are same
+        nodeDef = node.getDefinition()
+        return (nodeDef.getId(), nodeDef.getLabel())
+
     @classmethod
     def hasCurrentGraph(cls):
         return cls.getCurrentGraph() != None
@@ -146,6 +152,11 @@ class PCHelper:
         finally:
             return inheritanceMethod
 
+    @classmethod
+    def toInheritanceMethod(cls, value):
+        # SDPropertyInheritanceMethod from its integer value (as stored), -1 being kept for params without inheritance method
+        return SDPropertyInheritanceMethod(value) if value != -1 else -1
+
     @classmethod
     def getParamAnnotationValue(cls, node, propertyId, annotationId):
         annotationVal = None
@@ -171,10 +182,13 @@ class PCHelper:
         hidden = False
         val = cls.getParamAnnotationValue(node, propertyId, "visible_if")
         if val:
-            valStr = val.get().strip()
-            if valStr == "0" or valStr == "false":
-                hidden = True
+            hidden = cls.isHiddenVisibleIfValue(val.get())
         return hidden
+
+    @classmethod
+    def isHiddenVisibleIfValue(cls, visibleIf):
+        valStr = visibleIf.strip()
+        return valStr == "0" or valStr == "false"
     
     @classmethod
     def croppedText(cls, text, maxLen = 70):
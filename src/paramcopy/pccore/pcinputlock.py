@@ -0,0 +1,56 @@
+# ---------------
+# ParamCopy - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+import sd
+if sd.getContext().getSDApplication().getVersion() < "14.0.0":
+    from PySide2.QtCore import QObject, QEvent
+    from PySide2.QtGui import QWindow
+    from PySide2.QtWidgets import QApplication, QWidget
+else:
+    from PySide6.QtCore import QObject, QEvent
+    from PySide6.QtGui import QWindow
+    from PySide6.QtWidgets import QApplication, QWidget
+
+class PCInputLock(QObject):
+    """
+    Discards user input outside a given widget while an operation keeps an undo group open across event
+    loop returns (see PCUndoGroup), so that no edit made meanwhile, in Designer or through another ParamCopy
+    command, is merged into the operation undo entry. The widget and its children keep receiving input,
+    i.e. the dialog running the operation stays usable to cancel it.
+    """
+    INPUT_EVENTS = (QEvent.KeyPress, QEvent.KeyRelease, QEvent.ShortcutOverride, QEvent.Shortcut,
+                    QEvent.MouseButtonPress, QEvent.MouseButtonRelease, QEvent.MouseButtonDblClick,
+                    QEvent.Wheel, QEvent.DragEnter, QEvent.Drop, QEvent.ContextMenu)
+
+    def __init__(self, widget):
+        super().__init__()
+        self.widget = widget
+        self.installed = False
+
+    def lock(self):
+        app = QApplication.instance()
+        if app and not self.installed:
+            app.installEventFilter(self)
+            self.installed = True
+
+    def unlock(self):
+        app = QApplication.instance()
+        if app and self.installed:
+            app.removeEventFilter(self)
+        self.installed = False
+
+    # --- Qt
+    def eventFilter(self, obj, event):
+        if event.type() in PCInputLock.INPUT_EVENTS:
+            return not self.accepts(obj)
+        return False
+
+    # --- Private
+    def accepts(self, obj):
+        if isinstance(obj, QWidget):
+            return obj is self.widget or self.widget.isAncestorOf(obj)
+        if isinstance(obj, QWindow): # input reaches the window of a widget before the widget itself
+            return obj is self.widget.window().windowHandle()
+        return False # shortcuts of actions, menus...
@@ -0,0 +1,104 @@
+# ---------------
+# ParamCopy - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+import sys, weakref
+
+class PCInternPool:
+# Content-addressed pool of immutable objects with reference counting: equal contents are held once
+    def __init__(self):
+        self.entries = {} # key: content key, val: [canonical object, reference count]
+
+    def acquire(self, key, obj = None):
+        # returns the canonical object for key, obj (or key itself if obj is None) being registered if key is new
+        entry = self.entries.get(key)
+        if entry:
+            entry[1] += 1
+        else:
+            entry = [key if obj is None else obj, 1]
+            self.entries[key] = entry
+        return entry[0]
+
+    def release(self, key):
+        entry = self.entries.get(key)
+        if entry:
+            entry[1] -= 1
+            if entry[1] <= 0:
+                del self.entries[key]
+
+    def size(self):
+        return len(self.entries)
+
+class PCIntern:
+    """
+    Interning of the data repeated across stored clipboards and variations: encoded parameter values,
+    node identifiers, their graph context and parameter descriptors (id, label, group). Stored objects reference the canonical instance held by the pools, so memory
+    grows with the number of distinct values rather than with the number of stored parameters.
+    Each stored reference is counted and must be released when the clipboard or variation holding it
+    is deleted (see PCNodeState.release()).
+    """
+    inst = None
+
+    @classmethod
+    def instance(cls):
+        if not cls.inst:
+            cls.inst = PCIntern()
+        return cls.inst
+
+    def __init__(self):
+        self.values = PCInternPool() # key: encoded value (see PCValueCodec)
+        self.nodeIdentifiers = PCInternPool() # key: PCNodeIdentifier data, val: PCNodeIdentifier
+        self.graphContexts = weakref.WeakValueDictionary() # key: (package id, graph id), val: PCGraphContext
+        self.properties = [] # (property id, label, group name) referenced by index from parameter collections, never released
+        self.propertyIndices = {} # key: (property id, label, group name), val: index in self.properties
+        self.propertyIdIndicesMap = {} # key: property id, val: list of indices in self.properties
+
+    def internValue(self, encodedValue):
+        return self.values.acquire(encodedValue) if encodedValue != None else None
+
+    def releaseValue(self, encodedValue):
+        if encodedValue != None:
+            self.values.release(encodedValue)
+
+    def internNodeIdentifier(self, nodeIdentifier):
+        return self.nodeIdentifiers.acquire(tuple(nodeIdentifier.toData()), nodeIdentifier)
+
+    def releaseNodeIdentifier(self, nodeIdentifier):
+        self.nodeIdentifiers.release(tuple(nodeIdentifier.toData()))
+
+    def internString(self, s):
+        return sys.intern(s) if s else s
+
+    def graphContext(self, packageId, graphId):
+        # package and graph ids shared by all the node identifiers of a graph, freed along with the last one
+        key = (packageId, graphId)
+        context = self.graphContexts.get(key)
+        if context == None:
+            context = PCGraphContext(self.internString(packageId), self.internString(graphId))
+            self.graphContexts[key] = context
+        return context
+
+    def propertyIndex(self, propertyId, label, groupName):
+        key = (propertyId, label, groupName)
+        index = self.propertyIndices.get(key)
+        if index == None:
+            index = len(self.properties)
+            self.properties.append((self.internString(propertyId), self.internString(label), self.internString(groupName)))
+            self.propertyIndices[key] = index
+            self.propertyIdIndicesMap.setdefault(propertyId, []).append(index)
+        return index
+
+    def propertyAt(self, index):
+        return self.properties[index]
+
+    def propertyIdIndices(self, propertyId):
+        return self.propertyIdIndicesMap.get(propertyId, ())
+
+class PCGraphContext:
+# Package and graph ids of a node identifier, one instance per graph (see PCIntern.graphContext())
+    __slots__ = ("packageId", "graphId", "__weakref__")
+
+    def __init__(self, packageId, graphId):
+        self.packageId = packageId
+        self.graphId = graphId
@@ -0,0 +1,142 @@
+# ---------------
+# ParamCopy - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+import time
+
+import sd
+if sd.getContext().getSDApplication().getVersion() < "14.0.0":
+    from PySide2.QtCore import QObject, QTimer
+else:
+    from PySide6.QtCore import QObject, QTimer
+
+from sd.api.apiexception import APIException
+
+from paramcopy.pccore.pchelper import PCHelper
+from paramcopy.pccore.pcprefs import PCPrefs
+from paramcopy.pccore.pcundo import PCUndoGroup
+from paramcopy.pccore.pcinputlock import PCInputLock
+from paramcopy.pccore import pclog
+
+class PCJob(QObject):
+    """
+    Operation split into steps (typically one step per node) executed in time-sliced chunks
+    on the Qt event loop, so the UI stays responsive and the operation can be cancelled.
+    Cancellation happens between steps, hence never leaves a node partially written.
+    If undoName is provided, all the steps are grouped into a single undo group, open from start to completion
+    or cancellation. User input outside inputOwner (the widget running the job) is discarded meanwhile
+    (see PCInputLock), so that edits can't be merged into the operation undo entry.
+    """
+    def __init__(self, description, steps, stepFct, itemName = "node", undoName = None, inputOwner = None):
+        super().__init__()
+        self.description = description # i.e. "Pasting"
+        self.steps = steps # list of step data, each passed to stepFct
+        self.stepFct = stepFct
+        self.itemName = itemName # what a step processes, for display purpose
+        self.doneCount = 0
+        self.cancelRequested = False
+        self.error = None # exception which interrupted the job, if any
+        self.running = False
+        self.startTime = 0
+        self.progressCallback = None # called with progress text after each slice
+        self.finishedCallback = None # called with the job once complete or cancelled
+        self.undoName = undoName
+        self.undoGroup = None # open while the job runs, if undoName is provided
+        self.inputLock = PCInputLock(inputOwner) if undoName and inputOwner else None
+        self.timer = QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.runSlice)
+
+    # --- Public
+    def start(self, progressCallback = None, finishedCallback = None):
+        self.progressCallback = progressCallback
+        self.finishedCallback = finishedCallback
+        self.doneCount = 0
+        self.cancelRequested = False
+        self.error = None
+        self.running = True
+        self.startTime = time.perf_counter()
+        if self.undoName:
+            if self.inputLock:
+                self.inputLock.lock()
+            self.undoGroup = PCUndoGroup(self.undoName)
+            self.undoGroup.begin()
+        self.timer.start(0)
+
+    def cancel(self):
+        self.cancelRequested = True
+
+    def isRunning(self):
+        return self.running
+
+    def isCancelled(self):
+        return self.cancelRequested and self.doneCount < len(self.steps)
+
+    def isFailed(self):
+        return self.error != None
+
+    def doneSteps(self):
+        return self.steps[:self.doneCount]
+
+    def throughput(self):
+        # steps per second
+        elapsed = time.perf_counter() - self.startTime
+        return self.doneCount / elapsed if elapsed > 0 else 0
+
+    def progressText(self):
+        text = self.description + " " + str(self.doneCount) + "/" + str(len(self.steps)) + " " + self.itemName + "(s)"
+        throughput = self.throughput()
+        if throughput > 0:
+            text += " (" + str(int(throughput)) + " " + self.itemName + "(s)/s)"
+        if self.cancelRequested and self.running:
+            text += ", cancelling..."
+        return text
+
+    def cancelledText(self):
+        return self.description + " cancelled, " + str(self.doneCount) + " of " + str(len(self.steps)) + " " + self.itemName + "(s) processed."
+
+    def failedText(self):
+        return self.description + " failed: " + str(self.error) + ", " + str(self.doneCount) + " of " + str(len(self.steps)) + " " + self.itemName + "(s) processed."
+
+    def interruptedText(self):
+        # text of a job either failed or cancelled
+        return self.failedText() if self.isFailed() else self.cancelledText()
+
+    def logDoneSteps(self, stepLabelFct):
+        labels = [stepLabelFct(step) for step in self.doneSteps()]
+        pclog.log(self.interruptedText() + " Processed " + self.itemName + "(s): " + ", ".join(labels))
+
+    # --- Private
+    def runSlice(self):
+        sliceEnd = time.perf_counter() + PCPrefs.instance().jobSliceMs / 1000.0
+        stepCount = len(self.steps)
+        try:
+            while self.doneCount < stepCount and not self.cancelRequested:
+                self.stepFct(self.steps[self.doneCount])
+                self.doneCount += 1
+                if time.perf_counter() >= sliceEnd:
+                    break
+        except Exception as e:
+            if isinstance(e, APIException):
+                PCHelper.logSDException(e)
+            pclog.log(self.description + " interrupted by error: " + str(e))
+            self.error = e
+
+        if self.progressCallback:
+            self.progressCallback(self.progressText())
+
+        if self.doneCount < stepCount and not self.cancelRequested and not self.error:
+            self.timer.start(0) # let the event loop process pending events before next slice
+        else:
+            self.running = False
+            self.endUndoGroup()
+            if self.finishedCallback:
+                self.finishedCallback(self)
+
+    def endUndoGroup(self):
+        if self.undoGroup:
+            self.undoGroup.end()
+            self.undoGroup = None
+        if self.inputLock:
+            self.inputLock.unlock()
@@ -0,0 +1,184 @@
+# ---------------
+# ParamCopy - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+import os, json, hashlib, threading, queue
+
+from paramcopy.pccore.pcprefs import PCPrefs
+from paramcopy.pccore import pclog
+
+class PCLibraryWriter(threading.Thread):
+# Performs library file writes and deletions in the order they were requested, off the UI thread
+    def __init__(self):
+        super().__init__(daemon = True)
+        self.queue = queue.Queue() # items: (operation, path, data), None to stop
+        self.errors = [] # appended by the writer thread, logged by the UI thread
+        self.errorsLock = threading.Lock()
+
+    def write(self, path, data):
+        self.queue.put(("write", path, data))
+
+    def delete(self, path):
+        self.queue.put(("delete", path, None))
+
+    def stop(self):
+        self.queue.put(None)
+        self.join()
+
+    def takeErrors(self):
+        with self.errorsLock:
+            errors = self.errors
+            self.errors = []
+        return errors
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item == None:
+                break
+            operation, path, data = item
+            try:
+                if operation == "write":
+                    # write to a temporary file then swap, so a file is never left partially written
+                    tmpPath = path + ".tmp"
+                    with open(tmpPath, "w") as writeFile:
+                        json.dump(data, writeFile, separators = (",", ":"))
+                    os.replace(tmpPath, path)
+                elif operation == "delete" and os.path.exists(path):
+                    os.remove(path)
+            except (OSError, TypeError, ValueError) as e:
+                with self.errorsLock:
+                    self.errors.append(operation + " " + path + ": " + str(e))
+
+class PCLibrary:
+    """
+    On-disk storage of variations and named clipboards, located in the plugin folder.
+    The library is made of an index file, loaded at startup, describing each entry (name, context,
+    counts) and of one payload file per entry, only read when the entry content is needed.
+    """
+    inst = None
+
+    """
+    1: initial version
+    """
+    VERSION = 1
+    FOLDER = "pclibrary"
+    INDEX_FILENAME = "index.json"
+    VARIATIONS = "variations"
+    CLIPBOARDS = "clipboards"
+    DEFAULTS = "defaults" # parameter defaults sets, see PCDefaultsTable
+
+    @classmethod
+    def instance(cls):
+        if not cls.inst:
+            cls.inst = PCLibrary()
+        return cls.inst
+
+    @classmethod
+    def isEnabled(cls):
+        return PCPrefs.instance().persistentLibrary
+
+    @classmethod
+    def folder(cls):
+        path = os.path.dirname(os.path.dirname(__file__)) # go one folder up
+        return os.path.join(path, PCLibrary.FOLDER)
+
+    def __init__(self):
+        self.index = { PCLibrary.VARIATIONS: {}, PCLibrary.CLIPBOARDS: {}, PCLibrary.DEFAULTS: {} } # key: kind, val: dict (key: entry name, val: index entry)
+        self.writer = None
+        self.loadIndex()
+
+    # --- Public
+    def entries(self, kind):
+        return self.index[kind]
+
+    def readPayload(self, kind, name):
+        # returns the payload data of an entry, or None if it cannot be read
+        entry = self.index[kind].get(name)
+        if not entry:
+            return None
+        path = os.path.join(PCLibrary.folder(), kind, entry["file"])
+        try:
+            with open(path, "r") as readFile:
+                data = json.load(readFile)
+            if data.get("version", 0) > PCLibrary.VERSION:
+                pclog.log("Library entry \"" + name + "\" was saved by a more recent version and cannot be loaded.")
+                return None
+            return data
+        except (OSError, ValueError) as e:
+            pclog.log("Error loading library entry \"" + name + "\": " + str(e))
+            return None
+
+    def saveEntry(self, kind, name, indexEntry, payload):
+        oldEntry = self.index[kind].get(name)
+        indexEntry["file"] = oldEntry["file"] if oldEntry else self.payloadFilename(kind, name)
+        payload["version"] = PCLibrary.VERSION
+        self.index[kind][name] = indexEntry
+        writer = self.getWriter()
+        writer.write(os.path.join(PCLibrary.folder(), kind, indexEntry["file"]), payload)
+        self.saveIndex()
+
+    def deleteEntry(self, kind, name):
+        entry = self.index[kind].pop(name, None)
+        if entry:
+            self.getWriter().delete(os.path.join(PCLibrary.folder(), kind, entry["file"]))
+            self.saveIndex()
+
+    def deleteAll(self, kind):
+        writer = self.getWriter()
+        for entry in self.index[kind].values():
+            writer.delete(os.path.join(PCLibrary.folder(), kind, entry["file"]))
+        self.index[kind] = {}
+        self.saveIndex()
+
+    def close(self):
+        # waits for pending writes to complete
+        if self.writer:
+            self.writer.stop()
+            self.logWriteErrors()
+            self.writer = None
+
+    # --- Private
+    def loadIndex(self):
+        path = os.path.join(PCLibrary.folder(), PCLibrary.INDEX_FILENAME)
+        if os.path.exists(path):
+            try:
+                with open(path, "r") as readFile:
+                    data = json.load(readFile)
+                if data.get("version", 0) > PCLibrary.VERSION:
+                    pclog.log("Library was saved by a more recent version and cannot be loaded.")
+                else:
+                    for kind in self.index.keys():
+                        self.index[kind] = data.get(kind, {})
+            except (OSError, ValueError) as e:
+                pclog.log("Error loading library index: " + str(e))
+
+    def saveIndex(self):
+        # index entries are never modified once created, so a shallow copy is enough for the writer thread
+        data = { kind: dict(entries) for kind, entries in self.index.items() }
+        data["version"] = PCLibrary.VERSION
+        self.getWriter().write(os.path.join(PCLibrary.folder(), PCLibrary.INDEX_FILENAME), data)
+        self.logWriteErrors()
+
+    def payloadFilename(self, kind, name):
+        filename = hashlib.sha1(name.encode("utf-8")).hexdigest()[:16] + ".json"
+        usedFilenames = set(entry["file"] for entry in self.index[kind].values())
+        suffix = 1
+        while filename in usedFilenames:
+            filename = hashlib.sha1((name + str(suffix)).encode("utf-8")).hexdigest()[:16] + ".json"
+            suffix += 1
+        return filename
+
+    def getWriter(self):
+        if not self.writer:
+            for kind in self.index.keys():
+                os.makedirs(os.path.join(PCLibrary.folder(), kind), exist_ok = True)
+            self.writer = PCLibraryWriter()
+            self.writer.start()
+        return self.writer
+
+    def logWriteErrors(self):
+        if self.writer:
+            for error in self.writer.takeErrors():
+                pclog.log("Library write error: " + error)
@@ -0,0 +1,200 @@
+# ---------------
+# ParamCopy - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+from sd.api.sdproperty import SDPropertyCategory
+from sd.api.sbs.sdsbscompnode import SDSBSCompNode
+from sd.api.apiexception import APIException
+
+from paramcopy.pccore.pchelper import PCHelper
+from paramcopy.pccore.pcstatemgr import PCNodeState
+from paramcopy.pccore.pcundo import PCUndoGroup
+
+class PCSelectionLayout:
+    """
+    Layout of a node selection used to match nodes between two selections: definition keys, positions relative
+    to the selection bounding box and topology labels. Topology labels are refined from the definition keys
+    of the nodes connected within the selection (Weisfeiler-Lehman like), so that identically wired nodes of a
+    duplicated block get identical labels whatever their identifiers.
+    """
+    TOPOLOGY_ROUNDS = 2
+
+    def __init__(self, nodes):
+        self.defKeys = [PCHelper.nodeDefKey(node) for node in nodes]
+        self.positions = self.relativePositions(nodes)
+        self.topologyLabels = self.computeTopologyLabels(nodes)
+
+    def __len__(self):
+        return len(self.defKeys)
+
+    # --- Private
+    def relativePositions(self, nodes):
+        positions = []
+        for node in nodes:
+            try:
+                position = node.getPosition()
+                positions.append((position.x, position.y))
+            except APIException as e:
+                PCHelper.logSDException(e)
+                positions.append((0.0, 0.0))
+        if positions:
+            minX = min(x for x, y in positions)
+            minY = min(y for x, y in positions)
+            positions = [(x - minX, y - minY) for x, y in positions]
+        return positions
+
+    def connections(self, nodes):
+        # list of (input node index, input property id, output node index, output property id) of the connections within the selection
+        indices = { node.getIdentifier(): n for n, node in enumerate(nodes) }
+        connections = []
+        for n, node in enumerate(nodes):
+            try:
+                props = node.getProperties(SDPropertyCategory.Input)
+                for p in range(0, props.getSize()):
+                    prop = props.getItem(p)
+                    if not prop.isConnectable():
+                        continue
+                    propConnections = node.getPropertyConnections(prop)
+                    for c in range(0, propConnections.getSize()):
+                        connection = propConnections.getItem(c)
+                        outputIndex = indices.get(connection.getOutputPropertyNode().getIdentifier())
+                        if outputIndex != None:
+                            connections.append((n, prop.getId(), outputIndex, connection.getOutputProperty().getId()))
+            except APIException as e:
+                PCHelper.logSDException(e)
+        return connections
+
+    def computeTopologyLabels(self, nodes):
+        connections = self.connections(nodes)
+        labels = [hash(defKey) for defKey in self.defKeys]
+        for _ in range(0, PCSelectionLayout.TOPOLOGY_ROUNDS):
+            neighbours = [[] for _ in labels]
+            for inputIndex, inputId, outputIndex, outputId in connections:
+                neighbours[inputIndex].append((0, inputId, outputId, labels[outputIndex]))
+                neighbours[outputIndex].append((1, outputId, inputId, labels[inputIndex]))
+            labels = [hash((label, tuple(sorted(neighbourLabels)))) for label, neighbourLabels in zip(labels, neighbours)]
+        return labels
+
+class PCNodeMatcher:
+    """
+    One to one assignment of destination nodes to source nodes of a same definition. Candidates are narrowed
+    by topology label first when matching connections, then by definition, and nodes sharing a key are paired
+    by relative position through a spatial hash, remaining ones in reading order. Every step is a dictionary
+    lookup per node, the assignment is hence computed in about linear time.
+    """
+    POSITION = "position"
+    CONNECTIONS = "connections"
+    CELL_SIZE = 64.0 # position tolerance, in graph units
+
+    def __init__(self, mode = POSITION):
+        self.mode = mode
+
+    def match(self, sourceLayout, destLayout):
+        # returns the assignment table: list of (source index, destination index)
+        assignment = []
+        sources = set(range(0, len(sourceLayout)))
+        dests = list(range(0, len(destLayout)))
+        keyLists = [(sourceLayout.defKeys, destLayout.defKeys)]
+        if self.mode == PCNodeMatcher.CONNECTIONS:
+            keyLists.insert(0, (sourceLayout.topologyLabels, destLayout.topologyLabels))
+
+        for sourceKeys, destKeys in keyLists:
+            sourceBuckets = {}
+            for s in sorted(sources):
+                sourceBuckets.setdefault(sourceKeys[s], []).append(s)
+            destBuckets = {}
+            for d in dests:
+                destBuckets.setdefault(destKeys[d], []).append(d)
+            for key, bucketDests in destBuckets.items():
+                bucketSources = sourceBuckets.get(key)
+                if bucketSources:
+                    assignment.extend(self.matchPositions(bucketSources, bucketDests, sourceLayout.positions, destLayout.positions))
+            matchedDests = set(d for s, d in assignment)
+            sources.difference_update(s for s, d in assignment)
+            dests = [d for d in dests if not d in matchedDests]
+        return assignment
+
+    # --- Private
+    def cell(self, position):
+        return (int(position[0] // PCNodeMatcher.CELL_SIZE), int(position[1] // PCNodeMatcher.CELL_SIZE))
+
+    def matchPositions(self, sources, dests, sourcePositions, destPositions):
+        if len(sources) == 1 and len(dests) == 1:
+            return [(sources[0], dests[0])]
+
+        grid = {} # key: cell, val: list of source indices
+        for s in sources:
+            grid.setdefault(self.cell(sourcePositions[s]), []).append(s)
+        pairs = []
+        matched = set()
+        leftDests = []
+        for d in dests:
+            x, y = destPositions[d]
+            cx, cy = self.cell((x, y))
+            best = None
+            bestDistance = None
+            for gx in (cx - 1, cx, cx + 1):
+                for gy in (cy - 1, cy, cy + 1):
+                    for s in grid.get((gx, gy), ()):
+                        if s in matched:
+                            continue
+                        sx, sy = sourcePositions[s]
+                        distance = (sx - x) * (sx - x) + (sy - y) * (sy - y)
+                        if bestDistance == None or distance < bestDistance:
+                            best = s
+                            bestDistance = distance
+            if best != None:
+                matched.add(best)
+                pairs.append((best, d))
+            else:
+                leftDests.append(d)
+
+        # nodes moved beyond the tolerance are paired in reading order (top to bottom, left to right)
+        readingOrder = lambda positions: lambda n: (positions[n][1], positions[n][0])
+        leftSources = sorted((s for s in sources if not s in matched), key = readingOrder(sourcePositions))
+        leftDests.sort(key = readingOrder(destPositions))
+        pairs.extend(zip(leftSources, leftDests))
+        return pairs
+
+class PCMultiClipboard:
+    """
+    Node states of a whole selection copied in a single pass, along with the selection layout, pasted into
+    another selection by matching destination nodes to source ones (see PCNodeMatcher).
+    """
+    def __init__(self, nodeArray, graph):
+        self.nodeStates = []
+        self.skippedCount = 0 # selected nodes which cannot be copied (functions, non compositing nodes)
+        nodes = []
+        for n in range(0, nodeArray.getSize()):
+            node = nodeArray.getItem(n)
+            if not isinstance(node, SDSBSCompNode) or node.getDefinition().getId().startswith("sbs::function"):
+                self.skippedCount += 1
+                continue
+            nodeState = PCNodeState(node, graph = graph)
+            nodeState.storeState(node)
+            self.nodeStates.append(nodeState)
+            nodes.append(node)
+        self.layout = PCSelectionLayout(nodes)
+
+    def nodeCount(self):
+        return len(self.nodeStates)
+
+    def paramCount(self):
+        return sum(len(nodeState.state.params) for nodeState in self.nodeStates)
+
+    def release(self):
+        for nodeState in self.nodeStates:
+            nodeState.release()
+        self.nodeStates = []
+
+    def assign(self, destNodeArray, mode = PCNodeMatcher.POSITION):
+        # assignment table: list of (source PCNodeState, destination SDNode), destination nodes without a source of their type being left out
+        destNodes = [destNodeArray.getItem(n) for n in range(0, destNodeArray.getSize())]
+        pairs = PCNodeMatcher(mode).match(self.layout, PCSelectionLayout(destNodes))
+        return [(self.nodeStates[s], destNodes[d]) for s, d in sorted(pairs, key = lambda pair: pair[1])]
+
+    def paste(self, assignment, skipUnchanged = False, stats = None):
+        with PCUndoGroup("Paste"):
+            for nodeState, destNode in assignment:
+                nodeState.recallInto(destNode, skipUnchanged = skipUnchanged, stats = stats)
@@ -15,6 +15,7 @@ from sd.api.sduimgr import SDUIMgr
 from sd.api.apiexception import APIException
 
 from paramcopy.pccore.pchelper import PCHelper
+from paramcopy.pccore.pcintern import PCIntern
 from paramcopy.pccore import pclog
 
 class PCNodeIdentifier:
@@ -24,28 +25,39 @@ class PCNodeIdentifier:
     is still in existance at paste time.
     LIMITATION: if packages have no id (they have not yet been saved), they cannot
     be distinguished from each other
+    Package and graph ids are held by a graph context shared by all the identifiers
+    of the same graph, definition strings are interned.
     """
+    __slots__ = ("nodeId", "context", "defId", "defLabel")
+
     def __init__(self, node = None, graph = None):
         self.set(node, graph)
 
     def set(self, node = None, graph = None):
+        intern = PCIntern.instance()
         if not node:
             self.nodeId = None
-            self.graphId = None
-            self.packageId = None # package id is its file path
+            self.context = intern.graphContext(None, None) # package id is its file path
             self.defId = None # definition ID and Label are used to determine the node type
             self.defLabel = None
         else:
             self.nodeId = node.getIdentifier()
             if not graph:
                 graph = sd.getContext().getSDApplication().getUIMgr().getCurrentGraph()
-            self.graphId = graph.getIdentifier()
-            self.packageId = PCHelper.getPackageId(graph.getPackage())
+            self.context = intern.graphContext(PCHelper.getPackageId(graph.getPackage()), graph.getIdentifier())
 
             # definition ID and Label are used to determine the node type
             nodeDef = node.getDefinition()
-            self.defId = nodeDef.getId()
-            self.defLabel = nodeDef.getLabel()
+            self.defId = intern.internString(nodeDef.getId())
+            self.defLabel = intern.internString(nodeDef.getLabel())
+
+    @property
+    def graphId(self):
+        return self.context.graphId
+
+    @property
+    def packageId(self):
+        return self.context.packageId
 
     def __str__(self):
         return self.packageId + "_" + self.graphId + "_" + self.nodeId
@@ -53,6 +65,23 @@ class PCNodeIdentifier:
     def getName(self):
         return self.defLabel if (self.defLabel and len(self.defLabel) > 0) else self.nodeId
 
+    def defKey(self):
+        return (self.defId, self.defLabel)
+
+    def toData(self):
+        return [self.nodeId, self.graphId, self.packageId, self.defId, self.defLabel]
+
+    @classmethod
+    def fromData(cls, data):
+        nodeId, graphId, packageId, defId, defLabel = data
+        intern = PCIntern.instance()
+        nodeIdentifier = PCNodeIdentifier()
+        nodeIdentifier.nodeId = nodeId
+        nodeIdentifier.context = intern.graphContext(packageId, graphId)
+        nodeIdentifier.defId = intern.internString(defId)
+        nodeIdentifier.defLabel = intern.internString(defLabel)
+        return nodeIdentifier
+
     def haveSameNodeType(self, otherNode):
         # we check id AND label as for sbsar all the ids are same so we distinguish by label
         otherNodeDef = otherNode.getDefinition()
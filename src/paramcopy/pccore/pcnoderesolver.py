@@ -0,0 +1,81 @@
+# ---------------
+# ParamCopy - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+import sd
+from sd.api.sbs.sdsbscompgraph import SDSBSCompGraph
+
+from paramcopy.pccore.pchelper import PCHelper
+
+class PCNodeResolver:
+    """
+    Batch retrieval of nodes from their PCNodeIdentifier. Packages, graphs and graph nodes are
+    indexed on first use so that each package/graph is scanned only once for all the nodes to
+    retrieve, instead of once per node as PCNodeIdentifier.retrieveNode() does.
+    A resolver is meant to be used for a single operation (possibly recalling multiple variations)
+    as it does not track packages, graphs or nodes being added or deleted afterwards.
+    """
+    def __init__(self):
+        self.sdApp = sd.getContext().getSDApplication()
+        self.currentGraph = self.sdApp.getUIMgr().getCurrentGraph()
+        self.currentGraphKey = None
+        if self.currentGraph:
+            self.currentGraphKey = (PCHelper.getPackageId(self.currentGraph.getPackage()), self.currentGraph.getIdentifier())
+        self.packages = None # key: package id (file path), val: SDPackage
+        self.packageGraphs = {} # key: package id, val: dict (key: graph id, val: SDGraph)
+        self.graphNodes = {} # key: (package id, graph id), val: dict (key: node id, val: SDNode) or None if graph was not found
+
+    def resolve(self, nodeIdentifier):
+        if not nodeIdentifier.nodeId:
+            return None
+        nodes = self.getGraphNodes(nodeIdentifier.packageId, nodeIdentifier.graphId)
+        return nodes.get(nodeIdentifier.nodeId) if nodes else None
+
+    # --- Private
+    def getGraphNodes(self, packageId, graphId):
+        graphKey = (packageId, graphId)
+        if graphKey in self.graphNodes:
+            return self.graphNodes[graphKey]
+
+        nodes = None
+        graph = self.getGraph(packageId, graphId)
+        if graph:
+            nodes = {}
+            sdNodes = graph.getNodes()
+            nodeCount = sdNodes.getSize()
+            for n in range(0, nodeCount):
+                node = sdNodes.getItem(n)
+                nodes[node.getIdentifier()] = node
+        self.graphNodes[graphKey] = nodes
+        return nodes
+
+    def getGraph(self, packageId, graphId):
+        # try shortcut using current graph. If package is not saved, it has no file path hence
+        # no ID, so we cannot use it as a reliable identifier
+        if self.currentGraphKey and packageId and len(packageId) > 0 and self.currentGraphKey == (packageId, graphId):
+            return self.currentGraph
+
+        graphs = self.packageGraphs.get(packageId)
+        if graphs == None:
+            graphs = {}
+            package = self.getPackages().get(packageId)
+            if package:
+                resources = package.getChildrenResources(False)
+                resCount = resources.getSize()
+                for i in range(0, resCount):
+                    res = resources.getItem(i)
+                    if isinstance(res, SDSBSCompGraph):
+                        graphs.setdefault(res.getIdentifier(), res)
+            self.packageGraphs[packageId] = graphs
+        return graphs.get(graphId)
+
+    def getPackages(self):
+        if self.packages == None:
+            self.packages = {}
+            packages = self.sdApp.getPackageMgr().getUserPackages()
+            pkgCount = packages.getSize()
+            for i in range(0, pkgCount):
+                pkg = packages.getItem(i)
+                self.packages.setdefault(pkg.getFilePath(), pkg)
+        return self.packages
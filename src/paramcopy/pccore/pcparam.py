@@ -3,30 +3,271 @@
 # (c) 2019-2025 Eyosido Software SARL
 # ---------------
 
+from array import array
+from collections.abc import MutableMapping
+
+from sd.api.sdproperty import SDPropertyCategory
+from sd.api.apiexception import APIException
+
 from paramcopy.pccore.pchelper import PCHelper
+from paramcopy.pccore import pclog
+from paramcopy.pccore.pcvalue import PCValueCodec, PCValueCompare
+from paramcopy.pccore.pcundo import PCUndoMgr
+from paramcopy.pccore.pcintern import PCIntern
+from paramcopy.pccore.pcfingerprint import PCLiveFingerprints
 
 class PCParam:
-# A parameter with value independent of the node it comes from
-    def __init__(self, propertyId, propertyLabel, inheritanceMethod, value, groupName = None):
+# A parameter with value independent of the node it comes from. The value is held in its encoded form (see PCValueCodec)
+# and the SD value is only rebuilt when accessed. Encoded values are interned, see release().
+    __slots__ = ("id", "label", "inheritanceMethod", "encodedValue", "groupName")
+
+    def __init__(self, propertyId, propertyLabel, inheritanceMethod, encodedValue, groupName = None):
         self.id = propertyId
         self.label = propertyLabel
         self.inheritanceMethod = inheritanceMethod
-        self.value = value
+        self.encodedValue = PCIntern.instance().internValue(encodedValue)
         self.groupName = groupName
 
+    def release(self):
+        # to be called once the parameter is no longer stored
+        PCIntern.instance().releaseValue(self.encodedValue)
+
+    @classmethod
+    def view(cls, propertyId, propertyLabel, inheritanceMethod, encodedValue, groupName = None):
+        # parameter holding no interned value reference of its own (see PCParamColumns)
+        param = cls.__new__(cls)
+        param.id = propertyId
+        param.label = propertyLabel
+        param.inheritanceMethod = inheritanceMethod
+        param.encodedValue = encodedValue
+        param.groupName = groupName
+        return param
+
+    @classmethod
+    def fromSDValue(cls, propertyId, propertyLabel, inheritanceMethod, sdValue, groupName = None):
+        return PCParam(propertyId, propertyLabel, inheritanceMethod, PCValueCodec.encode(sdValue), groupName)
+
+    @property
+    def value(self):
+        # new SD value on each access
+        return PCValueCodec.decode(self.encodedValue)
+
     def getName(self):
         return self.label if self.label and len(self.label) > 0 else self.id
 
+    def stateKey(self):
+        # hashable representation of the stored state
+        return (self.id, self.inheritanceMethod, self.encodedValue)
+
+    def isDecodableFor(self, destNode):
+        # arrays and structs loaded from the library can only be decoded once their SD type is known in the session,
+        # which is otherwise learnt from the destination property
+        if PCValueCodec.canDecode(self.encodedValue):
+            return True
+        try:
+            prop = destNode.getPropertyFromId(self.id, SDPropertyCategory.Input)
+            if prop:
+                PCValueCodec.registerType(prop.getType())
+        except APIException as e:
+            PCHelper.logSDException(e)
+        return PCValueCodec.canDecode(self.encodedValue)
+
+    def isSerializable(self):
+        return PCValueCodec.isSerializable(self.encodedValue)
+
+    def toData(self):
+        return [self.id, self.label, self.inheritanceMethod, self.encodedValue, self.groupName]
+
+    @classmethod
+    def fromData(cls, data):
+        propertyId, propertyLabel, inheritanceMethod, encodedValue, groupName = data
+        return PCParam(propertyId, propertyLabel, inheritanceMethod, PCValueCodec.fromJson(encodedValue), groupName)
+
+    def writeInto(self, destNode, skipUnchanged = False, stats = None, sdValue = None):
+        # if skipUnchanged is set, inheritance method and value are only written if they differ from the destination ones.
+        # sdValue may be provided by callers writing the same parameter into many nodes, to decode the value only once.
+        if sdValue == None and not self.isDecodableFor(destNode):
+            pclog.log("Parameter " + self.getName() + " of unknown type not written into node " + destNode.getIdentifier())
+            PCWriteStats.addUndecodable(stats)
+            return
+        PCLiveFingerprints.instance().invalidate(destNode)
+        if self.inheritanceMethod != -1:
+            #inheritance method is to be set *before* property value
+            if skipUnchanged and PCHelper.getInheritanceMethod(destNode, self.id) == self.inheritanceMethod:
+                PCWriteStats.addSkipped(stats)
+            else:
+                PCUndoMgr.instance().recordBefore(destNode, self.id)
+                destNode.setInputPropertyInheritanceMethodFromId(self.id, self.inheritanceMethod)
+                PCWriteStats.addWritten(stats)
+
+        if skipUnchanged and PCValueCompare.encodedEqual(self.encodedValue, PCValueCodec.encode(destNode.getInputPropertyValueFromId(self.id))):
+            PCWriteStats.addSkipped(stats)
+        else:
+            if sdValue == None:
+                sdValue = self.value
+            PCUndoMgr.instance().recordBefore(destNode, self.id)
+            destNode.setInputPropertyValueFromId(self.id, sdValue)
+            PCWriteStats.addWritten(stats)
+
+class PCWriteStats:
+# Counts SD write calls performed and skipped during a paste or recall operation
+    def __init__(self):
+        self.written = 0
+        self.skipped = 0
+        self.undecodable = 0 # parameters whose value could not be rebuilt, see PCParam.isDecodableFor()
+
+    @classmethod
+    def addWritten(cls, stats):
+        if stats:
+            stats.written += 1
+
+    @classmethod
+    def addSkipped(cls, stats):
+        if stats:
+            stats.skipped += 1
+
+    @classmethod
+    def addUndecodable(cls, stats):
+        if stats:
+            stats.undecodable += 1
+
+    def summary(self):
+        summary = str(self.written) + " write(s), " + str(self.skipped) + " unchanged skipped"
+        if self.undecodable > 0:
+            summary += ", " + str(self.undecodable) + " of unknown type not written"
+        return summary
+
+class PCParamColumns(MutableMapping):
+    """
+    Column-oriented storage of the parameters of a collection, used as a dict (key: input param id, val: PCParam).
+    Parameters are held as parallel arrays of property index (see PCIntern.propertyIndex()), inheritance method
+    and interned value reference rather than as one object each. PCParam objects are only built on access, as views
+    holding no interned reference. Item assignment takes a value reference of its own, released once the parameter
+    is replaced, deleted or the collection released, so any PCParam (view or not) can be stored, callers releasing
+    the references they hold themselves.
+    """
+    __slots__ = ("propIndices", "inheritanceMethods", "valueRefs", "slots")
+
+    def __init__(self):
+        self.propIndices = array("I")
+        self.inheritanceMethods = array("b") # -1 if the parameter has no inheritance method
+        self.valueRefs = [] # interned encoded values
+        self.slots = {} # key: property index, val: slot in the columns
+
+    def __len__(self):
+        return len(self.propIndices)
+
+    def __iter__(self):
+        intern = PCIntern.instance()
+        for propIndex in self.propIndices:
+            yield intern.propertyAt(propIndex)[0]
+
+    def __contains__(self, propertyId):
+        return self.slotOf(propertyId) != -1
+
+    def __getitem__(self, propertyId):
+        slot = self.slotOf(propertyId)
+        if slot == -1:
+            raise KeyError(propertyId)
+        return self.paramAt(slot)
+
+    def __setitem__(self, propertyId, param):
+        intern = PCIntern.instance()
+        propIndex = intern.propertyIndex(propertyId, param.label, param.groupName)
+        valueRef = intern.internValue(param.encodedValue) # taken before releasing the replaced value, which may be the same
+        slot = self.slotOf(propertyId)
+        if slot == -1:
+            self.slots[propIndex] = len(self.propIndices)
+            self.propIndices.append(propIndex)
+            self.inheritanceMethods.append(int(param.inheritanceMethod))
+            self.valueRefs.append(valueRef)
+        else:
+            intern.releaseValue(self.valueRefs[slot])
+            del self.slots[self.propIndices[slot]]
+            self.slots[propIndex] = slot
+            self.propIndices[slot] = propIndex
+            self.inheritanceMethods[slot] = int(param.inheritanceMethod)
+            self.valueRefs[slot] = valueRef
+
+    def __delitem__(self, propertyId):
+        slot = self.slotOf(propertyId)
+        if slot == -1:
+            raise KeyError(propertyId)
+        PCIntern.instance().releaseValue(self.valueRefs.pop(slot))
+        del self.slots[self.propIndices.pop(slot)]
+        self.inheritanceMethods.pop(slot)
+        for nextSlot in range(slot, len(self.propIndices)): # parameters keep their order
+            self.slots[self.propIndices[nextSlot]] = nextSlot
+
+    def items(self):
+        # avoids a lookup per parameter
+        intern = PCIntern.instance()
+        return [(intern.propertyAt(self.propIndices[slot])[0], self.paramAt(slot)) for slot in range(len(self.propIndices))]
+
+    def values(self):
+        return [self.paramAt(slot) for slot in range(len(self.propIndices))]
+
+    def release(self):
+        intern = PCIntern.instance()
+        for valueRef in self.valueRefs:
+            intern.releaseValue(valueRef)
+        self.propIndices = array("I")
+        self.inheritanceMethods = array("b")
+        self.valueRefs = []
+        self.slots = {}
+
+    # --- Private
+    def slotOf(self, propertyId):
+        # a property id usually maps to a single property index
+        for propIndex in PCIntern.instance().propertyIdIndices(propertyId):
+            slot = self.slots.get(propIndex)
+            if slot != None:
+                return slot
+        return -1
+
+    def paramAt(self, slot):
+        propertyId, label, groupName = PCIntern.instance().propertyAt(self.propIndices[slot])
+        return PCParam.view(propertyId, label, PCHelper.toInheritanceMethod(self.inheritanceMethods[slot]), self.valueRefs[slot], groupName)
+
 class PCParamCollection:
 # A collection of parameter values (PCParam) that can be stored in memory and is independent from the nodes
 # parameters come from.
+    __slots__ = ("params",)
+
     def __init__(self):
-        self.params = {} # key: input param id, val: PCParam
-    
+        self.params = PCParamColumns() # key: input param id, val: PCParam
+
+    def release(self):
+        # to be called once the collection is no longer stored, releases interned values
+        self.params.release()
+
+    def toData(self):
+        # parameters whose value cannot be serialized are left out
+        return [param.toData() for param in self.params.values() if param.isSerializable()]
+
+    @classmethod
+    def fromData(cls, data):
+        collection = PCParamCollection()
+        for paramData in data:
+            param = PCParam.fromData(paramData)
+            collection.params[param.id] = param
+            param.release() # the collection holds its own reference
+        return collection
+
+    def diff(self, other):
+        # ids of parameters whose stored state differs between both collections, including the ones present in only one of them
+        return [paramId for paramId in self.params.keys() | other.params.keys() \
+                if paramId not in self.params or paramId not in other.params \
+                    or self.params[paramId].stateKey() != other.params[paramId].stateKey()]
+
     def paramNames(self):
+        return PCParamCollection.namesText(self.params.values())
+
+    @classmethod
+    def namesText(cls, params):
         names = ""
         first = True
-        for param in self.params.values():
+        for param in params:
             name = param.getName()
             if first:
                 names += name
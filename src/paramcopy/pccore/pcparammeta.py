@@ -0,0 +1,148 @@
+# ---------------
+# ParamCopy - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+from sd.api.sdgraph import SDGraph
+from sd.api.sdproperty import SDPropertyCategory
+from sd.api.apiexception import APIException
+
+from paramcopy.pccore.pchelper import PCHelper
+from paramcopy.pccore.pcvalue import PCValueCodec
+from paramcopy.pccore import pclog
+
+class PCPropMeta:
+# Node-independent facts about an input property, shared by all nodes of a same definition
+    def __init__(self, prop, groupName, hidden, graph = None):
+        self.prop = prop
+        self.id = prop.getId()
+        self.label = prop.getLabel()
+        self.name = PCHelper.getPropertyOrDefinitionName(prop)
+        self.typeName = prop.getType().getClassName()
+        self.groupName = groupName
+        self.hidden = hidden
+        self.isBaseParam = PCHelper.isBaseParameter(self.id)
+        self.isFunctionOnly = prop.isFunctionOnly()
+        self.graph = graph # referenced graph whose input annotations describe the property, or None
+        self.valueRangeRead = False
+        self.cachedValueRange = None
+
+    @property
+    def valueRange(self):
+        # (encoded min, encoded max, clamp) from annotations, or None. Only the randomizer needs it so it is read on first access
+        if not self.valueRangeRead:
+            self.cachedValueRange = PCParamMetaCache.valueRangeAnnotation(self.graph, self.id)
+            self.valueRangeRead = True
+        return self.cachedValueRange
+
+class PCDefMeta:
+# Input property metadata of a node definition
+    def __init__(self, defKey, signature):
+        self.defKey = defKey
+        self.signature = signature # determines whether metadata is still valid, see PCParamMetaCache.signature()
+        self.props = [] # ordered list of PCPropMeta, node inputs (textures) excluded
+        self.propDict = {} # key: property id, val: PCPropMeta
+
+    def addProp(self, propMeta):
+        self.props.append(propMeta)
+        self.propDict[propMeta.id] = propMeta
+
+    def getProp(self, propertyId):
+        return self.propDict.get(propertyId)
+
+class PCParamMetaCache:
+    """
+    Input property metadata (order, labels, group names, visibility, types) per node definition,
+    so that annotations are only queried once per definition instead of once per parameter and node.
+    Metadata is rebuilt when the referenced resource, its package, or the ids and labels of its properties change.
+    Edits of annotations only (group, visible_if...) are picked up once their package is saved or reloaded (see PCUIManager).
+    """
+    inst = None
+
+    @classmethod
+    def instance(cls):
+        if not cls.inst:
+            cls.inst = PCParamMetaCache()
+        return cls.inst
+
+    def __init__(self):
+        self.defMetas = {} # key: definition key (see PCHelper.nodeDefKey()), val: PCDefMeta
+
+    def getDefMeta(self, node):
+        defKey = PCHelper.nodeDefKey(node)
+        properties = node.getProperties(SDPropertyCategory.Input)
+        resource = node.getReferencedResource()
+        signature = self.signature(resource, properties)
+
+        defMeta = self.defMetas.get(defKey)
+        if not defMeta or defMeta.signature != signature:
+            defMeta = self.buildDefMeta(defKey, signature, properties, resource)
+            self.defMetas[defKey] = defMeta
+        return defMeta
+
+    def invalidatePackage(self, packageId):
+        # drop metadata of definitions whose referenced resource belongs to the given package
+        self.defMetas = {defKey:defMeta for defKey, defMeta in self.defMetas.items() if defMeta.signature[1] != packageId}
+
+    def clear(self):
+        self.defMetas = {}
+
+    # --- Private
+    def signature(self, resource, properties):
+        resourceId = None
+        packageId = None
+        if resource:
+            resourceId = resource.getIdentifier()
+            package = resource.getPackage()
+            if package:
+                packageId = PCHelper.getPackageId(package)
+        content = 0 # ids and labels of the properties, cheap compared to annotation queries
+        if properties:
+            content = hash(tuple((prop.getId(), prop.getLabel()) for prop in [properties.getItem(p) for p in range(0, properties.getSize())]))
+        return (resourceId, packageId, content)
+
+    def buildDefMeta(self, defKey, signature, properties, resource):
+        defMeta = PCDefMeta(defKey, signature)
+        if properties:
+            graph = resource if isinstance(resource, SDGraph) else None
+            psize = properties.getSize()
+            for p in range(0, psize):
+                prop = properties.getItem(p)
+                if prop.getType().getClassName() != "SDTypeTexture": # do not process node inputs
+                    groupName, hidden = self.annotations(graph, prop.getId())
+                    defMeta.addProp(PCPropMeta(prop, groupName, hidden, graph))
+        return defMeta
+
+    def annotations(self, graph, propertyId):
+        # group name and visibility are read from the annotations of the referenced graph input, if any
+        groupName = None
+        hidden = False
+        if graph:
+            try:
+                graphProp = graph.getPropertyFromId(propertyId, SDPropertyCategory.Input)
+                if graphProp:
+                    val = graph.getPropertyAnnotationValueFromId(graphProp, "group")
+                    if val:
+                        groupName = val.get()
+                    val = graph.getPropertyAnnotationValueFromId(graphProp, "visible_if")
+                    if val:
+                        hidden = PCHelper.isHiddenVisibleIfValue(val.get())
+            except APIException as e:
+                PCHelper.logSDException(e)
+        return groupName, hidden
+
+    @classmethod
+    def valueRangeAnnotation(cls, graph, propertyId):
+        valueRange = None
+        if graph:
+            try:
+                graphProp = graph.getPropertyFromId(propertyId, SDPropertyCategory.Input)
+                if graphProp:
+                    minVal = graph.getPropertyAnnotationValueFromId(graphProp, "min")
+                    maxVal = graph.getPropertyAnnotationValueFromId(graphProp, "max")
+                    if minVal and maxVal:
+                        clampVal = graph.getPropertyAnnotationValueFromId(graphProp, "clamp")
+                        valueRange = (PCValueCodec.encode(minVal), PCValueCodec.encode(maxVal), bool(clampVal.get()) if clampVal else False)
+            except APIException as e:
+                PCHelper.logSDException(e)
+        return valueRange
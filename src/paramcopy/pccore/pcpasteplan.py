@@ -0,0 +1,105 @@
+# ---------------
+# ParamCopy - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+from sd.api.sdproperty import SDPropertyCategory
+from sd.api.apiexception import APIException
+
+from paramcopy.pccore.pchelper import PCHelper
+from paramcopy.pccore.pcvalue import PCValueCodec
+
+class PCPastePlan:
+    """
+    Paste of a node state into multiple destination nodes. Destination nodes are grouped
+    by node type (definition id and label) and the parameters to write are determined once
+    per group, so per-node work is limited to the function-driven check and the writes.
+    """
+    class ParamWrite:
+    # write of a single parameter, valid for every node of a definition group
+        def __init__(self, param, prop):
+            self.param = param
+            self.prop = prop
+            self.checkFunction = not prop.isFunctionOnly() # function-only props are never considered as function driven
+            self.sdValue = None # decoded on first write, then shared by all the nodes of the group
+
+        def writeInto(self, destNode, skipUnchanged, stats):
+            if self.sdValue == None and PCValueCodec.canDecode(self.param.encodedValue):
+                self.sdValue = self.param.value
+            self.param.writeInto(destNode, skipUnchanged, stats, self.sdValue)
+
+    class DefGroup:
+    # destination nodes sharing a same definition
+        def __init__(self, defKey):
+            self.defKey = defKey
+            self.nodes = []
+            self.paramWrites = [] # list of ParamWrite
+
+    def __init__(self, sourceNodeState, pasteOptions, propertyIds = None):
+        self.sourceNodeState = sourceNodeState
+        self.pasteOptions = pasteOptions
+        self.propertyIds = frozenset(propertyIds) if propertyIds else None # presets already hold frozensets, which are then not copied
+        self.groups = [] # list of DefGroup, in order of first appearance in destination nodes
+
+    def compile(self, destNodes):
+        self.groups = []
+        groupDict = {} # key: definition key, val: DefGroup or None if nodes of this type are not to be pasted into
+        destNodeCount = destNodes.getSize()
+        for n in range(0, destNodeCount):
+            destNode = destNodes.getItem(n)
+            defKey = PCHelper.nodeDefKey(destNode)
+            if defKey in groupDict:
+                group = groupDict[defKey]
+            else:
+                group = self.compileGroup(defKey, destNode)
+                groupDict[defKey] = group
+                if group:
+                    self.groups.append(group)
+
+            if group:
+                group.nodes.append(destNode)
+
+    def compileGroup(self, defKey, destNode):
+        srcAndDestHaveSameNodeType = defKey == self.sourceNodeState.nodeIdentifier.defKey()
+        if self.pasteOptions.sameTypeAsSource and not srcAndDestHaveSameNodeType:
+            return None
+
+        copyBaseAndSpecific = srcAndDestHaveSameNodeType or self.pasteOptions.crossTypeSpecificParamsCopy
+        group = PCPastePlan.DefGroup(defKey)
+        for propertyId, param in self.sourceNodeState.state.params.items():
+            if self.propertyIds and not propertyId in self.propertyIds: # filter properties
+                continue
+            if not copyBaseAndSpecific and not PCHelper.isBaseParameter(propertyId):
+                continue
+
+            # verify whether property exists in destination node type
+            prop = None
+            try:
+                prop = destNode.getPropertyFromId(propertyId, SDPropertyCategory.Input)
+            except APIException as e:
+                PCHelper.logSDException(e)
+
+            if prop:
+                group.paramWrites.append(PCPastePlan.ParamWrite(param, prop))
+        return group
+
+    def nodeCount(self):
+        return sum(len(group.nodes) for group in self.groups)
+
+    def nodeWrites(self):
+        # list of (destination node, DefGroup), one entry per node to write into
+        return [(destNode, group) for group in self.groups for destNode in group.nodes]
+
+    def execute(self, skipUnchanged = False, stats = None):
+        for group in self.groups:
+            for destNode in group.nodes:
+                self.writeNode(destNode, group, skipUnchanged, stats)
+
+    def writeNode(self, destNode, group, skipUnchanged = False, stats = None):
+        for paramWrite in group.paramWrites:
+            try:
+                if paramWrite.checkFunction and destNode.getPropertyGraph(paramWrite.prop):
+                    continue # make sure not to copy over a user function
+                paramWrite.writeInto(destNode, skipUnchanged, stats)
+            except APIException as e:
+                PCHelper.logSDException(e)
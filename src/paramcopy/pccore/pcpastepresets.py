@@ -0,0 +1,89 @@
+# ---------------
+# ParamCopy - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+from paramcopy.pccore.pccopier import PCCopier
+from paramcopy.pccore.pcprefs import PCPrefs
+
+class PCPastePreset:
+    # named parameter selection to paste, for clipboards of a given node definition or of any definition (global)
+    __slots__ = ("name", "defKey", "propertyIds")
+
+    def __init__(self, name, propertyIds, defKey = None):
+        self.name = name
+        self.defKey = defKey # (definition id, definition label), None for a global preset
+        self.propertyIds = frozenset(propertyIds)
+
+    def isGlobal(self):
+        return self.defKey == None
+
+    def isApplicableTo(self, clipboard):
+        return self.defKey == None or self.defKey == clipboard.nodeIdentifier.defKey()
+
+    def toData(self):
+        return { "name": self.name, "defKey": list(self.defKey) if self.defKey else None, "propertyIds": sorted(self.propertyIds) }
+
+    @classmethod
+    def fromData(cls, data):
+        defKey = data.get("defKey")
+        return PCPastePreset(data["name"], data["propertyIds"], tuple(defKey) if defKey else None)
+
+class PCPastePresets:
+    """
+    Parameter selection presets saved in preferences, pasted from the current clipboard without going through
+    the Paste dialog. Presets are assigned to numbered slots triggered by shortcuts, or picked from the toolbar.
+    """
+    SLOT_COUNT = 4
+
+    inst = None
+
+    @classmethod
+    def instance(cls):
+        if not cls.inst:
+            cls.inst = PCPastePresets()
+        return cls.inst
+
+    def __init__(self):
+        self.presets = {} # key: preset name, val: PCPastePreset
+        for data in PCPrefs.instance().pastePresets:
+            preset = PCPastePreset.fromData(data)
+            self.presets[preset.name] = preset
+
+    def get(self, name):
+        return self.presets.get(name)
+
+    def applicablePresets(self, clipboard):
+        # presets of the clipboard definition first, then global ones
+        presets = [preset for preset in self.presets.values() if preset.isApplicableTo(clipboard)]
+        return sorted(presets, key = lambda preset: (preset.isGlobal(), preset.name.lower()))
+
+    def save(self, name, propertyIds, defKey = None):
+        self.presets[name] = PCPastePreset(name, propertyIds, defKey)
+        self.savePrefs()
+
+    def delete(self, name):
+        if self.presets.pop(name, None):
+            prefs = PCPrefs.instance()
+            prefs.pastePresetSlots = [slotName if slotName != name else None for slotName in prefs.pastePresetSlots]
+            self.savePrefs()
+
+    def slotName(self, slot):
+        # name of the preset assigned to the slot, or None
+        names = PCPrefs.instance().pastePresetSlots
+        return names[slot] if slot < len(names) else None
+
+    def assign(self, slot, name):
+        prefs = PCPrefs.instance()
+        prefs.pastePresetSlots = (prefs.pastePresetSlots + [None] * PCPastePresets.SLOT_COUNT)[:PCPastePresets.SLOT_COUNT]
+        prefs.pastePresetSlots[slot] = name
+        prefs.save()
+
+    def paste(self, preset, clipboard, destNodes, skipUnchanged = False, stats = None):
+        PCCopier.instance().pasteNodeStateInto(clipboard, destNodes, PCCopier.PasteOptions(), preset.propertyIds, skipUnchanged, stats)
+
+    # --- Private
+    def savePrefs(self):
+        prefs = PCPrefs.instance()
+        prefs.pastePresets = [preset.toData() for preset in self.presets.values()]
+        prefs.save()
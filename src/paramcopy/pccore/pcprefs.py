@@ -32,14 +32,32 @@ class PCPrefs:
         self.computeGraphAfterRSRoll = True # compute graph after random seed roll
         self.computeGraphAfterPaste = True
         self.computeGraphAfterVariationRecall = True
+        self.computeGraphAfterSweep = True # compute graph after moving to another parameter sweep combination
         self.optionalConfirmations = True
         self.copyDlgSelectAll = True
+        self.skipUnchangedWrites = True # only write parameters whose value or inheritance method differ from the destination ones
+        self.computeDebounceMs = 250 # compute requests within this delay are coalesced into a single compute
+        self.computeBudgetMs = 500 # graphs whose compute takes longer are computed once the user is idle
+        self.computeIdleDelayMs = 1500 # user inactivity time after which heavy graphs are computed
+        self.jobSliceMs = 16 # paste/recall work done per event loop iteration
+        self.persistentLibrary = True # variations and named clipboards are saved on disk and restored in next sessions
+        self.variationDeltaStorage = True # variations only store parameters differing from the node definition defaults
+        self.variationIndex = True # index variations in a SQLite database for fast filtering
+        self.blendThrottleMs = 50 # minimum delay between two writes while the variation blend slider is moved
+        self.variationMatchScan = True # mark listed variations as active, partially matching or stale against the graph
+        self.multiPasteMatching = "position" # how nodes are matched when pasting a multiple node copy, see PCNodeMatcher
         
         self.copyParamsShortcut = "Ctrl+Alt+C"
         self.pasteParamsShortcut = "Ctrl+Alt+V"
         self.rollRandomSeedsShortcut = "R"
         self.storeVariationShortcut = "Shift+V"
         self.showVariationsShortcut = "Alt+V"
+        self.undoShortcut = "Ctrl+Alt+Z"
+        self.recallSlotShortcuts = ["Ctrl+Alt+1", "Ctrl+Alt+2", "Ctrl+Alt+3", "Ctrl+Alt+4"] # see PCRecallSlots
+        self.recallSlots = [None, None, None, None] # names of the variations assigned to quick recall slots
+        self.pastePresetShortcuts = ["Ctrl+Alt+Shift+1", "Ctrl+Alt+Shift+2", "Ctrl+Alt+Shift+3", "Ctrl+Alt+Shift+4"] # see PCPastePresets
+        self.pastePresetSlots = [None, None, None, None] # names of the paste presets assigned to quick paste slots
+        self.pastePresets = [] # parameter selection presets, see PCPastePreset.toData()
 
     @classmethod
     def filename(cls):
@@ -0,0 +1,131 @@
+# ---------------
+# ParamCopy - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+import random
+
+try:
+    import numpy
+except ImportError:
+    numpy = None # values are then drawn one by one from Python's generator, with the same seed semantics but different values
+
+from sd.api.apiexception import APIException
+
+from paramcopy.pccore.pchelper import PCHelper
+from paramcopy.pccore.pcparam import PCParam, PCWriteStats
+from paramcopy.pccore.pcparammeta import PCParamMetaCache
+from paramcopy.pccore.pcvalue import PCValueCodec
+from paramcopy.pccore.pcundo import PCUndoGroup
+from paramcopy.pccore import pclog
+
+class PCRandomizer:
+    """
+    Bulk randomization of numeric specific parameters within the min/max range of their annotations.
+    All the components of all the parameters to randomize are drawn at once from a generator seeded
+    with the given seed, so a same seed applied to a same node selection and parameter list gives the
+    same values. The seed and drawn values are logged to that effect.
+    """
+    TYPE_TAGS = { "SDTypeInt": "int", "SDTypeInt2": "int2", "SDTypeInt3": "int3", "SDTypeInt4": "int4",
+                  "SDTypeFloat": "float", "SDTypeFloat2": "float2", "SDTypeFloat3": "float3", "SDTypeFloat4": "float4",
+                  "SDTypeDouble": "double", "SDTypeDouble2": "double2", "SDTypeDouble3": "double3", "SDTypeDouble4": "double4",
+                  "SDTypeColorRGB": "rgb", "SDTypeColorRGBA": "rgba" } # key: property type class name, val: encoded value tag
+
+    class Draw:
+    # value drawn for a node parameter
+        def __init__(self, node, propMeta, tag):
+            self.node = node
+            self.propMeta = propMeta
+            self.tag = tag
+            self.encodedValue = None
+
+    @classmethod
+    def isRandomizable(cls, propMeta):
+        return not propMeta.isBaseParam and not propMeta.hidden and propMeta.valueRange != None and propMeta.typeName in PCRandomizer.TYPE_TAGS
+
+    @classmethod
+    def randomizableProps(cls, nodes):
+        # PCPropMeta of the parameters which can be randomized in at least one of the nodes, in order of first appearance
+        props = {}
+        metaCache = PCParamMetaCache.instance()
+        for node in nodes:
+            for propMeta in metaCache.getDefMeta(node).props:
+                if not propMeta.id in props and cls.isRandomizable(propMeta):
+                    props[propMeta.id] = propMeta
+        return list(props.values())
+
+    def __init__(self, seed):
+        self.seed = seed
+        self.draws = []
+
+    def draw(self, nodes, propertyIds):
+        # draws the values of the given parameters of the given nodes, parameters driven by a function are left out
+        self.draws = []
+        lows = []
+        highs = []
+        intSpans = [] # 1 for int components so that the upper bound can be drawn, 0 otherwise
+        metaCache = PCParamMetaCache.instance()
+        for node in nodes:
+            defMeta = metaCache.getDefMeta(node)
+            for propertyId in propertyIds:
+                propMeta = defMeta.getProp(propertyId)
+                if not propMeta or not PCRandomizer.isRandomizable(propMeta) or self.isFunctionDriven(node, propMeta):
+                    continue
+                tag = PCRandomizer.TYPE_TAGS[propMeta.typeName]
+                width = PCValueCodec.NUMERIC_WIDTHS[tag]
+                encodedMin, encodedMax, _ = propMeta.valueRange
+                lows.extend(self.components(encodedMin, width))
+                highs.extend(self.components(encodedMax, width))
+                intSpans.extend([1 if tag in PCValueCodec.INT_TAGS else 0] * width)
+                self.draws.append(PCRandomizer.Draw(node, propMeta, tag))
+
+        values = self.uniformValues(lows, highs, intSpans)
+        index = 0
+        for draw in self.draws:
+            width = PCValueCodec.NUMERIC_WIDTHS[draw.tag]
+            components = values[index:index + width]
+            if draw.tag in PCValueCodec.INT_TAGS:
+                components = [min(int(c // 1), int(highs[index + i])) for i, c in enumerate(components)]
+            index += width
+            draw.encodedValue = (draw.tag, components[0] if width == 1 else tuple(components))
+        return self.draws
+
+    def write(self, skipUnchanged = True):
+        # writes drawn values, returns the write statistics (PCWriteStats)
+        stats = PCWriteStats()
+        with PCUndoGroup("Randomize Parameters"):
+            for draw in self.draws:
+                try:
+                    param = PCParam.view(draw.propMeta.id, draw.propMeta.label, -1, draw.encodedValue, draw.propMeta.groupName)
+                    param.writeInto(draw.node, skipUnchanged, stats)
+                except APIException as e:
+                    PCHelper.logSDException(e)
+        return stats
+
+    def log(self):
+        pclog.log("Randomize parameters, seed " + str(self.seed) + " (" + ("numpy" if numpy else "python") + " generator), " + str(len(self.draws)) + " value(s):")
+        for draw in self.draws:
+            pclog.log("  " + draw.node.getIdentifier() + " " + draw.propMeta.id + " = " + str(draw.encodedValue[1]))
+
+    # --- Private
+    def isFunctionDriven(self, node, propMeta):
+        try:
+            return PCHelper.isInputParamFunctionDriven(node, propMeta.prop)
+        except APIException as e:
+            PCHelper.logSDException(e)
+            return True
+
+    def components(self, encodedValue, width):
+        payload = encodedValue[1] if encodedValue else 0
+        if isinstance(payload, tuple):
+            return [float(c) for c in payload[:width]] + [float(payload[-1])] * (width - len(payload))
+        return [float(payload)] * width # scalar range applied to every component
+
+    def uniformValues(self, lows, highs, intSpans):
+        # one draw per component, in a single vectorized step when numpy is available
+        if numpy:
+            lows = numpy.array(lows)
+            spans = numpy.array(highs) - lows + numpy.array(intSpans)
+            return (lows + numpy.random.default_rng(self.seed).random(len(lows)) * spans).tolist()
+        generator = random.Random(self.seed)
+        return [low + generator.random() * (high - low + intSpan) for low, high, intSpan in zip(lows, highs, intSpans)]
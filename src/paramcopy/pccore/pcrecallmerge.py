@@ -0,0 +1,72 @@
+# ---------------
+# ParamCopy - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+from paramcopy.pccore.pcnoderesolver import PCNodeResolver
+from paramcopy.pccore.pcstatemgr import PCNodeState
+from paramcopy.pccore import pclog
+
+class PCRecallMerge:
+    """
+    Recall of multiple variations combined into a single write plan before any node is written, so each
+    (node, property) is written once. When variations overlap, the parameter of the variation with the
+    highest priority wins, then the one added last (list order). Overlapping parameters whose stored states
+    differ are counted as resolved conflicts.
+    """
+    class NodeWrite:
+    # parameters to write into a single node
+        def __init__(self, nodeIdentifier, node):
+            self.nodeIdentifier = nodeIdentifier
+            self.node = node
+            self.params = {} # key: property id, val: PCParam
+            self.ranks = {} # key: property id, val: (priority, order) of the variation the parameter comes from
+            self.conflictIds = set() # ids of the properties stored with differing states by several variations
+
+    def __init__(self, resolver = None):
+        self.resolver = resolver if resolver else PCNodeResolver() # packages and graphs are indexed once for all variations
+        self.nodeWrites = {} # key: (package id, graph id, node id), val: NodeWrite, in order of first appearance
+        self.variationCount = 0
+        self.loadFailures = [] # names of the variations which could not be loaded from the library, not recalled
+
+    def add(self, stateSet, priority = 0):
+        # merges a variation into the plan, returns the count of its nodes which could not be found
+        rank = (priority, self.variationCount)
+        self.variationCount += 1
+        steps, misses = stateSet.recallSteps(self.resolver)
+        if stateSet.loadFailed:
+            self.loadFailures.append(stateSet.name)
+            return 0
+        for nodeState, node in steps:
+            nodeIdentifier = nodeState.nodeIdentifier
+            key = (nodeIdentifier.packageId, nodeIdentifier.graphId, nodeIdentifier.nodeId)
+            nodeWrite = self.nodeWrites.get(key)
+            if not nodeWrite:
+                nodeWrite = PCRecallMerge.NodeWrite(nodeIdentifier, node)
+                self.nodeWrites[key] = nodeWrite
+            for propertyId, param in nodeState.effectiveParams().items():
+                current = nodeWrite.params.get(propertyId)
+                if current:
+                    if current.stateKey() != param.stateKey():
+                        nodeWrite.conflictIds.add(propertyId)
+                    if rank < nodeWrite.ranks[propertyId]:
+                        continue
+                nodeWrite.params[propertyId] = param
+                nodeWrite.ranks[propertyId] = rank
+        return misses
+
+    def steps(self):
+        return list(self.nodeWrites.values())
+
+    def conflictCount(self):
+        return sum(len(nodeWrite.conflictIds) for nodeWrite in self.nodeWrites.values())
+
+    def logConflicts(self):
+        for nodeWrite in self.nodeWrites.values():
+            if nodeWrite.conflictIds:
+                pclog.log("Variation recall conflicts on " + nodeWrite.nodeIdentifier.getName() + " (" + nodeWrite.nodeIdentifier.nodeId + "): " + \
+                          ", ".join(sorted(nodeWrite.conflictIds)))
+
+    @classmethod
+    def writeNode(cls, nodeWrite, skipUnchanged = False, stats = None):
+        PCNodeState.writeParamsInto(nodeWrite.params, nodeWrite.node, skipUnchanged = skipUnchanged, stats = stats)
@@ -0,0 +1,137 @@
+# ---------------
+# ParamCopy - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+from sd.api.sdproperty import SDPropertyCategory
+from sd.api.apiexception import APIException
+
+from paramcopy.pccore.pchelper import PCHelper
+from paramcopy.pccore.pcnoderesolver import PCNodeResolver
+from paramcopy.pccore.pcstatemgr import PCStateMgr
+from paramcopy.pccore.pcundo import PCUndoGroup
+from paramcopy.pccore.pcprefs import PCPrefs
+from paramcopy.pccore import pclog
+
+class PCRecallPlan:
+    """
+    Precompiled recall of a variation: nodes are resolved, parameters missing from their node are filtered
+    out and values are decoded once, so executing the plan mostly performs the SD write calls. Whether a
+    parameter is driven by a function is checked on each execution, as functions may have been connected
+    since compilation. A plan becomes invalid when the variation it was compiled from is replaced or deleted,
+    or when one of its nodes cannot be written anymore (node deleted meanwhile).
+    """
+    class NodeWrite:
+        def __init__(self, nodeState, node):
+            self.nodeState = nodeState
+            self.node = node
+            self.paramWrites = [] # list of (PCParam, SDProperty, decoded SD value)
+
+    def __init__(self, stateSet):
+        self.stateSet = stateSet
+        self.nodeWrites = []
+        self.misses = 0 # count of variation nodes not found at compile time
+        self.failedStates = [] # node states whose node could not be written by the last execution
+        self.valid = False
+
+    def compile(self, resolver = None):
+        steps, self.misses = self.stateSet.recallSteps(resolver)
+        self.nodeWrites = []
+        for nodeState, node in steps:
+            nodeWrite = PCRecallPlan.NodeWrite(nodeState, node)
+            for propertyId, param in nodeState.effectiveParams().items():
+                try:
+                    prop = node.getPropertyFromId(propertyId, SDPropertyCategory.Input)
+                    if prop:
+                        # values of unknown type are left undecoded, to be counted and logged when written
+                        nodeWrite.paramWrites.append((param, prop, param.value if param.isDecodableFor(node) else None))
+                except APIException as e:
+                    PCHelper.logSDException(e)
+            self.nodeWrites.append(nodeWrite)
+        self.valid = True
+
+    def isValidFor(self, stateSet):
+        return self.valid and self.stateSet is stateSet
+
+    def execute(self, skipUnchanged = False, stats = None, nodeStates = None):
+        # returns False if a node could not be written, in which case the plan is invalidated.
+        # If nodeStates is set, only the nodes of these node states are written
+        self.failedStates = []
+        for nodeWrite in self.nodeWrites:
+            if nodeStates != None and not nodeWrite.nodeState in nodeStates:
+                continue
+            try:
+                for param, prop, sdValue in nodeWrite.paramWrites:
+                    if not PCHelper.isInputParamFunctionDriven(nodeWrite.node, prop): # make sure not to copy over a user function
+                        param.writeInto(nodeWrite.node, skipUnchanged, stats, sdValue)
+            except APIException as e:
+                PCHelper.logSDException(e)
+                self.failedStates.append(nodeWrite.nodeState)
+                self.valid = False
+        return self.valid
+
+class PCRecallSlots:
+    """
+    Numbered quick-recall slots, each bound to a variation by name (saved in preferences) and recalled
+    through a shortcut. The recall plan of each slot is compiled on assignment and cached until invalidated
+    (see PCRecallPlan), package file changes invalidating all the plans.
+    """
+    SLOT_COUNT = 4
+
+    inst = None
+
+    @classmethod
+    def instance(cls):
+        if not cls.inst:
+            cls.inst = PCRecallSlots()
+        return cls.inst
+
+    def __init__(self):
+        self.plans = {} # key: slot index, val: PCRecallPlan
+
+    def slotName(self, slot):
+        # name of the variation assigned to the slot, or None
+        names = PCPrefs.instance().recallSlots
+        return names[slot] if slot < len(names) else None
+
+    def assign(self, slot, stateSet):
+        prefs = PCPrefs.instance()
+        prefs.recallSlots = (prefs.recallSlots + [None] * PCRecallSlots.SLOT_COUNT)[:PCRecallSlots.SLOT_COUNT]
+        prefs.recallSlots[slot] = stateSet.name if stateSet else None
+        prefs.save()
+        self.plans.pop(slot, None)
+        if stateSet:
+            self.getPlan(slot)
+
+    def invalidateAll(self):
+        self.plans = {}
+
+    def recall(self, slot, skipUnchanged = False, stats = None):
+        # returns the count of nodes which could not be found, -1 if no variation is assigned to the slot
+        # or -2 if the variation could not be loaded from the library
+        plan = self.getPlan(slot)
+        if not plan:
+            return -1
+        if plan.stateSet.loadFailed:
+            return -2
+        with PCUndoGroup("Variation Recall"):
+            if not plan.execute(skipUnchanged, stats):
+                pclog.log("Quick recall slot " + str(slot + 1) + ": node(s) no longer available, recompiling.")
+                # nodes already written are not written again, only the failed ones are retried once resolved anew
+                failedStates = set(plan.failedStates)
+                plan = self.getPlan(slot)
+                plan.execute(skipUnchanged, stats, failedStates)
+        return plan.misses
+
+    # --- Private
+    def getPlan(self, slot):
+        stateSet = PCStateMgr.instance().nodeStateSets.get(self.slotName(slot)) if self.slotName(slot) else None
+        if not stateSet:
+            self.plans.pop(slot, None)
+            return None
+        plan = self.plans.get(slot)
+        if not plan or not plan.isValidFor(stateSet) or plan.misses > 0: # missing nodes may have been recreated since
+            plan = PCRecallPlan(stateSet)
+            plan.compile(PCNodeResolver())
+            self.plans[slot] = plan
+        return plan
@@ -0,0 +1,121 @@
+# ---------------
+# ParamCopy - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+import random
+from array import array
+
+from sd.api.apiexception import APIException
+
+from paramcopy.pccore.pchelper import PCHelper
+from paramcopy.pccore.pcintern import PCIntern
+from paramcopy.pccore.pcnodeid import PCNodeIdentifier
+from paramcopy.pccore.pcnoderesolver import PCNodeResolver
+from paramcopy.pccore.pcparam import PCParam, PCWriteStats
+from paramcopy.pccore.pcundo import PCUndoGroup
+from paramcopy.pccore import pclog
+
+class PCSeedRoll:
+    """
+    History entry of a random seed roll: the master seed the node seeds are derived from, the rolled nodes
+    and the seeds they had before the roll. Node ids are kept verbatim as interned strings, shared by the entries
+    rolling the same nodes, and seeds are held in an array, so an entry can be replayed or reverted without storing variations.
+    """
+    __slots__ = ("masterSeed", "context", "nodeIds", "previousSeeds")
+
+    def __init__(self, masterSeed, context, nodeIds, previousSeeds):
+        self.masterSeed = masterSeed
+        self.context = context # PCGraphContext of the rolled nodes
+        intern = PCIntern.instance()
+        self.nodeIds = tuple(intern.internString(nodeId) for nodeId in nodeIds)
+        self.previousSeeds = array("i", previousSeeds)
+
+    def seeds(self):
+        # node seeds, over the full signed 32 bit range of SD int values
+        generator = random.Random(self.masterSeed)
+        return [generator.getrandbits(32) - (1 << 31) for _ in range(0, len(self.nodeIds))]
+
+class PCSeedRoller:
+    """
+    Random seed rolling from a dedicated generator, recorded into a history which can be stepped back through
+    (seeds before a roll are restored) and replayed (same seeds written again into the same nodes).
+    """
+    SEED_PROPERTY_ID = "$randomseed"
+    MAX_HISTORY = 100
+
+    inst = None
+
+    @classmethod
+    def instance(cls):
+        if not cls.inst:
+            cls.inst = PCSeedRoller()
+        return cls.inst
+
+    def __init__(self):
+        self.generator = random.SystemRandom() # master seeds only, node seeds are derived from them
+        self.history = [] # list of PCSeedRoll, most recent last
+        self.position = -1 # index in history of the last applied roll, -1 if none
+
+    def roll(self, nodes, graph):
+        # nodes: list of SDNode of graph. Returns the write statistics (PCWriteStats)
+        nodeIds = [node.getIdentifier() for node in nodes]
+        previousSeeds = [self.readSeed(node) for node in nodes]
+        context = PCIntern.instance().graphContext(PCHelper.getPackageId(graph.getPackage()), graph.getIdentifier())
+        seedRoll = PCSeedRoll(self.generator.getrandbits(32), context, nodeIds, previousSeeds)
+
+        del self.history[self.position + 1:] # rolling after stepping back discards the rolls stepped back from
+        self.history.append(seedRoll)
+        if len(self.history) > PCSeedRoller.MAX_HISTORY:
+            del self.history[0]
+        self.position = len(self.history) - 1
+
+        pclog.log("Roll Random Seeds #" + str(self.position + 1) + ": master seed " + str(seedRoll.masterSeed) + ", " + str(len(nodes)) + " node(s)")
+        return self.writeSeeds(nodes, seedRoll.seeds(), "Roll Random Seeds")
+
+    def canReroll(self):
+        return self.position >= 0
+
+    def reroll(self):
+        # writes again the seeds of the last applied roll, returns the write statistics and the count of nodes not found
+        seedRoll = self.history[self.position]
+        nodes = self.resolveNodes(seedRoll)
+        pclog.log("Re-roll Random Seeds #" + str(self.position + 1) + ": master seed " + str(seedRoll.masterSeed))
+        return self.writeSeeds(nodes, seedRoll.seeds(), "Re-roll Random Seeds"), nodes.count(None)
+
+    def canStepBack(self):
+        return self.position >= 0
+
+    def stepBack(self):
+        # restores the seeds preceding the last applied roll, returns the write statistics and the count of nodes not found
+        seedRoll = self.history[self.position]
+        nodes = self.resolveNodes(seedRoll)
+        pclog.log("Random Seeds restored to before roll #" + str(self.position + 1))
+        self.position -= 1
+        return self.writeSeeds(nodes, seedRoll.previousSeeds, "Step Back Random Seeds"), nodes.count(None)
+
+    # --- Private
+    def readSeed(self, node):
+        try:
+            value = node.getInputPropertyValueFromId(PCSeedRoller.SEED_PROPERTY_ID)
+            return value.get() if value else 0
+        except APIException as e:
+            PCHelper.logSDException(e)
+            return 0
+
+    def resolveNodes(self, seedRoll):
+        # list of SDNode in history entry order, None for nodes not found
+        resolver = PCNodeResolver()
+        context = seedRoll.context
+        return [resolver.resolve(PCNodeIdentifier.fromData([nodeId, context.graphId, context.packageId, None, None])) for nodeId in seedRoll.nodeIds]
+
+    def writeSeeds(self, nodes, seeds, undoName):
+        stats = PCWriteStats()
+        with PCUndoGroup(undoName):
+            for node, seed in zip(nodes, seeds):
+                if node:
+                    try:
+                        PCParam.view(PCSeedRoller.SEED_PROPERTY_ID, None, -1, ("int", seed)).writeInto(node, False, stats)
+                    except APIException as e:
+                        PCHelper.logSDException(e)
+        return stats
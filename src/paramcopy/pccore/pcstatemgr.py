@@ -12,15 +12,156 @@ from sd.api.apiexception import APIException
 
 from paramcopy.pccore.pchelper import PCHelper
 from paramcopy.pccore.pcnodeid import PCNodeIdentifier
+from paramcopy.pccore.pcnoderesolver import PCNodeResolver
+from paramcopy.pccore.pcundo import PCUndoGroup
 from paramcopy.pccore.pcparam  import PCParam, PCParamCollection
+from paramcopy.pccore.pcparammeta import PCParamMetaCache
+from paramcopy.pccore.pcdefaults import PCDefaultsTable
+from paramcopy.pccore.pcvalue import PCValueCompare
+from paramcopy.pccore.pclibrary import PCLibrary
+from paramcopy.pccore.pcvariationindex import PCVariationIndex
+from paramcopy.pccore.pcprefs import PCPrefs
+from paramcopy.pccore.pcintern import PCIntern
+from paramcopy.pccore.pcvalue import PCValueCodec
+from paramcopy.pccore.pcfingerprint import PCFingerprint, PCLiveFingerprints, PCVariationMatch
+from paramcopy.pccore import pclog
 
 class PCNodeState:
-    def __init__(self, node, storeBaseParams = True, storeSpecificParams = True, graph = None):
-        self.nodeIdentifier = PCNodeIdentifier(node, graph)
-        self.state = PCParamCollection()
+    __slots__ = ("nodeIdentifier", "paramCollection", "payloadLoader", "indexEntry", "defaultsId", "defaultsScope", "fingerprintDigest", "loadFailed")
 
-    def recallInto(self, destNode, copyBaseAndSpecific = True, propertyIds = None):
-        for propertyId, propertyData in self.state.params.items():
+    def __init__(self, node = None, storeBaseParams = True, storeSpecificParams = True, graph = None):
+        self.nodeIdentifier = None
+        self.setNodeIdentifier(PCNodeIdentifier(node, graph))
+        self.paramCollection = PCParamCollection()
+        self.payloadLoader = None # set while parameters persisted in the library are not loaded, returns the payload data
+        self.indexEntry = None # library index entry, used while parameters are not loaded
+        self.defaultsId = None # if set, only parameters differing from this defaults set (see PCDefaultsTable) are stored
+        self.defaultsScope = None # (base params, specific params) flags the defaults apply to
+        self.fingerprintDigest = None # see fingerprint()
+        self.loadFailed = False # set if the parameters persisted in the library, or their defaults set, could not be read
+
+    def setNodeIdentifier(self, nodeIdentifier):
+        # node identifiers are interned, identical ones being shared between clipboards and variations
+        intern = PCIntern.instance()
+        if self.nodeIdentifier:
+            intern.releaseNodeIdentifier(self.nodeIdentifier)
+        self.nodeIdentifier = intern.internNodeIdentifier(nodeIdentifier)
+
+    def release(self):
+        # to be called once the node state is no longer stored (clipboard or variation deleted), releases interned data
+        if not self.payloadLoader:
+            self.paramCollection.release()
+        self.payloadLoader = None
+        PCIntern.instance().releaseNodeIdentifier(self.nodeIdentifier)
+
+    @property
+    def state(self):
+        if self.payloadLoader:
+            loader = self.payloadLoader
+            self.payloadLoader = None
+            data = loader()
+            if data:
+                self.paramCollection = PCParamCollection.fromData(data["params"])
+            else:
+                self.loadFailed = True
+        return self.paramCollection
+
+    def checkLoaded(self):
+        # loads the parameters persisted in the library if not done yet, returns whether they could be read
+        self.state.params
+        return not self.loadFailed
+
+    def checkDefaults(self):
+        # returns whether the defaults set the parameters were compared against can be read, see effectiveParams()
+        if self.defaultsId and PCDefaultsTable.instance().getDefaults(self.defaultsId) == None:
+            self.loadFailed = True
+        return not self.loadFailed
+
+    def effectiveParams(self):
+        # stored parameters completed with the defaults they were compared against, i.e. all the parameters to recall.
+        # If the defaults set cannot be read, only the stored parameters are returned and the node state is marked
+        # as failed to load, so that it is not recalled partially
+        params = self.state.params
+        if not self.defaultsId:
+            return params
+        defaults = PCDefaultsTable.instance().getDefaults(self.defaultsId)
+        if defaults == None:
+            self.loadFailed = True
+            return params
+        storeBaseParams, storeSpecificParams = self.defaultsScope
+        allParams = {}
+        for propertyId, defaultParam in defaults.items():
+            if propertyId in params:
+                allParams[propertyId] = params[propertyId]
+            elif storeBaseParams if PCHelper.isBaseParameter(propertyId) else storeSpecificParams:
+                allParams[propertyId] = defaultParam
+        for propertyId, param in params.items():
+            if not propertyId in allParams:
+                allParams[propertyId] = param
+        return allParams
+
+    def fingerprint(self):
+        # stable digest of the parameters to recall, computed on first use
+        if not self.fingerprintDigest:
+            self.fingerprintDigest = PCFingerprint.digest([param.stateKey() for param in self.effectiveParams().values()])
+        return self.fingerprintDigest
+
+    def matchNode(self, node):
+        # returns the count of parameters to recall whose state matches the node one, and the count of parameters to recall
+        params = self.effectiveParams()
+        propertyIds = list(params.keys())
+        liveStates = PCLiveFingerprints.instance().liveStates(node, self.nodeIdentifier, propertyIds)
+        if PCFingerprint.digest(liveStates) == self.fingerprint():
+            return len(propertyIds), len(propertyIds)
+        matched = 0
+        for propertyId, liveState in zip(propertyIds, liveStates):
+            param = params[propertyId]
+            if param.inheritanceMethod == liveState[1] and PCValueCompare.encodedEqual(param.encodedValue, liveState[2]):
+                matched += 1
+        return matched, len(propertyIds)
+
+    def paramCount(self):
+        # count of parameters to recall, including the ones restored from defaults
+        return self.indexEntry["paramCount"] if self.payloadLoader else len(self.effectiveParams())
+
+    def paramNames(self):
+        return self.indexEntry["paramNames"] if self.payloadLoader else PCParamCollection.namesText(self.effectiveParams().values())
+
+    def toData(self):
+        data = { "node": self.nodeIdentifier.toData(), "params": self.state.toData() }
+        if self.defaultsId:
+            data["defaults"] = [self.defaultsId] + list(self.defaultsScope)
+        return data
+
+    def indexData(self):
+        return { "node": self.nodeIdentifier.toData(), "paramCount": self.paramCount(), "paramNames": self.paramNames() }
+
+    @classmethod
+    def fromData(cls, data):
+        nodeState = PCNodeState()
+        nodeState.setNodeIdentifier(PCNodeIdentifier.fromData(data["node"]))
+        nodeState.paramCollection = PCParamCollection.fromData(data["params"])
+        if "defaults" in data:
+            nodeState.defaultsId, storeBaseParams, storeSpecificParams = data["defaults"]
+            nodeState.defaultsScope = (storeBaseParams, storeSpecificParams)
+        return nodeState
+
+    @classmethod
+    def fromIndex(cls, indexEntry, payloadLoader):
+        nodeState = PCNodeState()
+        nodeState.setNodeIdentifier(PCNodeIdentifier.fromData(indexEntry["node"]))
+        nodeState.indexEntry = indexEntry
+        nodeState.payloadLoader = payloadLoader
+        return nodeState
+
+    def recallInto(self, destNode, copyBaseAndSpecific = True, propertyIds = None, skipUnchanged = False, stats = None):
+        PCNodeState.writeParamsInto(self.effectiveParams(), destNode, copyBaseAndSpecific, propertyIds, skipUnchanged, stats)
+
+    @classmethod
+    def writeParamsInto(cls, params, destNode, copyBaseAndSpecific = True, propertyIds = None, skipUnchanged = False, stats = None):
+        # params: dict (key: property id, val: PCParam)
+        propertyIds = frozenset(propertyIds) if propertyIds else None # hash lookups when filtering
+        for propertyId, propertyData in params.items():
             if not propertyIds or (propertyIds and propertyId in propertyIds): # filter properties
                 isBaseParam = PCHelper.isBaseParameter(propertyId)
                 if copyBaseAndSpecific or isBaseParam:
@@ -31,11 +172,7 @@ class PCNodeState:
                             destProp = destNode.getPropertyFromId(propertyId, SDPropertyCategory.Input)
                             isFunctionDriven = PCHelper.isInputParamFunctionDriven(destNode, destProp)
                             if not isFunctionDriven: # make sure not to copy over a user function
-                                if propertyData.inheritanceMethod != -1:
-                                    #inheritance method is to be set *before* property value
-                                    destNode.setInputPropertyInheritanceMethodFromId(propertyData.id, propertyData.inheritanceMethod)
-
-                                destNode.setInputPropertyValueFromId(propertyData.id, propertyData.value)
+                                propertyData.writeInto(destNode, skipUnchanged, stats)
                     except APIException as e:
                         PCHelper.logSDException(e)
                     finally:
@@ -44,57 +181,151 @@ class PCNodeState:
     def retrieveNode(self):
         return self.nodeIdentifier.retrieveNode()
 
-    def storeState(self, node, storeBaseParams = True, storeSpecificParams = True, propertyIds = None):
+    def storeState(self, node, storeBaseParams = True, storeSpecificParams = True, propertyIds = None, deltaOnly = False):
         #if propertyIds are defined, only those will be stored regardless of storeBaseParams/storeSpecificParams
-        properties = node.getProperties(SDPropertyCategory.Input)
-        if properties:
-            p = 0
-            psize = properties.getSize()
-
-            while p < psize:
-                prop = properties.getItem(p)
-                if prop.getType().getClassName() != "SDTypeTexture": # do not process node inputs
-                    propertyId = prop.getId()
-                    isBaseParam = PCHelper.isBaseParameter(propertyId)
-
-                    if (propertyIds and propertyId in propertyIds) or \
-                     (not propertyIds and \
-                             ( (isBaseParam and storeBaseParams) or (not isBaseParam and storeSpecificParams) ) \
-                     ):                
-                        if not PCHelper.isHiddenParam(node, propertyId):
-                            groupName = PCHelper.getParamGroupName(node, propertyId)
-                            inheritanceMethod = PCHelper.getInheritanceMethod(node, propertyId)
-                            value = node.getPropertyValue(prop) #  PCHelper.newPropertyValue(node, prop) ??
-                            param = PCParam(propertyId, prop.getLabel(), inheritanceMethod, value, groupName)
-                            self.state.params[propertyId] = param
-                p += 1
+        #if deltaOnly is set, parameters matching the definition defaults are not stored (not applicable along with propertyIds)
+        defMeta = PCParamMetaCache.instance().getDefMeta(node)
+        defaults = None
+        if deltaOnly and not propertyIds:
+            self.defaultsId, defaults = PCDefaultsTable.instance().defaultsFor(node, defMeta)
+            self.defaultsScope = (storeBaseParams, storeSpecificParams)
+        for propMeta in defMeta.props:
+            propertyId = propMeta.id
+            isBaseParam = propMeta.isBaseParam
+
+            if (propertyIds and propertyId in propertyIds) or \
+             (not propertyIds and \
+                     ( (isBaseParam and storeBaseParams) or (not isBaseParam and storeSpecificParams) ) \
+             ):
+                if not propMeta.hidden:
+                    inheritanceMethod = PCHelper.getInheritanceMethod(node, propertyId)
+                    encodedValue = PCValueCodec.encode(node.getInputPropertyValueFromId(propertyId))
+                    defaultParam = defaults.get(propertyId) if defaults else None
+                    if defaultParam and defaultParam.inheritanceMethod == inheritanceMethod \
+                        and PCValueCompare.encodedEqual(defaultParam.encodedValue, encodedValue):
+                        continue # restored from defaults at recall time
+                    self.state.params[propertyId] = PCParam.view(propertyId, propMeta.label, inheritanceMethod, encodedValue, propMeta.groupName)
+        self.fingerprintDigest = None
 
 class PCNodeStateSet:
-    def __init__(self, graph, stateSetName):
-        self.graphName = graph.getIdentifier()
-        package = graph.getPackage()
-        self.packageName = PCHelper.getPackageName(package)
-        self.id =  PCHelper.getPackageId(package) + "_" + graph.getIdentifier() + "_" + stateSetName
+    def __init__(self, graph = None, stateSetName = None):
         self.name = stateSetName
-        self.nodeStates = []
+        self.nodeStateList = []
+        self.payloadLoader = None # set while node states persisted in the library are not loaded, returns the payload data
+        self.indexEntry = None # library index entry, used while node states are not loaded
+        self.loadFailed = False # set if the node states persisted in the library, or their defaults sets, could not be read
+        if graph:
+            self.graphId = graph.getIdentifier()
+            self.graphName = graph.getIdentifier()
+            package = graph.getPackage()
+            self.packageId = PCHelper.getPackageId(package)
+            self.packageName = PCHelper.getPackageName(package)
+        else:
+            self.graphId = ""
+            self.graphName = ""
+            self.packageId = ""
+            self.packageName = ""
+        self.id = self.packageId + "_" + self.graphId + "_" + (stateSetName if stateSetName else "")
+
+    @property
+    def nodeStates(self):
+        if self.payloadLoader:
+            loader = self.payloadLoader
+            self.payloadLoader = None
+            data = loader()
+            if data:
+                self.nodeStateList = [PCNodeState.fromData(nodeStateData) for nodeStateData in data["nodeStates"]]
+                if not all([nodeState.checkDefaults() for nodeState in self.nodeStateList]):
+                    self.loadFailed = True # a recall would leave the parameters restored from defaults untouched
+            else:
+                self.loadFailed = True
+        return self.nodeStateList
+
+    def isLoaded(self):
+        return self.payloadLoader == None
+
+    def nodeCount(self):
+        return self.indexEntry["nodeCount"] if self.payloadLoader else len(self.nodeStateList)
+
+    def paramCount(self):
+        return self.indexEntry["paramCount"] if self.payloadLoader else sum(nodeState.paramCount() for nodeState in self.nodeStateList)
+
+    def release(self):
+        # to be called once the state set is deleted, releases interned data
+        if not self.payloadLoader:
+            for nodeState in self.nodeStateList:
+                nodeState.release()
+        self.nodeStateList = []
+        self.payloadLoader = None
+
+    def defaultsIds(self):
+        # ids of the defaults sets used by the node states, read from the library index while not loaded
+        if self.payloadLoader and "defaultsIds" in self.indexEntry:
+            return set(self.indexEntry["defaultsIds"])
+        return set(nodeState.defaultsId for nodeState in self.nodeStates if nodeState.defaultsId)
+
+    def toData(self):
+        return { "nodeStates": [nodeState.toData() for nodeState in self.nodeStates] }
+
+    def indexData(self):
+        return { "packageId": self.packageId, "packageName": self.packageName, "graphId": self.graphId, "graphName": self.graphName,
+                 "nodeCount": self.nodeCount(), "paramCount": self.paramCount(), "defaultsIds": sorted(self.defaultsIds()) }
+
+    @classmethod
+    def fromIndex(cls, stateSetName, indexEntry, payloadLoader):
+        stateSet = PCNodeStateSet(None, stateSetName)
+        stateSet.packageId = indexEntry["packageId"]
+        stateSet.packageName = indexEntry["packageName"]
+        stateSet.graphId = indexEntry["graphId"]
+        stateSet.graphName = indexEntry["graphName"]
+        stateSet.id = stateSet.packageId + "_" + stateSet.graphId + "_" + stateSetName
+        stateSet.indexEntry = indexEntry
+        stateSet.payloadLoader = payloadLoader
+        return stateSet
 
     def storeNodeStates(self, nodeArray, graph, storeBaseParams = True, storeSpecificParams = True):
+        deltaOnly = PCPrefs.instance().variationDeltaStorage
         size = nodeArray.getSize()
         for n in range(0, size):
             node = nodeArray.getItem(n)
             nodeState = PCNodeState(node, graph)
-            nodeState.storeState(node, storeBaseParams, storeSpecificParams)
-            self.nodeStates.append(nodeState)
+            nodeState.storeState(node, storeBaseParams, storeSpecificParams, deltaOnly = deltaOnly)
+            self.nodeStateList.append(nodeState)
 
-    def recallNodeStates(self):
+    def recallSteps(self, resolver = None):
+        # returns the list of (node state, node) to recall and the count of nodes which could not be found.
+        # resolver may be shared between multiple variations recalled together
+        if not resolver:
+            resolver = PCNodeResolver()
+        steps = []
         misses = 0
         for nodeState in self.nodeStates:
-            node = nodeState.retrieveNode()
+            node = resolver.resolve(nodeState.nodeIdentifier)
             if node:
-                nodeState.recallInto(node)
+                steps.append((nodeState, node))
             else:
                 misses += 1
+        return steps, misses
+
+    def match(self, resolver = None):
+        # returns how much this variation matches the live graph (PCVariationMatch), nodes which cannot be found matching none of their parameters
+        variationMatch = PCVariationMatch()
+        if not resolver:
+            resolver = PCNodeResolver()
+        for nodeState in self.nodeStates:
+            node = resolver.resolve(nodeState.nodeIdentifier)
+            if node:
+                variationMatch.add(*nodeState.matchNode(node))
+            else:
+                variationMatch.add(0, len(nodeState.effectiveParams()))
+                variationMatch.missingNodes += 1
+        return variationMatch
 
+    def recallNodeStates(self, skipUnchanged = False, stats = None, resolver = None):
+        steps, misses = self.recallSteps(resolver)
+        with PCUndoGroup("Variation Recall"):
+            for nodeState, node in steps:
+                nodeState.recallInto(node, skipUnchanged = skipUnchanged, stats = stats)
         return misses
 
 class PCStateMgr:
@@ -111,21 +342,90 @@ class PCStateMgr:
 
     def __init__(self):
         self.nodeStateSets = {} # key: state set name, value, PCNodeStateSet
+        if PCLibrary.isEnabled():
+            # only the library index is loaded, node states are loaded on first access
+            library = PCLibrary.instance()
+            for stateSetName, indexEntry in library.entries(PCLibrary.VARIATIONS).items():
+                loader = lambda name = stateSetName: library.readPayload(PCLibrary.VARIATIONS, name)
+                self.nodeStateSets[stateSetName] = PCNodeStateSet.fromIndex(stateSetName, indexEntry, loader)
+
+        self.variationIndex = None
+        if PCPrefs.instance().variationIndex and PCVariationIndex.isAvailable():
+            self.variationIndex = PCVariationIndex.open(PCLibrary.folder() if PCLibrary.isEnabled() else None)
+            if self.variationIndex:
+                self.variationIndex.sync(self.nodeStateSets)
+
+    def queryStateSets(self, query, offset = 0, limit = None):
+        # returns the state sets matching query (PCVariationQuery) within [offset, offset + limit[ and the total count of matching ones
+        result = None
+        if self.variationIndex:
+            if query.hasContentCriteria():
+                self.variationIndex.indexPending(self.nodeStateSets)
+            result = self.variationIndex.query(query, offset, limit)
+            if result == None:
+                pclog.log("Variation index query failed, variations are filtered in memory.")
+        if result:
+            names, total = result
+        else:
+            names = [stateSet.name for stateSet in self.nodeStateSets.values() if query.matches(stateSet)]
+            total = len(names)
+            names = names[offset:offset + limit] if limit else names[offset:]
+        return [self.nodeStateSets[name] for name in names if name in self.nodeStateSets], total
     
     def stateSetNameExists(self, stateSetName):
         return self.nodeStateSets.get(stateSetName) != None
 
     def addStateSet(self, stateSet):
+        defaultsTable = self.countedDefaultsTable()
+        defaultsTable.addRefs(stateSet.defaultsIds())
+        previousStateSet = self.nodeStateSets.get(stateSet.name)
+        if previousStateSet:
+            defaultsTable.releaseRefs(previousStateSet.defaultsIds())
+            if previousStateSet != stateSet:
+                previousStateSet.release()
         self.nodeStateSets[stateSet.name] = stateSet
+        if PCLibrary.isEnabled():
+            defaultsTable.persist(stateSet.defaultsIds())
+            PCLibrary.instance().saveEntry(PCLibrary.VARIATIONS, stateSet.name, stateSet.indexData(), stateSet.toData())
+        if self.variationIndex:
+            self.variationIndex.addStateSet(stateSet)
 
     def deleteStateSet(self, stateSetName):
         if self.nodeStateSets.get(stateSetName):
-            del self.nodeStateSets[stateSetName]
+            defaultsTable = self.countedDefaultsTable()
+            stateSet = self.nodeStateSets.pop(stateSetName)
+            defaultsIds = stateSet.defaultsIds()
+            stateSet.release()
+            defaultsTable.releaseRefs(defaultsIds)
+            if PCLibrary.isEnabled():
+                PCLibrary.instance().deleteEntry(PCLibrary.VARIATIONS, stateSetName)
+            if self.variationIndex:
+                self.variationIndex.deleteStateSet(stateSetName)
             return True
         else:
             return False
 
     def deleteAll(self):
+        for stateSet in self.nodeStateSets.values():
+            stateSet.release()
         self.nodeStateSets = {}
+        if PCLibrary.isEnabled():
+            PCLibrary.instance().deleteAll(PCLibrary.VARIATIONS)
+        PCDefaultsTable.instance().removeAll()
+        if self.variationIndex:
+            self.variationIndex.deleteAll()
+
+    def close(self):
+        if self.variationIndex:
+            self.variationIndex.close()
+            self.variationIndex = None
+
+    # --- Private
+    def countedDefaultsTable(self):
+        # defaults sets references are counted on first variation change, from the library index for variations not loaded
+        defaultsTable = PCDefaultsTable.instance()
+        if not defaultsTable.isCounted():
+            defaultsTable.countRefs(stateSet.defaultsIds() for stateSet in self.nodeStateSets.values())
+        return defaultsTable
 
 
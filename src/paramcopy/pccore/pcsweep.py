@@ -0,0 +1,185 @@
+# ---------------
+# ParamCopy - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+from sd.api.sdproperty import SDPropertyCategory
+from sd.api.apiexception import APIException
+
+from paramcopy.pccore.pchelper import PCHelper
+from paramcopy.pccore.pcparam import PCParam, PCWriteStats
+from paramcopy.pccore.pcvalue import PCValueCodec
+from paramcopy.pccore.pcundo import PCUndoGroup
+
+class PCSweepRange:
+    """
+    Evenly spaced values between two bounds (included), computed on access like Python's range
+    so that an axis never holds its values.
+    """
+    def __init__(self, tag, start, stop, count):
+        self.tag = tag
+        self.start = start # tuple of components
+        self.stop = stop
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.count
+        if index < 0 or index >= self.count:
+            raise IndexError("sweep range index out of range")
+        t = index / (self.count - 1) if self.count > 1 else 0.0
+        components = [a + (b - a) * t for a, b in zip(self.start, self.stop)]
+        return PCSweepAxis.encodedValue(self.tag, components)
+
+class PCSweepAxis:
+    """
+    Values taken by a parameter of the swept nodes. Values are given as text in the type of the parameter:
+    comma separated values ("0.5, 1, 2"), vector components being separated by spaces ("0.5 0.5, 1 1"),
+    or ranges ("0.5..2:4" for 4 values from 0.5 to 2, "1..8" for consecutive integers). Bools accept
+    true/false, enums their integer value.
+    """
+    SCALAR_TAGS = ("bool", "enum")
+
+    @classmethod
+    def isSweepable(cls, encodedValue):
+        return encodedValue != None and (encodedValue[0] in PCValueCodec.NUMERIC_WIDTHS or encodedValue[0] in PCSweepAxis.SCALAR_TAGS)
+
+    @classmethod
+    def parse(cls, propertyId, label, text, sampleValue):
+        # sampleValue: current encoded value of the parameter, giving its type. Raises ValueError on invalid text
+        tag = sampleValue[0]
+        values = []
+        for item in [item.strip() for item in text.split(",") if item.strip()]:
+            if ".." in item and tag in PCValueCodec.NUMERIC_WIDTHS:
+                bounds, _, count = item.partition(":")
+                start, _, stop = bounds.partition("..")
+                start = cls.components(tag, start)
+                stop = cls.components(tag, stop)
+                if count:
+                    count = int(count)
+                elif tag in PCValueCodec.INT_TAGS:
+                    count = int(max(abs(b - a) for a, b in zip(start, stop))) + 1
+                else:
+                    raise ValueError("value count missing in range: " + item)
+                if count < 1:
+                    raise ValueError("invalid value count in range: " + item)
+                values.append(PCSweepRange(tag, start, stop, count))
+            elif tag == "bool":
+                if not item.lower() in ("true", "false", "1", "0"):
+                    raise ValueError("invalid bool value: " + item)
+                values.append([("bool", item.lower() in ("true", "1"))])
+            elif tag == "enum":
+                values.append([("enum", (sampleValue[1][0], int(item)))])
+            else:
+                values.append([cls.encodedValue(tag, cls.components(tag, item))])
+        if len(values) == 0:
+            raise ValueError("no value")
+        return PCSweepAxis(propertyId, label, values)
+
+    @classmethod
+    def components(cls, tag, text):
+        width = PCValueCodec.NUMERIC_WIDTHS[tag]
+        components = [float(c) for c in text.split()]
+        if len(components) == 1:
+            components = components * width # a single component applies to all of them
+        if len(components) != width:
+            raise ValueError(str(width) + " component(s) expected: " + text)
+        return components
+
+    @classmethod
+    def encodedValue(cls, tag, components):
+        if tag in PCValueCodec.INT_TAGS:
+            components = [int(round(c)) for c in components]
+        return (tag, components[0] if len(components) == 1 else tuple(components))
+
+    def __init__(self, propertyId, label, values):
+        self.propertyId = propertyId
+        self.label = label
+        self.values = values # list of value sequences (lists of encoded values or PCSweepRange), chained
+        self.nodes = [] # swept nodes on which the parameter can be written
+
+    def __len__(self):
+        return sum(len(values) for values in self.values)
+
+    def __getitem__(self, index):
+        for values in self.values:
+            if index < len(values):
+                return values[index]
+            index -= len(values)
+        raise IndexError("sweep axis index out of range")
+
+class PCSweep:
+    """
+    Cartesian product of parameter axes over a node selection. Combinations are never materialized:
+    a combination index is decoded into one value index per axis (the last axis varying fastest, like
+    itertools.product), and moving from a combination to another only writes the parameters of the
+    axes whose value changed.
+    """
+    def __init__(self, nodes, axes):
+        self.nodes = nodes # list of SDNode
+        self.axes = axes # list of PCSweepAxis
+        self.position = -1 # index of the applied combination, -1 if none
+        self.appliedIndices = None # value index per axis of the applied combination
+        for axis in self.axes:
+            axis.nodes = [node for node in self.nodes if self.isWritable(node, axis.propertyId)]
+
+    def count(self):
+        count = 1
+        for axis in self.axes:
+            count *= len(axis)
+        return count
+
+    def indicesAt(self, position):
+        # value index per axis of the combination at the given position
+        indices = []
+        for axis in reversed(self.axes):
+            position, index = divmod(position, len(axis))
+            indices.append(index)
+        indices.reverse()
+        return indices
+
+    def valuesAt(self, position):
+        # list of (PCSweepAxis, encoded value) of the combination at the given position
+        return [(axis, axis[index]) for axis, index in zip(self.axes, self.indicesAt(position))]
+
+    def moveTo(self, position, skipUnchanged = False):
+        # applies the combination at the given position, returns the write statistics (PCWriteStats)
+        stats = PCWriteStats()
+        indices = self.indicesAt(position)
+        with PCUndoGroup("Parameter Sweep"):
+            for a, axis in enumerate(self.axes):
+                if self.appliedIndices and self.appliedIndices[a] == indices[a]:
+                    continue
+                param = PCParam.view(axis.propertyId, axis.label, -1, axis[indices[a]])
+                for node in axis.nodes:
+                    try:
+                        param.writeInto(node, skipUnchanged, stats)
+                    except APIException as e:
+                        PCHelper.logSDException(e)
+        self.position = position
+        self.appliedIndices = indices
+        return stats
+
+    def canMoveNext(self):
+        return self.position + 1 < self.count()
+
+    def moveNext(self, skipUnchanged = False):
+        return self.moveTo(self.position + 1, skipUnchanged)
+
+    def canMovePrevious(self):
+        return self.position > 0
+
+    def movePrevious(self, skipUnchanged = False):
+        return self.moveTo(self.position - 1, skipUnchanged)
+
+    # --- Private
+    def isWritable(self, node, propertyId):
+        try:
+            prop = node.getPropertyFromId(propertyId, SDPropertyCategory.Input)
+            return prop != None and not PCHelper.isInputParamFunctionDriven(node, prop) # make sure not to copy over a user function
+        except APIException as e:
+            PCHelper.logSDException(e)
+            return False
@@ -0,0 +1,144 @@
+# ---------------
+# ParamCopy - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+from sd.api.apiexception import APIException
+
+from paramcopy.pccore.pchelper import PCHelper
+from paramcopy.pccore.pcfingerprint import PCLiveFingerprints
+from paramcopy.pccore import pclog
+
+class PCUndoSnapshot:
+# Before-image of the parameters written by an operation, used when SD undo groups are not available
+    def __init__(self, name):
+        self.name = name
+        self.entries = {} # key: (id(node), property id), val: (node, property id, inheritance method, value)
+
+    def record(self, node, propertyId):
+        key = (id(node), propertyId) # node is referenced by the entry so its id cannot be reused meanwhile
+        if not key in self.entries:
+            try:
+                inheritanceMethod = PCHelper.getInheritanceMethod(node, propertyId)
+                value = node.getInputPropertyValueFromId(propertyId)
+                self.entries[key] = (node, propertyId, inheritanceMethod, value)
+            except APIException as e:
+                PCHelper.logSDException(e)
+
+    def isEmpty(self):
+        return len(self.entries) == 0
+
+    def restore(self):
+        for node, propertyId, inheritanceMethod, value in reversed(list(self.entries.values())):
+            try:
+                PCLiveFingerprints.instance().invalidate(node)
+                if inheritanceMethod != -1:
+                    node.setInputPropertyInheritanceMethodFromId(propertyId, inheritanceMethod)
+                if value:
+                    node.setInputPropertyValueFromId(propertyId, value)
+            except APIException as e:
+                PCHelper.logSDException(e)
+
+class PCUndoGroup:
+    """
+    Groups all the parameter writes of a ParamCopy operation into a single undo entry. SD undo groups
+    are used when available, otherwise a before-image of written parameters is recorded so the whole
+    operation can be reverted with PCUndoMgr.undoLast(). Nested groups are merged into the outermost one.
+    A group kept open across event loop returns (see PCJob) must discard user input meanwhile (see PCInputLock),
+    as user edits and other operations would otherwise be merged into it.
+    """
+    def __init__(self, name):
+        self.name = name
+        self.sdUndoGroup = None
+        self.snapshot = None
+        self.nested = False
+
+    def begin(self):
+        undoMgr = PCUndoMgr.instance()
+        if undoMgr.activeGroup:
+            self.nested = True
+            return
+
+        undoMgr.activeGroup = self
+        sdUndoGroupClass = PCUndoMgr.sdUndoGroupClass()
+        if sdUndoGroupClass:
+            self.sdUndoGroup = sdUndoGroupClass(PCUndoMgr.UNDO_PREFIX + self.name)
+            self.sdUndoGroup.__enter__()
+        else:
+            self.snapshot = PCUndoSnapshot(self.name)
+
+    def end(self):
+        if self.nested:
+            return
+
+        undoMgr = PCUndoMgr.instance()
+        if undoMgr.activeGroup == self:
+            undoMgr.activeGroup = None
+        if self.sdUndoGroup:
+            self.sdUndoGroup.__exit__(None, None, None)
+            self.sdUndoGroup = None
+        elif self.snapshot and not self.snapshot.isEmpty():
+            undoMgr.pushSnapshot(self.snapshot)
+        self.snapshot = None
+
+    def __enter__(self):
+        self.begin()
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.end()
+        return False
+
+class PCUndoMgr:
+    """
+    Keeps track of the active undo group and of the snapshots of past operations (snapshot fallback only)
+    """
+    inst = None
+    UNDO_PREFIX = "ParamCopy: "
+    MAX_SNAPSHOTS = 20
+
+    sdUndoGroupClassChecked = False
+    sdUndoGroupClassRef = None
+
+    @classmethod
+    def instance(cls):
+        if not cls.inst:
+            cls.inst = PCUndoMgr()
+        return cls.inst
+
+    @classmethod
+    def sdUndoGroupClass(cls):
+        # SDHistoryUtils.UndoGroup, or None if not supported by this SD version
+        if not cls.sdUndoGroupClassChecked:
+            cls.sdUndoGroupClassChecked = True
+            try:
+                from sd.api.sdhistoryutils import SDHistoryUtils
+                cls.sdUndoGroupClassRef = SDHistoryUtils.UndoGroup
+            except (ImportError, AttributeError):
+                pclog.log("SD undo groups not available, using internal undo snapshots.")
+        return cls.sdUndoGroupClassRef
+
+    def __init__(self):
+        self.activeGroup = None
+        self.snapshots = [] # most recent last
+
+    def recordBefore(self, node, propertyId):
+        # to be called before writing a node parameter
+        if self.activeGroup and self.activeGroup.snapshot:
+            self.activeGroup.snapshot.record(node, propertyId)
+
+    def pushSnapshot(self, snapshot):
+        self.snapshots.append(snapshot)
+        if len(self.snapshots) > PCUndoMgr.MAX_SNAPSHOTS:
+            del self.snapshots[0]
+
+    def canUndo(self):
+        return len(self.snapshots) > 0
+
+    def undoLast(self):
+        # returns the name of the undone operation, or None if there was nothing to undo
+        if not self.canUndo():
+            return None
+        snapshot = self.snapshots.pop()
+        snapshot.restore()
+        return snapshot.name
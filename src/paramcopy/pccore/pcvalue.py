@@ -0,0 +1,291 @@
+# ---------------
+# ParamCopy - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+from sd.api import sdbasetypes
+from sd.api.sdusage import SDUsage
+from sd.api.sdtypearray import SDTypeArray
+from sd.api.sdvaluearray import SDValueArray
+from sd.api.sdvaluebool import SDValueBool
+from sd.api.sdvaluebool2 import SDValueBool2
+from sd.api.sdvaluebool3 import SDValueBool3
+from sd.api.sdvaluebool4 import SDValueBool4
+from sd.api.sdvaluecolorrgb import SDValueColorRGB
+from sd.api.sdvaluecolorrgba import SDValueColorRGBA
+from sd.api.sdvaluedouble import SDValueDouble
+from sd.api.sdvaluedouble2 import SDValueDouble2
+from sd.api.sdvaluedouble3 import SDValueDouble3
+from sd.api.sdvaluedouble4 import SDValueDouble4
+from sd.api.sdvalueenum import SDValueEnum
+from sd.api.sdvaluefloat import SDValueFloat
+from sd.api.sdvaluefloat2 import SDValueFloat2
+from sd.api.sdvaluefloat3 import SDValueFloat3
+from sd.api.sdvaluefloat4 import SDValueFloat4
+from sd.api.sdvalueint import SDValueInt
+from sd.api.sdvalueint2 import SDValueInt2
+from sd.api.sdvalueint3 import SDValueInt3
+from sd.api.sdvalueint4 import SDValueInt4
+from sd.api.sdvaluematrix import SDValueMatrix
+from sd.api.sdvaluestring import SDValueString
+from sd.api.sdvaluestruct import SDValueStruct
+from sd.api.sdvalueusage import SDValueUsage
+
+class PCOpaqueValue:
+    """
+    Encoded form of SD values having no compact representation (matrices, textures...): the native
+    SD value is kept as is. Equality relies on the value content when it can be read (matrices),
+    on identity otherwise.
+    """
+    def __init__(self, sdValue, key = None):
+        self.sdValue = sdValue
+        self.key = key # comparable representation of the content, or None
+
+    def __eq__(self, other):
+        if not isinstance(other, PCOpaqueValue):
+            return False
+        if self.key != None:
+            return self.key == other.key
+        return self.sdValue is other.sdValue
+
+    def __hash__(self):
+        return hash(self.key) if self.key != None else id(self.sdValue)
+
+    def __repr__(self):
+        # stable for values with a content key, see PCFingerprint
+        return "opaque(" + (repr(self.key) if self.key != None else str(id(self.sdValue))) + ")"
+
+class PCValueCodec:
+    """
+    Converts SD values into compact, immutable and hashable Python representations and back.
+    An encoded value is a (tag, payload) tuple where payload is made of Python scalars and tuples
+    (arrays and structs hold nested encoded values), except for the "opaque" tag whose payload is
+    a PCOpaqueValue. SD values are rebuilt on demand with decode(). Conversions are driven by
+    type-dispatch tables rather than isinstance chains.
+    """
+    OPAQUE = "opaque"
+    NUMERIC_WIDTHS = { "int": 1, "int2": 2, "int3": 3, "int4": 4, "float": 1, "float2": 2, "float3": 3, "float4": 4,
+                       "double": 1, "double2": 2, "double3": 3, "double4": 4, "rgb": 3, "rgba": 4 } # key: numeric tag, val: component count
+    INT_TAGS = ("int", "int2", "int3", "int4")
+
+    encoders = None # key: SDValue class, val: (tag, function returning the payload from the SD value)
+    decoders = None # key: tag, val: function returning the SD value from the payload
+    sdTypes = {} # key: type id, val: SDType of encoded arrays and structs, required to rebuild them
+
+    @classmethod
+    def encode(cls, sdValue):
+        if sdValue == None:
+            return None
+        encoder = cls.getEncoders().get(type(sdValue))
+        if encoder:
+            tag, payloadFct = encoder
+            return (tag, payloadFct(sdValue))
+        return (PCValueCodec.OPAQUE, PCOpaqueValue(sdValue))
+
+    @classmethod
+    def decode(cls, encodedValue):
+        if encodedValue == None:
+            return None
+        tag, payload = encodedValue
+        if tag == PCValueCodec.OPAQUE:
+            return payload.sdValue
+        return cls.getDecoders()[tag](payload)
+
+    @classmethod
+    def canDecode(cls, encodedValue):
+        # arrays and structs can only be rebuilt if their SD type was met during this session
+        if encodedValue == None:
+            return False
+        tag, payload = encodedValue
+        if tag == "array" or tag == "struct":
+            return payload[0] in cls.sdTypes and all(cls.canDecode(item) for item in cls.nestedValues(encodedValue))
+        return True
+
+    @classmethod
+    def isComparable(cls, encodedValue):
+        # whether equality of the encoded value reflects equality of the value content
+        if encodedValue == None:
+            return False
+        if encodedValue[0] == PCValueCodec.OPAQUE:
+            return encodedValue[1].key != None
+        return all(cls.isComparable(item) for item in cls.nestedValues(encodedValue))
+
+    @classmethod
+    def isSerializable(cls, encodedValue):
+        # whether the encoded value is only made of Python scalars and tuples
+        if encodedValue == None or encodedValue[0] == PCValueCodec.OPAQUE:
+            return False
+        return all(cls.isSerializable(item) for item in cls.nestedValues(encodedValue))
+
+    @classmethod
+    def fromJson(cls, data):
+        # serializable encoded values are stored as JSON arrays, turn them back into tuples
+        if isinstance(data, list):
+            return tuple(cls.fromJson(item) for item in data)
+        return data
+
+    @classmethod
+    def nestedValues(cls, encodedValue):
+        tag, payload = encodedValue
+        if tag == "array":
+            return payload[1]
+        if tag == "struct":
+            return [item for _, item in payload[1]]
+        return []
+
+    # --- Private
+    @classmethod
+    def getEncoders(cls):
+        if cls.encoders == None:
+            scalar = lambda v: v.get()
+            vec2 = lambda v: cls.vec2Payload(v.get())
+            vec3 = lambda v: cls.vec3Payload(v.get())
+            vec4 = lambda v: cls.vec4Payload(v.get())
+            cls.encoders = {
+                SDValueArray: ("array", cls.arrayPayload),
+                SDValueBool: ("bool", scalar),
+                SDValueBool2: ("bool2", vec2),
+                SDValueBool3: ("bool3", vec3),
+                SDValueBool4: ("bool4", vec4),
+                SDValueColorRGB: ("rgb", lambda v: cls.rgbPayload(v.get())),
+                SDValueColorRGBA: ("rgba", lambda v: cls.rgbaPayload(v.get())),
+                SDValueDouble: ("double", scalar),
+                SDValueDouble2: ("double2", vec2),
+                SDValueDouble3: ("double3", vec3),
+                SDValueDouble4: ("double4", vec4),
+                SDValueEnum: ("enum", lambda v: (v.getType().getId(), v.get())),
+                SDValueFloat: ("float", scalar),
+                SDValueFloat2: ("float2", vec2),
+                SDValueFloat3: ("float3", vec3),
+                SDValueFloat4: ("float4", vec4),
+                SDValueInt: ("int", scalar),
+                SDValueInt2: ("int2", vec2),
+                SDValueInt3: ("int3", vec3),
+                SDValueInt4: ("int4", vec4),
+                SDValueMatrix: (PCValueCodec.OPAQUE, lambda v: PCOpaqueValue(v, cls.matrixKey(v))),
+                SDValueString: ("string", scalar),
+                SDValueStruct: ("struct", cls.structPayload),
+                SDValueUsage: ("usage", lambda v: cls.usagePayload(v.get()))
+            }
+        return cls.encoders
+
+    @classmethod
+    def getDecoders(cls):
+        if cls.decoders == None:
+            cls.decoders = {
+                "array": cls.arrayFromPayload,
+                "bool": lambda p: SDValueBool.sNew(p),
+                "bool2": lambda p: SDValueBool2.sNew(sdbasetypes.bool2(*p)),
+                "bool3": lambda p: SDValueBool3.sNew(sdbasetypes.bool3(*p)),
+                "bool4": lambda p: SDValueBool4.sNew(sdbasetypes.bool4(*p)),
+                "rgb": lambda p: SDValueColorRGB.sNew(sdbasetypes.ColorRGB(*p)),
+                "rgba": lambda p: SDValueColorRGBA.sNew(sdbasetypes.ColorRGBA(*p)),
+                "double": lambda p: SDValueDouble.sNew(p),
+                "double2": lambda p: SDValueDouble2.sNew(sdbasetypes.double2(*p)),
+                "double3": lambda p: SDValueDouble3.sNew(sdbasetypes.double3(*p)),
+                "double4": lambda p: SDValueDouble4.sNew(sdbasetypes.double4(*p)),
+                "enum": lambda p: SDValueEnum.sFromValue(p[0], p[1]),
+                "float": lambda p: SDValueFloat.sNew(p),
+                "float2": lambda p: SDValueFloat2.sNew(sdbasetypes.float2(*p)),
+                "float3": lambda p: SDValueFloat3.sNew(sdbasetypes.float3(*p)),
+                "float4": lambda p: SDValueFloat4.sNew(sdbasetypes.float4(*p)),
+                "int": lambda p: SDValueInt.sNew(p),
+                "int2": lambda p: SDValueInt2.sNew(sdbasetypes.int2(*p)),
+                "int3": lambda p: SDValueInt3.sNew(sdbasetypes.int3(*p)),
+                "int4": lambda p: SDValueInt4.sNew(sdbasetypes.int4(*p)),
+                "string": lambda p: SDValueString.sNew(p),
+                "struct": cls.structFromPayload,
+                "usage": lambda p: SDValueUsage.sNew(SDUsage.sNew(*p))
+            }
+        return cls.decoders
+
+    @classmethod
+    def vec2Payload(cls, v):
+        return (v.x, v.y)
+
+    @classmethod
+    def vec3Payload(cls, v):
+        return (v.x, v.y, v.z)
+
+    @classmethod
+    def vec4Payload(cls, v):
+        return (v.x, v.y, v.z, v.w)
+
+    @classmethod
+    def rgbPayload(cls, c):
+        return (c.r, c.g, c.b)
+
+    @classmethod
+    def rgbaPayload(cls, c):
+        return (c.r, c.g, c.b, c.a)
+
+    @classmethod
+    def usagePayload(cls, usage):
+        return (usage.getName(), usage.getComponents(), usage.getColorSpace())
+
+    @classmethod
+    def registerType(cls, sdType):
+        typeId = sdType.getId()
+        if not typeId in cls.sdTypes:
+            cls.sdTypes[typeId] = sdType
+            if isinstance(sdType, SDTypeArray):
+                cls.registerType(sdType.getItemType()) # items may be structs
+        return typeId
+
+    @classmethod
+    def arrayPayload(cls, sdValue):
+        typeId = cls.registerType(sdValue.getType())
+        items = tuple(cls.encode(sdValue.getItem(i)) for i in range(0, sdValue.getSize()))
+        return (typeId, items)
+
+    @classmethod
+    def arrayFromPayload(cls, payload):
+        typeId, items = payload
+        sdValue = SDValueArray.sNew(cls.sdTypes[typeId].getItemType(), 0)
+        for item in items:
+            sdValue.pushBack(cls.decode(item))
+        return sdValue
+
+    @classmethod
+    def structPayload(cls, sdValue):
+        sdType = sdValue.getType()
+        typeId = cls.registerType(sdType)
+        members = sdType.getMembers()
+        items = []
+        for i in range(0, members.getSize()):
+            member = members.getItem(i)
+            items.append((member.getId(), cls.encode(sdValue.getPropertyValue(member))))
+        return (typeId, tuple(items))
+
+    @classmethod
+    def structFromPayload(cls, payload):
+        typeId, items = payload
+        sdValue = SDValueStruct.sNew(cls.sdTypes[typeId])
+        for memberId, item in items:
+            if item != None:
+                sdValue.setPropertyValueFromId(memberId, cls.decode(item))
+        return sdValue
+
+    @classmethod
+    def matrixKey(cls, sdValue):
+        rows = sdValue.getRowCount()
+        cols = sdValue.getColumnCount()
+        items = tuple(cls.encode(sdValue.getItem(col, row)) for row in range(0, rows) for col in range(0, cols))
+        comparable = all(cls.isComparable(item) for item in items)
+        return (rows, cols, items) if comparable else None
+
+class PCValueCompare:
+    """
+    Typed equality of SD values, performed on their encoded form as SD value objects
+    do not implement value equality themselves.
+    """
+    @classmethod
+    def valuesEqual(cls, sdValue1, sdValue2):
+        if sdValue1 is None or sdValue2 is None:
+            return sdValue1 is sdValue2
+        return cls.encodedEqual(PCValueCodec.encode(sdValue1), PCValueCodec.encode(sdValue2))
+
+    @classmethod
+    def encodedEqual(cls, encodedValue1, encodedValue2):
+        # values whose content cannot be compared are considered as different so they get written
+        return PCValueCodec.isComparable(encodedValue1) and encodedValue1 == encodedValue2
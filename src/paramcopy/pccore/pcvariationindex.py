@@ -0,0 +1,221 @@
+# ---------------
+# ParamCopy - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+import os
+
+try:
+    import sqlite3
+except ImportError:
+    sqlite3 = None # not shipped with every Python distribution, variations are then filtered in memory
+
+from paramcopy.pccore import pclog
+
+class PCVariationQuery:
+# Variation filter, empty criteria are ignored
+    def __init__(self):
+        self.packageId = None
+        self.graphId = None
+        self.nameFilter = None # part of the variation name, case insensitive
+        self.nodeIds = None # variations containing at least one of these nodes
+        self.defId = None # variations containing a node of this definition
+        self.propertyId = None # variations setting this parameter
+
+    def hasContentCriteria(self):
+        # whether the query needs the nodes and parameters of variations
+        return bool(self.nodeIds or self.defId or self.propertyId)
+
+    def matches(self, stateSet):
+        # in-memory evaluation, used when the SQLite index is not available
+        if self.packageId != None and stateSet.packageId != self.packageId:
+            return False
+        if self.graphId != None and stateSet.graphId != self.graphId:
+            return False
+        if self.nameFilter and not self.nameFilter.lower() in stateSet.name.lower():
+            return False
+        if self.nodeIds and not any(nodeState.nodeIdentifier.nodeId in self.nodeIds for nodeState in stateSet.nodeStates):
+            return False
+        if self.defId and not any(nodeState.nodeIdentifier.defId == self.defId for nodeState in stateSet.nodeStates):
+            return False
+        if self.propertyId and not any(self.propertyId in nodeState.effectiveParams() for nodeState in stateSet.nodeStates):
+            return False
+        return True
+
+class PCVariationIndex:
+    """
+    SQLite index of the stored variations (context, nodes and parameters) used to filter large
+    variation libraries without loading them. The index only holds data derived from the variations:
+    it is stored next to the library and resynchronized with it when opened. Variations missing from the
+    index are first added from their library index entry only, their nodes and parameters being indexed
+    once their payload is loaded or when a query filters on them (see indexPending()).
+    """
+    FILENAME = "variations.sqlite"
+    SCHEMA_VERSION = 2
+
+    @classmethod
+    def isAvailable(cls):
+        return sqlite3 != None
+
+    @classmethod
+    def open(cls, folder = None):
+        # index stored in folder, or in memory if folder is None. Returns None if the index cannot be opened
+        try:
+            if folder:
+                os.makedirs(folder, exist_ok = True)
+                return PCVariationIndex(os.path.join(folder, PCVariationIndex.FILENAME))
+            return PCVariationIndex(":memory:")
+        except (sqlite3.Error, OSError) as e:
+            pclog.log("Variation index not available: " + str(e))
+            return None
+
+    def __init__(self, path):
+        self.connection = sqlite3.connect(path)
+        self.createSchema()
+
+    # --- Public
+    def sync(self, nodeStateSets):
+        # nodeStateSets: dict (key: name, val: PCNodeStateSet) being the reference content
+        indexedNames = self.names()
+        for name, stateSet in nodeStateSets.items():
+            if not name in indexedNames:
+                if stateSet.isLoaded():
+                    self.addStateSet(stateSet)
+                else:
+                    self.addStateSetEntry(stateSet) # variation content is not loaded at startup
+        for name in indexedNames - nodeStateSets.keys():
+            self.deleteStateSet(name)
+
+    def indexPending(self, nodeStateSets):
+        # indexes the nodes and parameters of the variations only indexed from their library entry, loading them
+        try:
+            pendingNames = [row[0] for row in self.connection.execute("SELECT name FROM variations WHERE contentIndexed = 0")]
+        except sqlite3.Error as e:
+            self.logError(e)
+            return
+        if pendingNames:
+            pclog.log("Indexing the content of " + str(len(pendingNames)) + " variation(s)")
+        for name in pendingNames:
+            stateSet = nodeStateSets.get(name)
+            if stateSet:
+                self.addStateSet(stateSet)
+
+    def names(self):
+        try:
+            return set(row[0] for row in self.connection.execute("SELECT name FROM variations"))
+        except sqlite3.Error as e:
+            self.logError(e)
+            return set()
+
+    def addStateSet(self, stateSet):
+        try:
+            with self.connection: # single transaction
+                self.deleteRows(stateSet.name)
+                self.insertVariationRow(stateSet, 1)
+                nodeRows = []
+                paramRows = []
+                for nodeState in stateSet.nodeStates:
+                    nodeId = nodeState.nodeIdentifier.nodeId
+                    nodeRows.append((stateSet.name, nodeId, nodeState.nodeIdentifier.defId))
+                    paramRows.extend((stateSet.name, nodeId, propertyId) for propertyId in nodeState.effectiveParams().keys())
+                self.connection.executemany("INSERT INTO nodes VALUES (?, ?, ?)", nodeRows)
+                self.connection.executemany("INSERT INTO params VALUES (?, ?, ?)", paramRows)
+        except sqlite3.Error as e:
+            self.logError(e)
+
+    def addStateSetEntry(self, stateSet):
+        # indexes the variation context only, see indexPending()
+        try:
+            with self.connection:
+                self.deleteRows(stateSet.name)
+                self.insertVariationRow(stateSet, 0)
+        except sqlite3.Error as e:
+            self.logError(e)
+
+    def deleteStateSet(self, name):
+        try:
+            with self.connection:
+                self.deleteRows(name)
+        except sqlite3.Error as e:
+            self.logError(e)
+
+    def deleteAll(self):
+        try:
+            with self.connection:
+                for table in ("variations", "nodes", "params"):
+                    self.connection.execute("DELETE FROM " + table)
+        except sqlite3.Error as e:
+            self.logError(e)
+
+    def query(self, query, offset = 0, limit = None):
+        # returns (names of matching variations within [offset, offset + limit[, total count of matching variations),
+        # or None if the query failed
+        conditions = []
+        args = []
+        if query.packageId != None:
+            conditions.append("packageId = ?")
+            args.append(query.packageId)
+        if query.graphId != None:
+            conditions.append("graphId = ?")
+            args.append(query.graphId)
+        if query.nameFilter:
+            conditions.append("name LIKE ? ESCAPE '\\'")
+            escaped = query.nameFilter.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            args.append("%" + escaped + "%")
+        if query.nodeIds:
+            # node ids are passed through a temporary table, their count being unbounded
+            conditions.append("name IN (SELECT variation FROM nodes WHERE nodeId IN (SELECT nodeId FROM temp.query_nodes))")
+        if query.defId:
+            conditions.append("name IN (SELECT variation FROM nodes WHERE defId = ?)")
+            args.append(query.defId)
+        if query.propertyId:
+            conditions.append("name IN (SELECT variation FROM params WHERE propertyId = ?)")
+            args.append(query.propertyId)
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+
+        try:
+            if query.nodeIds:
+                self.connection.execute("DELETE FROM temp.query_nodes")
+                self.connection.executemany("INSERT OR IGNORE INTO temp.query_nodes VALUES (?)", ((nodeId,) for nodeId in query.nodeIds))
+            total = self.connection.execute("SELECT COUNT(*) FROM variations" + where, args).fetchone()[0]
+            rows = self.connection.execute("SELECT name FROM variations" + where + " ORDER BY rowid LIMIT ? OFFSET ?", \
+                args + [limit if limit else -1, offset])
+            return [row[0] for row in rows], total
+        except sqlite3.Error as e:
+            self.logError(e)
+            return None
+
+    def close(self):
+        self.connection.close()
+
+    # --- Private
+    def createSchema(self):
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        with self.connection:
+            if version != PCVariationIndex.SCHEMA_VERSION:
+                # derived data only, simply rebuilt
+                for table in ("variations", "nodes", "params"):
+                    self.connection.execute("DROP TABLE IF EXISTS " + table)
+                self.connection.execute("PRAGMA user_version = " + str(PCVariationIndex.SCHEMA_VERSION))
+            self.connection.execute("CREATE TABLE IF NOT EXISTS variations (name TEXT PRIMARY KEY, packageId TEXT, packageName TEXT, graphId TEXT, graphName TEXT, nodeCount INTEGER, paramCount INTEGER, contentIndexed INTEGER)")
+            self.connection.execute("CREATE TABLE IF NOT EXISTS nodes (variation TEXT, nodeId TEXT, defId TEXT)")
+            self.connection.execute("CREATE TABLE IF NOT EXISTS params (variation TEXT, nodeId TEXT, propertyId TEXT)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS variations_context ON variations (packageId, graphId)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS nodes_variation ON nodes (variation)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS nodes_node ON nodes (nodeId)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS nodes_def ON nodes (defId)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS params_variation ON params (variation)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS params_property ON params (propertyId)")
+            self.connection.execute("CREATE TEMP TABLE IF NOT EXISTS query_nodes (nodeId TEXT PRIMARY KEY)")
+
+    def insertVariationRow(self, stateSet, contentIndexed):
+        self.connection.execute("INSERT INTO variations VALUES (?, ?, ?, ?, ?, ?, ?, ?)", \
+            (stateSet.name, stateSet.packageId, stateSet.packageName, stateSet.graphId, stateSet.graphName, stateSet.nodeCount(), stateSet.paramCount(), contentIndexed))
+
+    def deleteRows(self, name):
+        self.connection.execute("DELETE FROM variations WHERE name = ?", (name,))
+        self.connection.execute("DELETE FROM nodes WHERE variation = ?", (name,))
+        self.connection.execute("DELETE FROM params WHERE variation = ?", (name,))
+
+    def logError(self, e):
+        pclog.log("Variation index error: " + str(e))
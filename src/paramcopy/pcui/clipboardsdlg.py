@@ -19,6 +19,9 @@ from paramcopy.pccore.pcstatemgr import PCStateMgr, PCNodeStateSet
 from paramcopy.pccore.pchelper import PCHelper
 from paramcopy.pccore.pcprefs import PCPrefs
 from paramcopy.pccore.pccopier import PCCopier
+from paramcopy.pccore.pcparam import PCWriteStats
+from paramcopy.pccore.pccomputesched import PCComputeScheduler
+from paramcopy.pccore.pcjob import PCJob
 
 class PCClipboardsTreeWidget(QtWidgets.QTreeWidget):
     def __init__(self, parent=None):
@@ -38,15 +41,17 @@ class PCClipboardsTreeWidget(QtWidgets.QTreeWidget):
         treeItem.setText(0, clipboardName)
 
         # Parameter count
-        treeItem.setText(1, str(len(clipboard.state.params)))
+        treeItem.setText(1, str(clipboard.paramCount()))
 
         # Parameter list
-        treeItem.setText(2, clipboard.state.paramNames())
+        treeItem.setText(2, clipboard.paramNames())
 
 class PCClipboardsDlg(QtWidgets.QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.treeWidget = PCClipboardsTreeWidget(self)
+        self.job = None
+        self.stats = None
         self.setupStaticFields()
 
     def setupStaticFields(self):
@@ -84,6 +89,8 @@ class PCClipboardsDlg(QtWidgets.QDialog):
         self.bb_close.setOrientation(QtCore.Qt.Horizontal)
         self.bb_close.setStandardButtons(QtWidgets.QDialogButtonBox.Close)
         self.bb_close.setObjectName("bb_close")
+        self.b_abort = self.bb_close.addButton("Abort", QtWidgets.QDialogButtonBox.ActionRole)
+        self.b_abort.setVisible(False)
         self.verticalLayout.addWidget(self.bb_close)
 
         self.l_status.setText(QtWidgets.QApplication.translate("PCClipboardDlg", "<status>", None, -1))
@@ -105,6 +112,7 @@ class PCClipboardsDlg(QtWidgets.QDialog):
         self.b_paste.clicked.connect(self.onPaste)
         self.b_del.clicked.connect(self.onDelete)
         self.b_del_all.clicked.connect(self.onDeleteAll)
+        self.b_abort.clicked.connect(self.onAbort)
         self.bb_close.rejected.connect(self.onClose)
 
     def setupDynamicFields(self):
@@ -157,13 +165,40 @@ class PCClipboardsDlg(QtWidgets.QDialog):
         pasteOptions.crossTypeSpecificParamsCopy = False
         from paramcopy.pcui.pcuimgr import PCUIMgr
         nodes = PCUIMgr.instance().sdUiMgr.getCurrentGraphSelectedNodes()
-        PCCopier.instance().pasteNodeStateInto(clipboard, nodes, pasteOptions)
-        self.setStatus("Clipboard \"" + clipboardName + "\" has been pasted into current node selection.")
-        QTimer.singleShot(1, lambda:self.computeGraphIfNeeded())
+        plan = PCCopier.instance().compilePastePlan(clipboard, nodes, pasteOptions)
+        if clipboard.loadFailed:
+            self.setStatus("Clipboard \"" + clipboardName + "\" could not be loaded from the library, nothing has been pasted.")
+            return
+        self.stats = PCWriteStats()
+        skipUnchanged = PCPrefs.instance().skipUnchangedWrites
+        self.job = PCJob("Pasting", plan.nodeWrites(), lambda nodeWrite: plan.writeNode(nodeWrite[0], nodeWrite[1], skipUnchanged, self.stats), undoName = "Clipboard Paste", inputOwner = self)
+        self.enableJobUI(True)
+        self.job.start(self.setStatus, lambda job: self.onPasteFinished(job, clipboardName))
+
+    def onPasteFinished(self, job, clipboardName):
+        self.enableJobUI(False)
+        if job.isFailed() or job.isCancelled():
+            job.logDoneSteps(lambda nodeWrite: nodeWrite[0].getIdentifier())
+            self.setStatus(job.interruptedText())
+        else:
+            self.setStatus("Clipboard \"" + clipboardName + "\" has been pasted into current node selection (" + self.stats.summary() + ").")
+
+        if job.doneCount > 0:
+            QTimer.singleShot(1, lambda:self.computeGraphIfNeeded())
+
+    def enableJobUI(self, jobRunning):
+        self.b_paste.setEnabled(not jobRunning)
+        self.b_del.setEnabled(not jobRunning) # the pasted clipboard must not be deleted meanwhile
+        self.b_del_all.setEnabled(not jobRunning)
+        self.b_abort.setVisible(jobRunning)
+
+    def onAbort(self):
+        if self.job and self.job.isRunning():
+            self.job.cancel()
 
     def computeGraphIfNeeded(self):
         if PCPrefs.instance().computeGraphAfterVariationRecall:
-            PCHelper.computeCurrentGraph()
+            PCComputeScheduler.instance().requestCurrentGraphCompute()
 
     def getSingleSelectedItem(self):
         iter = QTreeWidgetItemIterator(self.treeWidget)
@@ -227,4 +262,12 @@ class PCClipboardsDlg(QtWidgets.QDialog):
             self.clearStatus()
 
     def onClose(self):
-        self.close()
+        if self.job and self.job.isRunning():
+            self.job.cancel()
+        else:
+            self.close()
+
+    def closeEvent(self, event):
+        if self.job and self.job.isRunning():
+            self.job.cancel()
+        super().closeEvent(event)
@@ -43,6 +43,7 @@ class PCCopyDlg(PCParamDlgBase):
         if not name or len(name) == 0:
             name = definition.getId()
         self.l_node_desc.setText("Node: " + name)
+        self.le_filter.clear()
         self.treeWidget.populateFromNode(node, PCPrefs.instance().copyDlgSelectAll)
         self.le_clipboard_name.setText("")
         return super().show()
@@ -58,6 +59,7 @@ class PCCopyDlg(PCParamDlgBase):
 
         propertyIds =  self.treeWidget.retrieveCheckedProperties()            
         if propertyIds and len(propertyIds) > 0:
+            self.treeWidget.rememberSelection()
             copier.setClipboard(self.node, propertyIds, clipboardName)
             if clipboardName:
                 from paramcopy.pcui.pcuimgr import PCUIMgr
@@ -138,8 +138,14 @@ class PCParamDlgBase(QtWidgets.QDialog):
         self.bb_ok_cancel.accepted.connect(self.onOK)
 
     def setupDynamicFields(self):
+        self.le_filter = QtWidgets.QLineEdit(self)
+        self.le_filter.setObjectName("le_filter")
+        self.le_filter.setPlaceholderText(QtWidgets.QApplication.translate(self.objectName(), "Search parameters by name or ID", None, -1))
+        self.le_filter.setClearButtonEnabled(True)
+        self.le_filter.textChanged.connect(self.onFilterTextChanged)
+        self.verticalLayout.insertWidget(2, self.le_filter)
         self.treeWidget = PCParamTreeWidget(self)
-        self.verticalLayout.insertWidget(2, self.treeWidget)
+        self.verticalLayout.insertWidget(3, self.treeWidget)
         self.clearStatus()
 
     def setStatus(self, text):
@@ -165,6 +171,9 @@ class PCParamDlgBase(QtWidgets.QDialog):
             show = state == Qt.Checked.value
         self.treeWidget.showIdCol(show)
 
+    def onFilterTextChanged(self, text):
+        self.treeWidget.setFilterText(text)
+
     def onSelectAll(self):
         self.treeWidget.selectAll()
 
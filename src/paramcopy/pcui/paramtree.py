@@ -6,333 +6,479 @@
 import sd
 if sd.getContext().getSDApplication().getVersion() < "14.0.0":
     from PySide2 import QtCore, QtWidgets
-    from PySide2.QtCore import Qt
-    from PySide2.QtWidgets import QTreeWidget, QTreeWidgetItemIterator
+    from PySide2.QtCore import Qt, QModelIndex
 else:
     from PySide6 import QtCore, QtWidgets
-    from PySide6.QtCore import Qt
-    from PySide6.QtWidgets import QTreeWidget, QTreeWidgetItemIterator
-    
-from sd.api.sdnode import SDNode
-from sd.api.sdproperty import SDProperty, SDPropertyCategory, SDPropertyInheritanceMethod
-from sd.api.apiexception import APIException
+    from PySide6.QtCore import Qt, QModelIndex
 
 from paramcopy.pccore import pclog
-from paramcopy.pccore.pcdata import PCData
 from paramcopy.pccore.pchelper import PCHelper
-from paramcopy.pccore.pcstatemgr import PCNodeState
-
-class PCParamTreeWidget(QtWidgets.QTreeWidget):
-    class PCItemData:
-    # set into tree item data Qt.UserRole at column 0
-
-        # Entry types
-        ET_PARAM_TYPE = 0   # Base Parameter or Specific Parameter (container)
-        ET_PARAM_GROUP = 1  # parameter group name (container)
-        ET_PARAM = 2        # parameter name (leaf)
-        ET_PARAM_FCT = 3    # parameter driven by function (leaf)
-
-        # Param types
-        PT_BASE = 0         # Base Parameter
-        PT_SPECIFIC = 1     # Specific Parameter
-
-        def __init__(self, entryType = -1, paramType = -1, propertyId = None):
-            self.entryType = entryType
-            self.paramType = paramType
-            self.propertyId = propertyId 
-        
-        def isBaseParam(self):
-            return self.paramType == PCParamTreeWidget.PCItemData.PT_BASE
+from paramcopy.pccore.pcparammeta import PCParamMetaCache
+
+class PCParamTreeItem:
+    """
+    Entry of the parameter tree model. Containers (parameter types and groups) hold the parameter
+    entries below them as pending tuples until the view fetches them (see PCParamTreeModel.fetchMore()),
+    their items being created at that time. Containers count their checked and unchecked children so that
+    their own check state follows from a change of one child without looking at the others.
+    """
+    __slots__ = ("parent", "row", "children", "pending", "entryType", "paramType", "name", "propertyId", "inheritanceMethod", "checkState",
+                 "checkableCount", "checkedCount", "uncheckedCount")
+
+    # Entry types
+    ET_PARAM_TYPE = 0   # Base Parameter or Specific Parameter (container)
+    ET_PARAM_GROUP = 1  # parameter group name (container)
+    ET_PARAM = 2        # parameter name (leaf)
+    ET_PARAM_FCT = 3    # parameter driven by function (leaf)
+
+    # Param types
+    PT_BASE = 0         # Base Parameter
+    PT_SPECIFIC = 1     # Specific Parameter
+
+    INHERITANCE_UNKNOWN = -2 # inheritance method not read yet from the node
+
+    def __init__(self, parent, entryType, paramType, name, propertyId = None, inheritanceMethod = -1, checkState = Qt.Unchecked):
+        self.parent = parent
+        self.row = len(parent.children) if parent else 0
+        self.children = []
+        self.pending = [] if entryType <= PCParamTreeItem.ET_PARAM_GROUP else None # list of (group path, name, property id, is function, inheritance method)
+        self.entryType = entryType
+        self.paramType = paramType
+        self.name = name
+        self.propertyId = propertyId
+        self.inheritanceMethod = inheritanceMethod
+        self.checkState = checkState if entryType != PCParamTreeItem.ET_PARAM_FCT else None
+        self.checkableCount = 0 # children having a check state (not driven by a function)
+        self.checkedCount = 0
+        self.uncheckedCount = 0
+
+    def isContainer(self):
+        return self.entryType <= PCParamTreeItem.ET_PARAM_GROUP
+
+    def isBaseParam(self):
+        return self.paramType == PCParamTreeItem.PT_BASE
+
+    def isFetched(self):
+        return self.pending == None
+
+class PCParamTreeModel(QtCore.QAbstractItemModel):
+    """
+    Parameter tree over a flat list of parameter entries. The children of a container are only created
+    when the view first needs them (canFetchMore()/fetchMore()), inheritance methods are read from the node
+    when first displayed, and check states live in the tree items. The ids of the checked parameters are
+    maintained along with check state changes, so that toggling a parameter costs the tree depth, toggling
+    a group its size, and retrieving the checked parameters is immediate.
+    """
+    NAME_COLUMN = 0
+    INHERITANCE_COLUMN = 1
+    ID_COLUMN = 2
+    HEADER_LABELS = ("Parameter Name", "Inheritance Method  ", "Parameter ID")
+    ITEM_FLAGS = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+    CHECKABLE_FLAGS = ITEM_FLAGS | Qt.ItemIsUserCheckable
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setHeaderLabels(("Parameter Name", "Inheritance Method  ", "Parameter ID"))
+        self.node = None # node inheritance methods are read from, if any
+        self.fullyFetched = True
+        self.root = PCParamTreeItem(None, PCParamTreeItem.ET_PARAM_TYPE, -1, "")
+        self.root.pending = None
+        self.checkedIds = set()
+
+    # --- Public
+    @classmethod
+    def groupPath(cls, groupName):
+        # first and second level group names
+        return tuple(groupName.split("/", 1)) if groupName else ()
+
+    def populate(self, entries, checkedIds, node = None):
+        # entries: list of (group path, name, property id, is function, inheritance method)
+        # checkedIds: ids of the parameters to check
+        self.beginResetModel()
+        self.node = node
+        self.fullyFetched = len(entries) == 0
+        self.root = PCParamTreeItem(None, PCParamTreeItem.ET_PARAM_TYPE, -1, "")
+        self.root.pending = None
+        self.checkedIds = set(entry[2] for entry in entries if not entry[3] and entry[2] in checkedIds)
+        typeItems = {} # key: param type, val: PCParamTreeItem
+        for entry in entries:
+            paramType = PCParamTreeItem.PT_BASE if PCHelper.isBaseParameter(entry[2]) else PCParamTreeItem.PT_SPECIFIC
+            typeItem = typeItems.get(paramType)
+            if not typeItem:
+                typeItem = PCParamTreeItem(self.root, PCParamTreeItem.ET_PARAM_TYPE, paramType, "Base Parameters" if paramType == PCParamTreeItem.PT_BASE else "Specific Parameters")
+                self.root.children.append(typeItem)
+                typeItems[paramType] = typeItem
+            typeItem.pending.append(entry)
+        for typeItem in self.root.children:
+            typeItem.checkState = self.pendingCheckState(typeItem.pending)
+        self.endResetModel()
+
+    def fetchAll(self):
+        # creates all the items, e.g. before filtering
+        if self.fullyFetched:
+            return
+        self.beginResetModel()
+        items = list(self.root.children)
+        while items:
+            item = items.pop()
+            if item.pending:
+                item.children = self.createChildren(item)
+                item.pending = None
+            items.extend(item.children)
+        self.fullyFetched = True
+        self.endResetModel()
+
+    def setAllCheckStates(self, checkState):
+        for item in self.root.children:
+            self.setCheckState(item, checkState)
+
+    def checkedPropertyIds(self):
+        # set of the ids of the checked parameters, parameters driven by functions excluded. The set is updated
+        # along with check states, copy it to keep it
+        return self.checkedIds
+
+    def itemFromIndex(self, index):
+        return index.internalPointer() if index.isValid() else self.root
+
+    def indexFromItem(self, item, column = 0):
+        if item is self.root:
+            return QModelIndex()
+        return self.createIndex(item.row, column, item)
+
+    # --- QAbstractItemModel
+    def index(self, row, column, parent = QModelIndex()):
+        parentItem = self.itemFromIndex(parent)
+        if row < 0 or row >= len(parentItem.children) or column < 0 or column >= len(PCParamTreeModel.HEADER_LABELS):
+            return QModelIndex()
+        return self.createIndex(row, column, parentItem.children[row])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        parentItem = index.internalPointer().parent
+        if parentItem is self.root or parentItem == None:
+            return QModelIndex()
+        return self.createIndex(parentItem.row, 0, parentItem)
+
+    def rowCount(self, parent = QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        return len(self.itemFromIndex(parent).children)
+
+    def columnCount(self, parent = QModelIndex()):
+        return len(PCParamTreeModel.HEADER_LABELS)
+
+    def hasChildren(self, parent = QModelIndex()):
+        item = self.itemFromIndex(parent)
+        return parent.column() <= 0 and (len(item.children) > 0 or bool(item.pending))
+
+    def canFetchMore(self, parent):
+        return parent.column() <= 0 and bool(self.itemFromIndex(parent).pending)
+
+    def fetchMore(self, parent):
+        item = self.itemFromIndex(parent)
+        if not item.pending:
+            return
+        children = self.createChildren(item)
+        self.beginInsertRows(parent, 0, len(children) - 1)
+        item.children = children
+        item.pending = None
+        self.endInsertRows()
+
+    def data(self, index, role = Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        item = index.internalPointer()
+        column = index.column()
+        if role == Qt.DisplayRole:
+            if column == PCParamTreeModel.NAME_COLUMN:
+                return item.name
+            if column == PCParamTreeModel.INHERITANCE_COLUMN:
+                inheritanceMethod = self.inheritanceMethod(item)
+                return PCHelper.inheritanceMethodLabel(inheritanceMethod) if inheritanceMethod != -1 else None
+            if column == PCParamTreeModel.ID_COLUMN and not item.isContainer() and not item.isBaseParam():
+                # we show the id only for specific params as this provides not relevant info for base params
+                return item.propertyId
+        elif role == Qt.CheckStateRole and column == PCParamTreeModel.NAME_COLUMN:
+            return item.checkState
+        elif role == Qt.UserRole and column == PCParamTreeModel.INHERITANCE_COLUMN:
+            return self.inheritanceMethod(item)
+        return None
+
+    def setData(self, index, value, role = Qt.EditRole):
+        if role != Qt.CheckStateRole or not index.isValid():
+            return False
+        item = index.internalPointer()
+        if item.checkState == None:
+            return False
+        self.setCheckState(item, Qt.CheckState(value))
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        if index.internalPointer().checkState != None and index.column() == PCParamTreeModel.NAME_COLUMN:
+            return PCParamTreeModel.CHECKABLE_FLAGS
+        return PCParamTreeModel.ITEM_FLAGS
+
+    def headerData(self, section, orientation, role = Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return PCParamTreeModel.HEADER_LABELS[section]
+        return None
+
+    # --- Private
+    def createChildren(self, item):
+        # items of the pending entries of a container: parameters and the groups below it, in order of first appearance
+        children = []
+        groupItems = {} # key: group name, val: PCParamTreeItem
+        for groupPath, name, propertyId, isFunction, inheritanceMethod in item.pending:
+            if groupPath:
+                groupItem = groupItems.get(groupPath[0])
+                if not groupItem:
+                    groupItem = PCParamTreeItem(item, PCParamTreeItem.ET_PARAM_GROUP, item.paramType, groupPath[0])
+                    groupItem.row = len(children)
+                    children.append(groupItem)
+                    groupItems[groupPath[0]] = groupItem
+                groupItem.pending.append((groupPath[1:], name, propertyId, isFunction, inheritanceMethod))
+            else:
+                entryType = PCParamTreeItem.ET_PARAM_FCT if isFunction else PCParamTreeItem.ET_PARAM
+                checkState = Qt.Checked if propertyId in self.checkedIds else Qt.Unchecked
+                child = PCParamTreeItem(item, entryType, item.paramType, name, propertyId, inheritanceMethod, checkState)
+                child.row = len(children)
+                children.append(child)
+
+        for groupItem in groupItems.values():
+            # a fully checked or unchecked container has all its entries in its state
+            groupItem.checkState = item.checkState if item.checkState != Qt.PartiallyChecked else self.pendingCheckState(groupItem.pending)
+        item.checkableCount = 0
+        item.checkedCount = 0
+        item.uncheckedCount = 0
+        for child in children:
+            if child.checkState != None:
+                item.checkableCount += 1
+                self.countCheckState(item, child.checkState, 1)
+        return children
+
+    def pendingCheckState(self, pending):
+        checked = False
+        unchecked = False
+        for _, _, propertyId, isFunction, _ in pending:
+            if not isFunction:
+                if propertyId in self.checkedIds:
+                    checked = True
+                else:
+                    unchecked = True
+        if checked and unchecked:
+            return Qt.PartiallyChecked
+        return Qt.Checked if checked else Qt.Unchecked
+
+    def inheritanceMethod(self, item):
+        if item.inheritanceMethod == PCParamTreeItem.INHERITANCE_UNKNOWN:
+            item.inheritanceMethod = PCHelper.getInheritanceMethod(self.node, item.propertyId) if self.node else -1
+        return item.inheritanceMethod
+
+    def setCheckState(self, item, checkState):
+        previousState = item.checkState
+        item.checkState = checkState
+        if item.isContainer():
+            self.checkDescendants(item, checkState)
+        elif checkState == Qt.Checked:
+            self.checkedIds.add(item.propertyId)
+        else:
+            self.checkedIds.discard(item.propertyId)
+        self.dataChanged.emit(self.indexFromItem(item), self.indexFromItem(item), [Qt.CheckStateRole])
+
+        # update the counts of the ancestors, up to the first one whose state does not change
+        parent = item.parent
+        while parent is not self.root and previousState != checkState:
+            self.countCheckState(parent, previousState, -1)
+            self.countCheckState(parent, checkState, 1)
+            previousState = parent.checkState
+            parent.checkState = self.countedCheckState(parent)
+            checkState = parent.checkState
+            if checkState != previousState:
+                self.dataChanged.emit(self.indexFromItem(parent), self.indexFromItem(parent), [Qt.CheckStateRole])
+            parent = parent.parent
+
+    def checkDescendants(self, item, checkState):
+        # pending entries take the check state of their container when fetched
+        if item.pending:
+            for _, _, propertyId, isFunction, _ in item.pending:
+                if not isFunction:
+                    self.checkParamId(propertyId, checkState)
+        for child in item.children:
+            if child.checkState != None:
+                child.checkState = checkState
+                if child.isContainer():
+                    self.checkDescendants(child, checkState)
+                else:
+                    self.checkParamId(child.propertyId, checkState)
+        self.resetCounts(item)
+        if item.children:
+            self.dataChanged.emit(self.indexFromItem(item.children[0]), self.indexFromItem(item.children[-1]), [Qt.CheckStateRole])
+
+    def checkParamId(self, propertyId, checkState):
+        if checkState == Qt.Checked:
+            self.checkedIds.add(propertyId)
+        else:
+            self.checkedIds.discard(propertyId)
+
+    def resetCounts(self, item):
+        # counts of a container whose children all have its check state
+        item.checkedCount = item.checkableCount if item.checkState == Qt.Checked else 0
+        item.uncheckedCount = item.checkableCount if item.checkState == Qt.Unchecked else 0
+
+    def countCheckState(self, item, checkState, delta):
+        if checkState == Qt.Checked:
+            item.checkedCount += delta
+        elif checkState == Qt.Unchecked:
+            item.uncheckedCount += delta
+
+    def countedCheckState(self, item):
+        if item.checkableCount == 0:
+            return item.checkState
+        if item.checkedCount == item.checkableCount:
+            return Qt.Checked
+        if item.uncheckedCount == item.checkableCount:
+            return Qt.Unchecked
+        return Qt.PartiallyChecked
+
+class PCParamFilterProxyModel(QtCore.QSortFilterProxyModel):
+    # case insensitive search over parameter names and ids, groups being kept when one of their parameters matches
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.filterText = ""
+        self.setRecursiveFilteringEnabled(True)
+
+    def setFilterText(self, text):
+        self.filterText = text.strip().lower()
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, sourceRow, sourceParent):
+        if not self.filterText:
+            return True
+        model = self.sourceModel()
+        item = model.itemFromIndex(sourceParent).children[sourceRow]
+        return not item.isContainer() and (self.filterText in item.name.lower() or self.filterText in item.propertyId.lower())
+
+class PCParamTreeTemplate:
+    """
+    Node-independent part of the parameter tree of a node definition: parameter order, group paths, names and ids,
+    along with the selection made the last time parameters of this definition were copied.
+    """
+    def __init__(self, defMeta):
+        self.defMeta = defMeta
+        self.entries = [(PCParamTreeModel.groupPath(propMeta.groupName), propMeta.name, propMeta.id, propMeta.prop) for propMeta in defMeta.props if not propMeta.hidden]
+        self.selection = None # frozenset of checked property ids, None if no selection was made yet
+
+class PCParamTreeTemplates:
+    # PCParamTreeTemplate per node definition, rebuilt along with the definition metadata (see PCParamMetaCache)
+    inst = None
+
+    @classmethod
+    def instance(cls):
+        if not cls.inst:
+            cls.inst = PCParamTreeTemplates()
+        return cls.inst
+
+    def __init__(self):
+        self.templates = {} # key: definition key (see PCHelper.nodeDefKey()), val: PCParamTreeTemplate
+
+    def getTemplate(self, node):
+        defMeta = PCParamMetaCache.instance().getDefMeta(node)
+        template = self.templates.get(defMeta.defKey)
+        if not template or template.defMeta is not defMeta:
+            previousTemplate = template
+            template = PCParamTreeTemplate(defMeta)
+            if previousTemplate:
+                template.selection = previousTemplate.selection
+            self.templates[defMeta.defKey] = template
+        return template
+
+class PCParamTreeWidget(QtWidgets.QTreeView):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.paramModel = PCParamTreeModel(self)
+        self.filterModel = PCParamFilterProxyModel(self)
+        self.filterModel.setSourceModel(self.paramModel)
+        self.setModel(self.filterModel)
+        self.setUniformRowHeights(True)
         self.header().resizeSection(1,120)
         self.header().resizeSection(0,240)
         self.showIdCol(False)
-        self.itemChanged.connect(self.onItemChanged)
-        self.ignoreItemChangedNotifs = False
-        self.baseParamTreeItem = None
-        self.instanceParamTreeItem = None
-        self.paramGroupDict = {} # gathers parameter groups. Key: group name, value: PCItemData
+        self.template = None # PCParamTreeTemplate of the displayed node, if any
 
     # --- Public
     def clearTree(self):
-        self.clear()
-        self.baseParamTreeItem = None
-        self.instanceParamTreeItem = None
-        self.paramGroupDict = {}
+        self.template = None
+        self.paramModel.populate([], set())
 
     def showIdCol(self, show):
-        if show:
-            self.header().showSection(2)       
-        else:
-            self.header().hideSection(2)
+        self.setColumnHidden(PCParamTreeModel.ID_COLUMN, not show)
 
     def populateFromNode(self, node, selectItems):
-        self.clearTree()
-
-        properties = node.getProperties(SDPropertyCategory.Input)
-        if properties:
-            p = 0
-            psize = properties.getSize()
-            self.ignoreItemChangedNotifs = True
-
-            while p < psize:
-                prop = properties.getItem(p)
-                if prop.getType().getClassName() != "SDTypeTexture": # do not process node inputs
-                    
-                    propertyId = prop.getId()
-                    if not PCHelper.isHiddenParam(node, propertyId):
-                        self.addNodeProperty(node, prop)
-                p += 1
-
-            self.ignoreItemChangedNotifs = False
-            if selectItems:
-                self.processAllItems(expand = True, check = True)
+        # the tree structure comes from the template of the node definition, only function-driven states are read from the node
+        self.template = PCParamTreeTemplates.instance().getTemplate(node)
+        entries = []
+        for groupPath, name, propertyId, prop in self.template.entries:
+            if PCHelper.isInputParamFunctionDriven(node, prop):
+                entries.append((groupPath, name + " (function)", propertyId, True, -1))
             else:
-                self.processAllItems(expand = True, uncheck = True)
-
-    def populateFromNodeState(self, nodeState):
-        self.clearTree()
-        self.ignoreItemChangedNotifs = True
+                entries.append((groupPath, name, propertyId, False, PCParamTreeItem.INHERITANCE_UNKNOWN))
 
-        for propertyId in nodeState.state.params.keys():
-            self.addNodeStateProperty(nodeState, propertyId)                    
-
-        self.ignoreItemChangedNotifs = False
-        self.processAllItems(expand = True, check = True)
+        if self.template.selection != None:
+            checkedIds = self.template.selection
+        elif selectItems:
+            checkedIds = set(entry[2] for entry in entries)
+        else:
+            checkedIds = set()
+        self.paramModel.populate(entries, checkedIds, node)
+        self.refreshFilter()
+
+    def populateFromNodeState(self, nodeState, checkedIds = None):
+        # checkedIds: ids of the parameters to check, all of them if None
+        self.template = None
+        entries = [(PCParamTreeModel.groupPath(param.groupName), param.getName(), propertyId, False, param.inheritanceMethod) for propertyId, param in nodeState.state.params.items()]
+        self.paramModel.populate(entries, set(entry[2] for entry in entries) if checkedIds == None else set(checkedIds))
+        self.refreshFilter()
+
+    def rememberSelection(self):
+        # the current selection is restored next time a node of the same definition is displayed
+        if self.template:
+            self.template.selection = frozenset(self.paramModel.checkedIds)
 
     def retrieveCheckedProperties(self):
-        propertyIds = []
-        iter = QTreeWidgetItemIterator(self)
-        while iter.value():
-            treeItem = iter.value()
-            if treeItem.checkState(0) == Qt.Checked:
-                pcItemData = treeItem.data(0, Qt.UserRole)
-                # exclude non-leaves (they are not properties) and params driven by functions
-                if treeItem.childCount() == 0 and not self.isTreeItemFunctionParam(treeItem):
-                    propertyIds.append(pcItemData.propertyId)
-            iter += 1
-        return propertyIds
+        return self.paramModel.checkedPropertyIds()
 
     def selectAll(self):
-        self.processAllItems(check = True)
+        self.paramModel.setAllCheckStates(Qt.Checked)
 
     def deselectAll(self):
-        self.processAllItems(uncheck = True)
+        self.paramModel.setAllCheckStates(Qt.Unchecked)
 
     def expandAll(self):
-        self.processAllItems(expand = True)
-
-    def collapseAll(self):
-        self.processAllItems(collapse = True)
-
-    # --- slots    
-    def onItemChanged(self, treeItem):
-        if self.ignoreItemChangedNotifs:
-            return
-
-        if treeItem.childCount() > 0:
-            checkState = treeItem.checkState(0)
-            if checkState != Qt.PartiallyChecked:
-                self.checkChildren(treeItem, checkState)
-
-        self.setParentTreeItemsCheckStateBasedOnSiblings(treeItem)
+        # expands the containers only, QTreeView.expandAll() visiting every parameter
+        items = list(self.paramModel.root.children)
+        while items:
+            item = items.pop()
+            sourceIndex = self.paramModel.indexFromItem(item)
+            if self.paramModel.canFetchMore(sourceIndex):
+                self.paramModel.fetchMore(sourceIndex)
+            self.expand(self.filterModel.mapFromSource(sourceIndex))
+            items.extend(child for child in item.children if child.isContainer())
+
+    def setFilterText(self, text):
+        if text.strip():
+            self.paramModel.fetchAll() # filtering applies to created items only
+        self.filterModel.setFilterText(text)
+        self.expandAll()
 
     # --- Private
-    def setParentTreeItemsCheckStateBasedOnSiblings(self, treeItem):
-        # check whether all sibling have the same state, if so set the parent state
-        self.ignoreItemChangedNotifs = True
-        ti = treeItem
-        while ti.parent():
-            parent = ti.parent()
-            state = self.haveSiblingsSameState(ti)
-            parent.setCheckState(0, state)
-            ti = parent
-        self.ignoreItemChangedNotifs = False
-
-    def createParamGroupTreeItem(self, pcItemData, groupName, displayGroupName, parentTreeItem):
-        treeItem = self.createUITreeItem(pcItemData, displayGroupName, None, -1, parentTreeItem)
-        self.paramGroupDict[groupName] = treeItem
-        return treeItem
-
-    def getParamTypeTreeItem(self, isBaseParam):
-        return self.getBaseParamsTreeItem() if isBaseParam else self.getInstanceParamsTreeItem()
-
-    def getParentGroupTreeItem(self, groupName, paramType):
-        paramGroupTreeItem = self.paramGroupDict.get(groupName)
-        if not paramGroupTreeItem:
-            # param group tree item does not yet exist, create it
-            # check if this is a first or second level group
-            secondLevelGroupName = None
-            sep = groupName.find("/")
-            if sep != -1:
-                firstLevelGroupName = groupName[:sep]
-                secondLevelGroupName = groupName[(sep+1):]
-            else:
-                firstLevelGroupName = groupName
- 
-            pcItemData = PCParamTreeWidget.PCItemData(PCParamTreeWidget.PCItemData.ET_PARAM_GROUP, paramType)
-            baseParentTreeItem = self.getParamTypeTreeItem(pcItemData.isBaseParam())
-            parentTreeItem = None
-            
-            if secondLevelGroupName:
-                # check whether first level group exists
-                firstLevelGroupTreeItem = self.paramGroupDict.get(firstLevelGroupName)
-                if not firstLevelGroupTreeItem:
-                    # create first level group
-                    firstLevelGroupTreeItem = self.createParamGroupTreeItem(PCParamTreeWidget.PCItemData(PCParamTreeWidget.PCItemData.ET_PARAM_GROUP, paramType), firstLevelGroupName, firstLevelGroupName, baseParentTreeItem)
-                parentTreeItem = firstLevelGroupTreeItem
-                displayGroupName = secondLevelGroupName
-            else:
-                parentTreeItem = baseParentTreeItem
-                displayGroupName = groupName
-
-            paramGroupTreeItem = self.createParamGroupTreeItem(PCParamTreeWidget.PCItemData(PCParamTreeWidget.PCItemData.ET_PARAM_GROUP, paramType), groupName, displayGroupName, parentTreeItem)
-
-        return paramGroupTreeItem
-
-    def addNodeStateProperty(self, nodeState, propertyId):
-        propertyData = nodeState.state.params[propertyId]
-
-        paramName = propertyData.getName()
-        propertyId = propertyData.id
-        isBaseParam = PCHelper.isBaseParameter(propertyId)
-        entryType = PCParamTreeWidget.PCItemData.ET_PARAM
-
-        paramType = PCParamTreeWidget.PCItemData.PT_BASE if isBaseParam else PCParamTreeWidget.PCItemData.PT_SPECIFIC
-        pcItemData = PCParamTreeWidget.PCItemData(entryType, paramType, propertyId)
-
-        groupName = propertyData.groupName
-        if groupName:
-            parentTreeItem = self.getParentGroupTreeItem(groupName, paramType)
-        else:
-            parentTreeItem = self.getParamTypeTreeItem(pcItemData.isBaseParam())
-
-        treeItem = self.createUITreeItem(pcItemData, paramName, propertyId, propertyData.inheritanceMethod, parentTreeItem)
-        return treeItem
-
-    def addNodeProperty(self, node, prop):
-        paramName = PCHelper.getPropertyOrDefinitionName(prop)
-        propertyId = prop.getId()
-        isBaseParam = PCHelper.isBaseParameter(propertyId)
-        isParamFunction = PCHelper.isInputParamFunctionDriven(node, prop)
-    
-        if isParamFunction:
-            paramName += " (function)"
-            entryType = PCParamTreeWidget.PCItemData.ET_PARAM_FCT
-        else:
-            entryType = PCParamTreeWidget.PCItemData.ET_PARAM
-
-        paramType = PCParamTreeWidget.PCItemData.PT_BASE if isBaseParam else PCParamTreeWidget.PCItemData.PT_SPECIFIC
-        pcItemData = PCParamTreeWidget.PCItemData(entryType, paramType, propertyId)
-
-        groupName = PCHelper.getParamGroupName(node, propertyId)
-        if groupName:
-            parentTreeItem = self.getParentGroupTreeItem(groupName, paramType)
-        else:
-            parentTreeItem = self.getParamTypeTreeItem(pcItemData.isBaseParam())
-
-        inheritanceMethod = -1
-        if not isParamFunction:
-            inheritanceMethod = PCHelper.getInheritanceMethod(node, propertyId)
-
-        treeItem = self.createUITreeItem(pcItemData, paramName, propertyId, inheritanceMethod, parentTreeItem)
-        return treeItem
-
-    def getBaseParamsTreeItem(self):
-        if not self.baseParamTreeItem:
-            pcItemData = PCParamTreeWidget.PCItemData(PCParamTreeWidget.PCItemData.ET_PARAM_TYPE, PCParamTreeWidget.PCItemData.PT_BASE)
-            self.baseParamTreeItem = self.createUITreeItem(pcItemData, "Base Parameters")
-        return self.baseParamTreeItem
-
-    def getInstanceParamsTreeItem(self):
-        if not self.instanceParamTreeItem:
-            pcItemData = PCParamTreeWidget.PCItemData(PCParamTreeWidget.PCItemData.ET_PARAM_TYPE, PCParamTreeWidget.PCItemData.PT_SPECIFIC)
-            self.instanceParamTreeItem = self.createUITreeItem(pcItemData, "Specific Parameters")
-        return self.instanceParamTreeItem
-
-    def isTreeItemFunctionParam(self, treeItem):
-         return treeItem.data(0, Qt.UserRole).entryType ==  PCParamTreeWidget.PCItemData.ET_PARAM_FCT
-
-    def checkChildren(self, parentItem, checkState):
-        self.ignoreItemChangedNotifs = True
-
-        childCount = parentItem.childCount()
-        for c in range(0, childCount):
-            child = parentItem.child(c)
-
-            if not self.isTreeItemFunctionParam(child):
-                child.setCheckState(0, checkState)
-
-            if child.childCount() > 0:
-                self.checkChildren(child, checkState)
-                self.ignoreItemChangedNotifs = True
-
-        self.ignoreItemChangedNotifs = False
-
-    def haveSiblingsSameState(self, treeItem):
-        # return whether siblings are all checked or unchecked
-        parentItem = treeItem.parent()
-        childCount = parentItem.childCount()
-        checkedCount = 0
-        uncheckedCount = 0
-        for c in range(0, childCount):
-            state = parentItem.child(c).checkState(0)
-            if state == Qt.Checked:
-                checkedCount += 1
-            elif state == Qt.Unchecked:
-                uncheckedCount += 1
-        
-        if checkedCount == childCount:
-            ret = Qt.Checked
-        elif uncheckedCount == childCount:
-            ret = Qt.Unchecked
+    def refreshFilter(self):
+        if self.filterModel.filterText:
+            self.paramModel.fetchAll()
+            self.filterModel.invalidateFilter()
+            self.expandAll()
         else:
-            ret = Qt.PartiallyChecked
-        return ret 
-            
-    def createUITreeItem(self, pcItemData, name, propertyId = None, inheritanceMethod = -1, parentItem=None):
-        if parentItem:
-            treeItem = QtWidgets.QTreeWidgetItem(parentItem)
-        else:
-            treeItem = QtWidgets.QTreeWidgetItem(self)
-
-        treeItem.setText(0, name)
-        treeItem.setData(0, Qt.UserRole, pcItemData)
-
-        if inheritanceMethod != -1:
-            treeItem.setText(1, PCHelper.inheritanceMethodLabel(inheritanceMethod))
-            treeItem.setData(1, Qt.UserRole, inheritanceMethod)
-
-        if propertyId and not pcItemData.paramType == PCParamTreeWidget.PCItemData.PT_BASE:
-            # we show the id only for specific params as this provides not relevant info for base params
-            treeItem.setText(2, propertyId)
-
-        return treeItem
-
-    def processAllItems(self, expand = False, collapse = False, check = False, uncheck = False):
-        iter = QTreeWidgetItemIterator(self)
-        self.ignoreItemChangedNotifs = True
-
-        while iter.value():
-            treeItem = iter.value()
-            hasChildren = treeItem.childCount() > 0
-
-            if expand:
-                if hasChildren:
-                    self.expandItem(treeItem)
-            elif collapse:
-                if hasChildren:
-                    self.collapseItem(treeItem)
-
-            if check or uncheck:
-                # check/uncheck param if not function driven
-                if treeItem.data(0, Qt.UserRole).entryType != PCParamTreeWidget.PCItemData.ET_PARAM_FCT:
-                    checkStateToSet = Qt.Checked if check else Qt.Unchecked
-                    treeItem.setCheckState(0, checkStateToSet)
-
-            iter += 1
-
-        self.ignoreItemChangedNotifs = False
\ No newline at end of file
+            # groups are left collapsed, their items being created when expanded
+            for item in self.paramModel.root.children:
+                self.expand(self.filterModel.mapFromSource(self.paramModel.indexFromItem(item)))
@@ -7,11 +7,11 @@ import sd
 if sd.getContext().getSDApplication().getVersion() < "14.0.0":
     from PySide2 import QtCore, QtWidgets
     from PySide2.QtCore import Qt, QTimer
-    from PySide2.QtWidgets import QTreeWidget, QTreeWidgetItemIterator, QSizePolicy, QCheckBox
+    from PySide2.QtWidgets import QTreeWidget, QTreeWidgetItemIterator, QSizePolicy, QCheckBox, QDialogButtonBox
 else:
     from PySide6 import QtCore, QtWidgets
     from PySide6.QtCore import Qt, QTimer
-    from PySide6.QtWidgets import QTreeWidget, QTreeWidgetItemIterator, QSizePolicy, QCheckBox
+    from PySide6.QtWidgets import QTreeWidget, QTreeWidgetItemIterator, QSizePolicy, QCheckBox, QDialogButtonBox
 
 from sd.api.sdnode import SDNode
 
@@ -20,6 +20,10 @@ from paramcopy.pccore.pcdata import PCData
 from paramcopy.pccore.pchelper import PCHelper
 from paramcopy.pccore.pccopier import PCCopier
 from paramcopy.pccore.pcprefs import PCPrefs
+from paramcopy.pccore.pcparam import PCWriteStats
+from paramcopy.pccore.pccomputesched import PCComputeScheduler
+from paramcopy.pccore.pcjob import PCJob
+from paramcopy.pccore.pcpastepresets import PCPastePresets
 
 from paramcopy.pcui.paramtree import PCParamTreeWidget
 from paramcopy.pcui.paramdlg import PCParamDlgBase
@@ -27,6 +31,8 @@ from paramcopy.pcui.paramdlg import PCParamDlgBase
 class PCPasteDlg(PCParamDlgBase):
     def __init__(self, parent=None):
         super().__init__(False, parent)
+        self.job = None
+        self.stats = None
         self.setupStaticFields("PCPasteDlg", PCData.APP_NAME + " - Paste")
 
     def setupStaticFields(self, dlgName, title):
@@ -55,7 +61,9 @@ class PCPasteDlg(PCParamDlgBase):
         self.l_node_desc.setText(str(paramCount) + parameterStr + " from " + sourceNodeName + " to paste into " + str(nodeCount) + nodeStr + ".")
         
         #self.treeWidget.populateFromPropertyIds(sourceNode, copier.clipboard)
+        self.le_filter.clear()
         self.treeWidget.populateFromNodeState(sourceNodeState)
+        self.updatePresets()
         return super().show()
 
     def setupDynamicFields(self):
@@ -84,6 +92,33 @@ class PCPasteDlg(PCParamDlgBase):
         self.chk_same_type.stateChanged.connect(self.onExclusiveChkStateChange)
         self.chk_paste_same_id.stateChanged.connect(self.onExclusiveChkStateChange)
 
+        self.hl_presets = QtWidgets.QHBoxLayout()
+        self.hl_presets.setObjectName("hl_presets")
+        self.l_presets = QtWidgets.QLabel("Preset:", self)
+        self.hl_presets.addWidget(self.l_presets)
+        self.cb_presets = QtWidgets.QComboBox(self)
+        self.cb_presets.setObjectName("cb_presets")
+        self.cb_presets.setToolTip("Parameter selection presets applicable to the copied node. Presets assigned to a quick paste slot\n"
+"can be pasted without opening this window, from their shortcut or from the toolbar.")
+        self.hl_presets.addWidget(self.cb_presets, 1)
+        self.b_preset_apply = QtWidgets.QPushButton("Apply", self)
+        self.b_preset_apply.setToolTip("Select the parameters of the preset")
+        self.hl_presets.addWidget(self.b_preset_apply)
+        self.b_preset_save = QtWidgets.QPushButton("Save...", self)
+        self.b_preset_save.setToolTip("Save the selected parameters as a preset")
+        self.hl_presets.addWidget(self.b_preset_save)
+        self.b_preset_slot = QtWidgets.QPushButton("Assign to Slot...", self)
+        self.b_preset_slot.setToolTip("Assign the preset to a quick paste slot")
+        self.hl_presets.addWidget(self.b_preset_slot)
+        self.b_preset_delete = QtWidgets.QPushButton("Delete", self)
+        self.hl_presets.addWidget(self.b_preset_delete)
+        self.verticalLayout.insertLayout(4, self.hl_presets)
+
+        self.b_preset_apply.clicked.connect(self.onApplyPreset)
+        self.b_preset_save.clicked.connect(self.onSavePreset)
+        self.b_preset_slot.clicked.connect(self.onAssignPresetSlot)
+        self.b_preset_delete.clicked.connect(self.onDeletePreset)
+
     def onExclusiveChkStateChange(self, state):
         chk = self.sender()
         if chk == self.chk_same_type:
@@ -100,6 +135,69 @@ class PCPasteDlg(PCParamDlgBase):
             otherNewState = Qt.Unchecked if chk.checkState() == Qt.Checked else Qt.Checked
             other.setCheckState(otherNewState)
 
+    def updatePresets(self, currentName = None):
+        self.cb_presets.clear()
+        for preset in PCPastePresets.instance().applicablePresets(self.sourceNodeState):
+            self.cb_presets.addItem(preset.name if preset.isGlobal() else preset.name + " (" + preset.defKey[1] + ")", preset.name)
+        if currentName:
+            self.cb_presets.setCurrentIndex(max(0, self.cb_presets.findData(currentName)))
+        hasPresets = self.cb_presets.count() > 0
+        self.b_preset_apply.setEnabled(hasPresets)
+        self.b_preset_slot.setEnabled(hasPresets)
+        self.b_preset_delete.setEnabled(hasPresets)
+
+    def currentPreset(self):
+        name = self.cb_presets.currentData()
+        return PCPastePresets.instance().get(name) if name else None
+
+    def onApplyPreset(self):
+        preset = self.currentPreset()
+        if preset:
+            self.treeWidget.populateFromNodeState(self.sourceNodeState, preset.propertyIds)
+
+    def onSavePreset(self):
+        propertyIds = self.treeWidget.retrieveCheckedProperties()
+        if not propertyIds:
+            PCHelper.displayErrorMsg("No parameters selected, nothing to save as preset.", self)
+            return
+        name, ok = QtWidgets.QInputDialog.getText(self, PCData.APP_NAME, "Preset name:")
+        name = name.strip()
+        if not ok or len(name) == 0:
+            return
+        presets = PCPastePresets.instance()
+        if presets.get(name) and not PCHelper.askYesNoQuestion("A preset named " + name + " already exists, replace it?", False, self):
+            return
+        defKey = self.sourceNodeState.nodeIdentifier.defKey()
+        if not PCHelper.askYesNoQuestion("Restrict this preset to " + defKey[1] + " nodes?\n\n"
+            "Answer No to make it available for clipboards of any node type.", False, self):
+            defKey = None
+        presets.save(name, propertyIds, defKey)
+        pclog.log("Paste preset " + name + " saved with " + str(len(propertyIds)) + " parameter(s)")
+        self.updatePresets(name)
+
+    def onAssignPresetSlot(self):
+        preset = self.currentPreset()
+        if not preset:
+            return
+        presets = PCPastePresets.instance()
+        prefs = PCPrefs.instance()
+        slots = []
+        for slot in range(0, PCPastePresets.SLOT_COUNT):
+            slotName = presets.slotName(slot)
+            shortcut = prefs.pastePresetShortcuts[slot] if slot < len(prefs.pastePresetShortcuts) else ""
+            slots.append("Slot " + str(slot + 1) + " (" + shortcut + "): " + (slotName if slotName else "<empty>"))
+        item, ok = QtWidgets.QInputDialog.getItem(self, PCData.APP_NAME, "Quick paste slot for preset " + preset.name + ":", slots, 0, False)
+        if ok:
+            slot = slots.index(item)
+            presets.assign(slot, preset.name)
+            pclog.log("Paste preset " + preset.name + " assigned to quick paste slot " + str(slot + 1))
+
+    def onDeletePreset(self):
+        preset = self.currentPreset()
+        if preset and PCHelper.askYesNoQuestion("Delete paste preset " + preset.name + "?", False, self):
+            PCPastePresets.instance().delete(preset.name)
+            self.updatePresets()
+
     def onOK(self):
         propertyIds = self.treeWidget.retrieveCheckedProperties()
         if propertyIds and len(propertyIds) > 0:
@@ -114,14 +212,39 @@ class PCPasteDlg(PCParamDlgBase):
             QTimer.singleShot(1, lambda:self.warnNoSelection())            
 
     def doPaste(self, propertyIds, pasteOptions):
-        #PCCopier.instance().pasteDataInto(propertyIds, self.destNodes, pasteOptions)
-        PCCopier.instance().pasteNodeStateInto(self.sourceNodeState, self.destNodes, pasteOptions, propertyIds)
-        QTimer.singleShot(1, lambda:self.computeGraphIfNeeded())
-        self.close()
+        plan = PCCopier.instance().compilePastePlan(self.sourceNodeState, self.destNodes, pasteOptions, propertyIds)
+        self.stats = PCWriteStats()
+        skipUnchanged = PCPrefs.instance().skipUnchangedWrites
+        self.job = PCJob("Pasting", plan.nodeWrites(), lambda nodeWrite: plan.writeNode(nodeWrite[0], nodeWrite[1], skipUnchanged, self.stats), undoName = "Paste", inputOwner = self)
+        self.bb_ok_cancel.button(QDialogButtonBox.Ok).setEnabled(False)
+        self.job.start(self.setStatus, self.onPasteFinished)
+
+    def onPasteFinished(self, job):
+        self.bb_ok_cancel.button(QDialogButtonBox.Ok).setEnabled(True)
+        pclog.log("Paste: " + self.stats.summary())
+        if job.doneCount > 0:
+            QTimer.singleShot(1, lambda:self.computeGraphIfNeeded())
+
+        if job.isFailed() or job.isCancelled():
+            job.logDoneSteps(lambda nodeWrite: nodeWrite[0].getIdentifier())
+            self.setStatus(job.interruptedText())
+        else:
+            self.close()
+
+    def onClose(self):
+        if self.job and self.job.isRunning():
+            self.job.cancel()
+        else:
+            self.close()
+
+    def closeEvent(self, event):
+        if self.job and self.job.isRunning():
+            self.job.cancel()
+        super().closeEvent(event)
 
     def computeGraphIfNeeded(self):
         if PCPrefs.instance().computeGraphAfterPaste:
-            PCHelper.computeCurrentGraph()
+            PCComputeScheduler.instance().requestCurrentGraphCompute()
 
     def warnNoSelection(self):
         PCHelper.displayInfoMsg("No parameters were selected, nothing has been pasted.")
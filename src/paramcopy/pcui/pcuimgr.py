@@ -4,16 +4,15 @@
 # ---------------
 
 from functools import partial
-import random
 
 import sd
 if sd.getContext().getSDApplication().getVersion() < "14.0.0":
     from PySide2.QtCore import QObject, Signal, Slot
-    from PySide2.QtWidgets import QToolBar, QAction
+    from PySide2.QtWidgets import QToolBar, QAction, QMenu
     from PySide2.QtGui import QIcon, QPixmap, QKeySequence
 else:
     from PySide6.QtCore import QObject, Signal, Slot
-    from PySide6.QtWidgets import QToolBar
+    from PySide6.QtWidgets import QToolBar, QMenu
     from PySide6.QtGui import QIcon, QPixmap, QKeySequence, QAction
     
 import sd
@@ -23,7 +22,6 @@ from sd.api.sduimgr import SDUIMgr
 from sd.api.sdgraph import SDGraph
 from sd.api.sddefinition import SDDefinition
 from sd.api.sbs.sdsbscompnode import SDSBSCompNode
-from sd.api.sdvalueint import SDValueInt
 
 from paramcopy.pccore.pchelper import PCHelper
 from paramcopy.pccore import pclog
@@ -32,6 +30,14 @@ from paramcopy.pccore.pccopier import PCCopier
 from paramcopy.pccore.pcprefs import PCPrefs
 from paramcopy.pccore.pcstatemgr import PCStateMgr
 from paramcopy.pccore.pcinspector import PCInspector
+from paramcopy.pccore.pcparammeta import PCParamMetaCache
+from paramcopy.pccore.pccomputesched import PCComputeScheduler
+from paramcopy.pccore.pcundo import PCUndoMgr
+from paramcopy.pccore.pcrecallslots import PCRecallSlots
+from paramcopy.pccore.pcpastepresets import PCPastePresets
+from paramcopy.pccore.pcmulticlip import PCNodeMatcher
+from paramcopy.pccore.pcseedroll import PCSeedRoller
+from paramcopy.pccore.pcparam import PCWriteStats
 
 from paramcopy.pcui.pctoolbar import PCGraphCustomToolbarMgr
 from paramcopy.pcui.copydlg import PCCopyDlg
@@ -40,6 +46,8 @@ from paramcopy.pcui.prefsdlg import PCPrefsDlg
 from paramcopy.pcui.newstatedlg import PCNewStateDlg
 from paramcopy.pcui.statesdlg import PCStatesDlg
 from paramcopy.pcui.clipboardsdlg import PCClipboardsDlg
+from paramcopy.pcui.randomizedlg import PCRandomizeDlg
+from paramcopy.pcui.sweepdlg import PCSweepDlg
 
 class PCUIMgr(QObject):
     inst = None
@@ -65,7 +73,12 @@ class PCUIMgr(QObject):
         self.newStateDlg = None
         self.statesDlg = None
         self.clipboardsDlg = None
+        self.randomizeDlg = None
+        self.sweepDlg = None
         self.shortcutsCreated = False
+        self.fileCallbackIds = []
+        self.recallSlotActions = []
+        self.pastePresetActions = []
 
     def loadSvgToolbarIcon(self, iconName):
         icon = None
@@ -99,7 +112,13 @@ class PCUIMgr(QObject):
         if sd.getContext().getSDApplication().getVersion() >= "14.0.0":
             self.toolbarMgr.createToolbarForExistingGraphViews()
 
+        self.registerFileCallbacks()
+
     def removeUI(self):
+        self.unregisterFileCallbacks()
+        if PCComputeScheduler.inst:
+            PCComputeScheduler.inst.cleanup()
+
         if self.toolbarMgr:
             self.toolbarMgr.cleanup()
             self.toolbarMgr = None
@@ -111,6 +130,8 @@ class PCUIMgr(QObject):
         self.newStateDlg = None
         self.statesDlg = None
         self.clipboardsDlg = None
+        self.randomizeDlg = None
+        self.sweepDlg = None
 
         PCCopier.inst = None
         PCStateMgr.inst = None
@@ -121,6 +142,22 @@ class PCUIMgr(QObject):
 
         self.shortcutsCreated = False
 
+    def registerFileCallbacks(self):
+        # parameter metadata of a package's graphs may change when it is reloaded, saved or closed
+        for registerFctName in ("registerAfterFileLoadedCallback", "registerAfterFileSavedCallback", "registerBeforeFileClosedCallback"):
+            registerFct = getattr(self.sdApp, registerFctName, None)
+            if registerFct:
+                self.fileCallbackIds.append(registerFct(self.onPackageFileChanged))
+
+    def unregisterFileCallbacks(self):
+        for callbackId in self.fileCallbackIds:
+            self.sdApp.unregisterCallback(callbackId)
+        self.fileCallbackIds = []
+
+    def onPackageFileChanged(self, filePath, *args):
+        PCParamMetaCache.instance().invalidatePackage(filePath)
+        PCRecallSlots.instance().invalidateAll()
+
     def createToolbar(self):
         toolbar = QToolBar(self.sdUiMgr.getMainWindow())
         toolbar.setObjectName(PCData.TOOLBAR_OBJ_NAME)
@@ -133,6 +170,13 @@ class PCUIMgr(QObject):
         pasteAction.setToolTip("Paste parameters into selected node(s)")
         pasteAction.triggered.connect(self.onPaste)
 
+        pasteAction = toolbar.addAction(self.pasteIcon, "Quick Paste Preset")
+        pasteAction.setToolTip("Paste a parameter selection preset into selected node(s), without dialog")
+        presetMenu = QMenu(toolbar)
+        presetMenu.aboutToShow.connect(partial(self.onPastePresetMenu, presetMenu))
+        pasteAction.setMenu(presetMenu)
+        pasteAction.triggered.connect(partial(self.onPastePresetSlot, 0))
+
         pasteAction = toolbar.addAction(self.clipboardIcon, "Clipboards")
         pasteAction.setToolTip("Open the Clipboards window")
         pasteAction.triggered.connect(self.onClipboards)
@@ -169,10 +213,28 @@ class PCUIMgr(QObject):
         self.pasteParamsAction .triggered.connect(self.onPaste)
         paramsSubmenu.addAction(self.pasteParamsAction)
 
+        action = QAction("Paste Selection Matching Positions", paramsSubmenu)
+        action.setToolTip("Paste a multiple node copy, matching nodes of a same type by their position in the selection")
+        action.triggered.connect(partial(self.onPasteMultiClipboard, PCNodeMatcher.POSITION))
+        paramsSubmenu.addAction(action)
+
+        action = QAction("Paste Selection Matching Connections", paramsSubmenu)
+        action.setToolTip("Paste a multiple node copy, matching nodes of a same type by their connections within the selection")
+        action.triggered.connect(partial(self.onPasteMultiClipboard, PCNodeMatcher.CONNECTIONS))
+        paramsSubmenu.addAction(action)
+
         self.clipboardsAction = QAction("Clipboards...", paramsSubmenu)
         self.clipboardsAction.triggered.connect(self.onClipboards)
         paramsSubmenu.addAction(self.clipboardsAction)
 
+        paramsSubmenu.addSeparator()
+        self.pastePresetActions = []
+        for slot in range(0, PCPastePresets.SLOT_COUNT):
+            action = QAction("Quick Paste Preset " + str(slot + 1), paramsSubmenu)
+            action.triggered.connect(partial(self.onPastePresetSlot, slot))
+            paramsSubmenu.addAction(action)
+            self.pastePresetActions.append(action)
+
         statesSubmenu = self.menu.addMenu("Variations")
 
         self.storeVariationAction = QAction("Store Variation...", statesSubmenu)
@@ -183,10 +245,38 @@ class PCUIMgr(QObject):
         self.showVariationAction.triggered.connect(self.onRecallNodeStates)
         statesSubmenu.addAction(self.showVariationAction)
 
+        statesSubmenu.addSeparator()
+        self.recallSlotActions = []
+        for slot in range(0, PCRecallSlots.SLOT_COUNT):
+            action = QAction("Quick Recall Slot " + str(slot + 1), statesSubmenu)
+            action.triggered.connect(partial(self.onRecallSlot, slot))
+            statesSubmenu.addAction(action)
+            self.recallSlotActions.append(action)
+
         self.rollRandomSeedAction = QAction("Roll Random Seeds...", self.menu)
         self.rollRandomSeedAction.triggered.connect(self.onRollRandomSeeds)
         self.menu.addAction(self.rollRandomSeedAction)
 
+        self.rerollRandomSeedAction = QAction("Re-roll Same Seeds", self.menu)
+        self.rerollRandomSeedAction.triggered.connect(self.onRerollRandomSeeds)
+        self.menu.addAction(self.rerollRandomSeedAction)
+
+        self.stepBackRandomSeedAction = QAction("Step Back Seed History", self.menu)
+        self.stepBackRandomSeedAction.triggered.connect(self.onStepBackRandomSeeds)
+        self.menu.addAction(self.stepBackRandomSeedAction)
+
+        self.randomizeParamsAction = QAction("Randomize Parameters...", self.menu)
+        self.randomizeParamsAction.triggered.connect(self.onRandomizeParams)
+        self.menu.addAction(self.randomizeParamsAction)
+
+        self.sweepParamsAction = QAction("Parameter Sweep...", self.menu)
+        self.sweepParamsAction.triggered.connect(self.onSweepParams)
+        self.menu.addAction(self.sweepParamsAction)
+
+        self.undoAction = QAction("Undo Last Operation", self.menu)
+        self.undoAction.triggered.connect(self.onUndo)
+        self.menu.addAction(self.undoAction)
+
         # action = QAction("Inspector...", self.menu)
         # action.triggered.connect(self.onInspector)
         # self.menu.addAction(action)
@@ -206,6 +296,13 @@ class PCUIMgr(QObject):
             self.storeVariationAction = None
             self.showVariationAction = None
             self.rollRandomSeedAction = None
+            self.rerollRandomSeedAction = None
+            self.stepBackRandomSeedAction = None
+            self.randomizeParamsAction = None
+            self.sweepParamsAction = None
+            self.undoAction = None
+            self.recallSlotActions = []
+            self.pastePresetActions = []
 
     def setupShortcuts(self):
         prefs = PCPrefs.instance()
@@ -214,6 +311,11 @@ class PCUIMgr(QObject):
         self.storeVariationAction.setShortcut(QKeySequence(prefs.storeVariationShortcut))
         self.showVariationAction.setShortcut(QKeySequence(prefs.showVariationsShortcut))
         self.rollRandomSeedAction.setShortcut(QKeySequence(prefs.rollRandomSeedsShortcut))
+        self.undoAction.setShortcut(QKeySequence(prefs.undoShortcut))
+        for action, shortcut in zip(self.recallSlotActions, prefs.recallSlotShortcuts):
+            action.setShortcut(QKeySequence(shortcut))
+        for action, shortcut in zip(self.pastePresetActions, prefs.pastePresetShortcuts):
+            action.setShortcut(QKeySequence(shortcut))
         self.shortcutsCreated = True
         pclog.log("Shortcuts created")
 
@@ -235,7 +337,11 @@ class PCUIMgr(QObject):
                         self.copyDlg = PCCopyDlg(self.sdUiMgr.getMainWindow())
                     self.copyDlg.show(node)
             else:
-                PCHelper.displayErrorMsg("Multiple node selected: please select a single node to use the Copy Params functionalty.")
+                multiClipboard = PCCopier.instance().setMultiClipboard(nodes, PCHelper.getCurrentGraph())
+                pclog.log("Copy: " + str(multiClipboard.nodeCount()) + " node(s), " + str(multiClipboard.paramCount()) + " parameter(s)" +
+                    (", " + str(multiClipboard.skippedCount) + " function or unsupported node(s) skipped" if multiClipboard.skippedCount else ""))
+                if multiClipboard.nodeCount() == 0:
+                    PCHelper.displayErrorMsg("None of the selected nodes can be copied.")
         else:
             PCHelper.displayErrorMsg("No Selection: please select a node to use the Copy Parameters functionalty.")
 
@@ -245,7 +351,11 @@ class PCUIMgr(QObject):
         nodes = self.sdUiMgr.getCurrentGraphSelectedNodes()
         clipboard = PCCopier.instance().currentClipboard
 
-        if clipboard:
+        if PCCopier.instance().currentMultiClipboard:
+            self.onPasteMultiClipboard(PCPrefs.instance().multiPasteMatching)
+        elif clipboard and not clipboard.checkLoaded():
+            PCHelper.displayErrorMsg("The current clipboard could not be loaded from the library, nothing to paste.")
+        elif clipboard:
             if nodes and nodes.getSize() > 0:
                 if not self.pasteDlg:
                     self.pasteDlg = PCPasteDlg(self.sdUiMgr.getMainWindow())
@@ -255,6 +365,68 @@ class PCUIMgr(QObject):
         else:
             PCHelper.displayErrorMsg("No clipboard data: please first copy node parameters before using the Paste functionality.")
 
+    def onPasteMultiClipboard(self, mode):
+        if not PCHelper.checkCurrentGraph():
+            return
+        nodes = self.sdUiMgr.getCurrentGraphSelectedNodes()
+        multiClipboard = PCCopier.instance().currentMultiClipboard
+        if not multiClipboard:
+            PCHelper.displayErrorMsg("No multiple node clipboard: please first copy a selection of several nodes.")
+        elif not nodes or nodes.getSize() == 0:
+            PCHelper.displayErrorMsg("No Selection: please select the nodes to paste into.")
+        else:
+            assignment = multiClipboard.assign(nodes, mode)
+            if len(assignment) == 0:
+                PCHelper.displayErrorMsg("None of the selected nodes has the type of a copied node, nothing to paste.")
+                return
+            prefs = PCPrefs.instance()
+            stats = PCWriteStats()
+            multiClipboard.paste(assignment, prefs.skipUnchangedWrites, stats)
+            pclog.log("Paste (matching " + mode + "): " + str(len(assignment)) + " node(s) matched, " + str(nodes.getSize() - len(assignment)) +
+                " left unmatched, " + stats.summary())
+            if prefs.computeGraphAfterPaste:
+                PCComputeScheduler.instance().requestCurrentGraphCompute()
+
+    def onPastePresetSlot(self, slot):
+        presetName = PCPastePresets.instance().slotName(slot)
+        if presetName:
+            self.onPastePreset(presetName)
+        else:
+            PCHelper.displayErrorMsg("No preset assigned to quick paste slot " + str(slot + 1) + ", please assign one from the Paste window.")
+
+    def onPastePresetMenu(self, menu):
+        # lists the presets applicable to the current clipboard
+        menu.clear()
+        clipboard = PCCopier.instance().currentClipboard
+        presets = PCPastePresets.instance().applicablePresets(clipboard) if clipboard else []
+        for preset in presets:
+            action = menu.addAction(preset.name + ("" if preset.isGlobal() else " (" + preset.defKey[1] + ")"))
+            action.triggered.connect(partial(self.onPastePreset, preset.name))
+        if len(presets) == 0:
+            menu.addAction("No preset for the current clipboard").setEnabled(False)
+
+    def onPastePreset(self, presetName):
+        if not PCHelper.checkCurrentGraph():
+            return
+        nodes = self.sdUiMgr.getCurrentGraphSelectedNodes()
+        clipboard = PCCopier.instance().currentClipboard
+        preset = PCPastePresets.instance().get(presetName)
+        if not clipboard:
+            PCHelper.displayErrorMsg("No clipboard data: please first copy node parameters before using the Paste functionality.")
+        elif not nodes or nodes.getSize() == 0:
+            PCHelper.displayErrorMsg("No Selection: please select a node to use the Paste Parameters functionalty.")
+        elif not preset:
+            PCHelper.displayErrorMsg("Paste preset " + presetName + " no longer exists.")
+        elif not preset.isApplicableTo(clipboard):
+            PCHelper.displayErrorMsg("Paste preset " + presetName + " is specific to another node type than the current clipboard one.")
+        else:
+            prefs = PCPrefs.instance()
+            stats = PCWriteStats()
+            PCPastePresets.instance().paste(preset, clipboard, nodes, prefs.skipUnchangedWrites, stats)
+            pclog.log("Paste preset " + presetName + ": " + stats.summary())
+            if prefs.computeGraphAfterPaste:
+                PCComputeScheduler.instance().requestCurrentGraphCompute()
+
     def onStoreNodeStates(self):
         if not PCHelper.checkCurrentGraph():
             return
@@ -281,6 +453,25 @@ class PCUIMgr(QObject):
         else:
             PCHelper.displayErrorMsg("There are currently no Variation being stored.")
 
+    def onRecallSlot(self, slot):
+        if not PCHelper.checkCurrentGraph():
+            return
+        prefs = PCPrefs.instance()
+        stats = PCWriteStats()
+        misses = PCRecallSlots.instance().recall(slot, prefs.skipUnchangedWrites, stats)
+        if misses == -1:
+            PCHelper.displayErrorMsg("No variation assigned to quick recall slot " + str(slot + 1) + ", please assign one from the Variations window.")
+            return
+        if misses == -2:
+            PCHelper.displayErrorMsg("Variation " + PCRecallSlots.instance().slotName(slot) + " of quick recall slot " + str(slot + 1) + " could not be loaded from the library, nothing has been recalled.")
+            return
+        msg = "Quick recall slot " + str(slot + 1) + " (" + PCRecallSlots.instance().slotName(slot) + "): " + stats.summary()
+        if misses > 0:
+            msg += ", " + str(misses) + " node(s) not found"
+        pclog.log(msg)
+        if prefs.computeGraphAfterVariationRecall:
+            PCComputeScheduler.instance().requestCurrentGraphCompute()
+
     def onRollRandomSeeds(self):
         if not PCHelper.checkCurrentGraph():
             return
@@ -299,15 +490,70 @@ class PCUIMgr(QObject):
                 proceed = PCHelper.askYesNoQuestion(msg)
 
             if proceed:
-                for n in range(0, nodeCount):
-                    node = nodes.getItem(n)
-                    valInt = random.randint(0,9999)
-                    node.setInputPropertyValueFromId("$randomseed", SDValueInt.sNew(valInt))
+                stats = PCSeedRoller.instance().roll([nodes.getItem(n) for n in range(0, nodeCount)], PCHelper.getCurrentGraph())
+                pclog.log("Roll Random Seeds: " + stats.summary())
         else:
             PCHelper.displayErrorMsg("No Selection: please select a node to use the Roll Random Seeds functionalty.")
         
         if prefs.computeGraphAfterRSRoll:
-            PCHelper.computeCurrentGraph()
+            PCComputeScheduler.instance().requestCurrentGraphCompute()
+
+    def onRerollRandomSeeds(self):
+        roller = PCSeedRoller.instance()
+        if roller.canReroll():
+            stats, misses = roller.reroll()
+            self.onSeedHistoryApplied("Re-roll Random Seeds", stats, misses)
+        else:
+            PCHelper.displayErrorMsg("There is no random seed roll to replay.")
+
+    def onStepBackRandomSeeds(self):
+        roller = PCSeedRoller.instance()
+        if roller.canStepBack():
+            stats, misses = roller.stepBack()
+            self.onSeedHistoryApplied("Step Back Random Seeds", stats, misses)
+        else:
+            PCHelper.displayErrorMsg("Beginning of the random seed history reached.")
+
+    def onSeedHistoryApplied(self, operationName, stats, misses):
+        msg = operationName + ": " + stats.summary()
+        if misses > 0:
+            msg += ", " + str(misses) + " node(s) not found"
+        pclog.log(msg)
+        if PCPrefs.instance().computeGraphAfterRSRoll:
+            PCComputeScheduler.instance().requestCurrentGraphCompute()
+
+    def onRandomizeParams(self):
+        if not PCHelper.checkCurrentGraph():
+            return
+        nodes = self.sdUiMgr.getCurrentGraphSelectedNodes()
+        if nodes and nodes.getSize() > 0:
+            if not self.randomizeDlg:
+                self.randomizeDlg = PCRandomizeDlg(self.sdUiMgr.getMainWindow())
+            self.randomizeDlg.show(nodes)
+        else:
+            PCHelper.displayErrorMsg("No Selection: please select one or more nodes to use the Randomize Parameters functionalty.")
+
+    def onSweepParams(self):
+        if not PCHelper.checkCurrentGraph():
+            return
+        nodes = self.sdUiMgr.getCurrentGraphSelectedNodes()
+        if nodes and nodes.getSize() > 0:
+            if not self.sweepDlg:
+                self.sweepDlg = PCSweepDlg(self.sdUiMgr.getMainWindow())
+            self.sweepDlg.show(nodes, PCHelper.getCurrentGraph())
+        else:
+            PCHelper.displayErrorMsg("No Selection: please select one or more nodes to use the Parameter Sweep functionalty.")
+
+    def onUndo(self):
+        if PCUndoMgr.sdUndoGroupClass():
+            PCHelper.displayInfoMsg("ParamCopy operations are recorded as single entries in the Designer history,\nplease use Designer's Undo to revert them.")
+        else:
+            operationName = PCUndoMgr.instance().undoLast()
+            if operationName:
+                pclog.log("Undone: " + operationName)
+                PCComputeScheduler.instance().requestCurrentGraphCompute()
+            else:
+                PCHelper.displayErrorMsg("There is no ParamCopy operation to undo.")
 
     def onInspector(self):
         if not PCHelper.checkCurrentGraph():
@@ -24,15 +24,15 @@ class PCPrefsDlg(QtWidgets.QDialog):
         self.setObjectName("PCPrefsDlg")
         self.setWindowFlags(self.windowFlags() & ~Qt.WindowContextHelpButtonHint) # remove the Help icon in title bar
         self.setWindowTitle(PCData.APP_NAME + " - Preferences")
-        self.setFixedSize(571, 436)
+        self.setFixedSize(571, 522)
 
         self.bb_ok_cancel = QtWidgets.QDialogButtonBox(self)
-        self.bb_ok_cancel.setGeometry(QtCore.QRect(220, 400, 341, 32))
+        self.bb_ok_cancel.setGeometry(QtCore.QRect(220, 486, 341, 32))
         self.bb_ok_cancel.setOrientation(QtCore.Qt.Horizontal)
         self.bb_ok_cancel.setStandardButtons(QtWidgets.QDialogButtonBox.Cancel|QtWidgets.QDialogButtonBox.Ok)
         self.bb_ok_cancel.setObjectName("bb_ok_cancel")
         self.gp_compute = QtWidgets.QGroupBox(self)
-        self.gp_compute.setGeometry(QtCore.QRect(10, 10, 551, 220))
+        self.gp_compute.setGeometry(QtCore.QRect(10, 10, 551, 278))
         self.gp_compute.setObjectName("gp_compute")
         self.l_compute_desc = QtWidgets.QLabel(self.gp_compute)
         self.l_compute_desc.setGeometry(QtCore.QRect(10, 25, 531, 85))
@@ -48,14 +48,36 @@ class PCPrefsDlg(QtWidgets.QDialog):
         self.chk_compute_on_roll.setGeometry(QtCore.QRect(10, 180, 350, 20))
         self.chk_compute_on_roll.setToolTip("")
         self.chk_compute_on_roll.setObjectName("chk_compute_on_roll")
+        self.chk_compute_on_sweep = QtWidgets.QCheckBox(self.gp_compute)
+        self.chk_compute_on_sweep.setGeometry(QtCore.QRect(10, 208, 350, 20))
+        self.chk_compute_on_sweep.setObjectName("chk_compute_on_sweep")
+        self.l_compute_budget = QtWidgets.QLabel(self.gp_compute)
+        self.l_compute_budget.setGeometry(QtCore.QRect(10, 240, 215, 20))
+        self.l_compute_budget.setObjectName("l_compute_budget")
+        self.sb_compute_budget = QtWidgets.QSpinBox(self.gp_compute)
+        self.sb_compute_budget.setGeometry(QtCore.QRect(225, 240, 81, 20))
+        self.sb_compute_budget.setRange(0, 600000)
+        self.sb_compute_budget.setSuffix(" ms")
+        self.sb_compute_budget.setObjectName("sb_compute_budget")
+        self.l_compute_idle = QtWidgets.QLabel(self.gp_compute)
+        self.l_compute_idle.setGeometry(QtCore.QRect(315, 240, 130, 20))
+        self.l_compute_idle.setObjectName("l_compute_idle")
+        self.sb_compute_idle = QtWidgets.QSpinBox(self.gp_compute)
+        self.sb_compute_idle.setGeometry(QtCore.QRect(445, 240, 81, 20))
+        self.sb_compute_idle.setRange(0, 600000)
+        self.sb_compute_idle.setSuffix(" ms")
+        self.sb_compute_idle.setObjectName("sb_compute_idle")
         self.chk_optional_confirm = QtWidgets.QCheckBox(self)
-        self.chk_optional_confirm.setGeometry(QtCore.QRect(310, 360, 191, 23))
+        self.chk_optional_confirm.setGeometry(QtCore.QRect(310, 418, 191, 23))
         self.chk_optional_confirm.setObjectName("chk_optional_confirm")
         self.chk_copy_select_all = QtWidgets.QCheckBox(self)
-        self.chk_copy_select_all.setGeometry(QtCore.QRect(20, 360, 260, 23))
+        self.chk_copy_select_all.setGeometry(QtCore.QRect(20, 418, 260, 23))
         self.chk_copy_select_all.setObjectName("chk_copy_select_all")
+        self.chk_skip_unchanged = QtWidgets.QCheckBox(self)
+        self.chk_skip_unchanged.setGeometry(QtCore.QRect(20, 446, 400, 23))
+        self.chk_skip_unchanged.setObjectName("chk_skip_unchanged")
         self.gb_shortcuts = QtWidgets.QGroupBox(self)
-        self.gb_shortcuts.setGeometry(QtCore.QRect(10, 225, 551, 131))
+        self.gb_shortcuts.setGeometry(QtCore.QRect(10, 283, 551, 131))
         self.gb_shortcuts.setObjectName("gb_shortcuts")
         self.l_shc_copy_marams = QtWidgets.QLabel(self.gb_shortcuts)
         self.l_shc_copy_marams.setGeometry(QtCore.QRect(10, 30, 101, 20))
@@ -97,8 +119,16 @@ class PCPrefsDlg(QtWidgets.QDialog):
         self.le_shc_show_var.setGeometry(QtCore.QRect(400, 60, 131, 20))
         self.le_shc_show_var.setText("")
         self.le_shc_show_var.setObjectName("le_shc_show_var")
+        self.l_shc_undo = QtWidgets.QLabel(self.gb_shortcuts)
+        self.l_shc_undo.setGeometry(QtCore.QRect(290, 90, 101, 20))
+        self.l_shc_undo.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
+        self.l_shc_undo.setObjectName("l_shc_undo")
+        self.le_shc_undo = QtWidgets.QLineEdit(self.gb_shortcuts)
+        self.le_shc_undo.setGeometry(QtCore.QRect(400, 90, 131, 20))
+        self.le_shc_undo.setText("")
+        self.le_shc_undo.setObjectName("le_shc_undo")
         self.l_version = QtWidgets.QLabel(self)
-        self.l_version.setGeometry(QtCore.QRect(20, 400, 201, 16))
+        self.l_version.setGeometry(QtCore.QRect(20, 486, 201, 16))
         self.l_version.setObjectName("l_version")
 
         self.gp_compute.setTitle(QtWidgets.QApplication.translate("PCPrefsDlg", "Graph Computation", None, -1))
@@ -106,10 +136,16 @@ class PCPrefsDlg(QtWidgets.QDialog):
         self.chk_compute_on_paste.setText(QtWidgets.QApplication.translate("PCPrefsDlg", "Compute current graph after a Paste operation", None, -1))
         self.l_compute_desc.setText(QtWidgets.QApplication.translate("PCPrefsDlg", "The below options determine whether the current graph should be brought up to date (computed) after specific operations, so the effects are visible on the involved nodes. For large graphs, you may want to disable these options if computation takes too long or is not required. It is to be noted nodes for which computation is wanted need to be connected to an Output node, else these options will have no effect.", None, -1))
         self.chk_compute_on_var_recall.setText(QtWidgets.QApplication.translate("PCPrefsDlg", "Compute current graph after Variation recall", None, -1))
+        self.chk_compute_on_sweep.setText(QtWidgets.QApplication.translate("PCPrefsDlg", "Compute swept graph after each Parameter Sweep step", None, -1))
+        self.l_compute_budget.setText(QtWidgets.QApplication.translate("PCPrefsDlg", "Defer graphs computing longer than", None, -1))
+        self.l_compute_idle.setText(QtWidgets.QApplication.translate("PCPrefsDlg", "until user is idle for", None, -1))
+        self.sb_compute_budget.setToolTip(QtWidgets.QApplication.translate("PCPrefsDlg", "Graphs whose last computation took longer than this duration are only computed once the user\nhas been idle for the duration on the right. Set to 0 to always defer computation.", None, -1))
         self.chk_optional_confirm.setToolTip(QtWidgets.QApplication.translate("PCPrefsDlg", "Optional confirmation dialogs on write operations can be enabled/disabled with this option, they appear on certain occasions with a mention saying they can be disabled in Preferences.", None, -1))
         self.chk_optional_confirm.setText(QtWidgets.QApplication.translate("PCPrefsDlg", "Enable optional confirmations", None, -1))
         self.chk_copy_select_all.setToolTip(QtWidgets.QApplication.translate("PCPrefsDlg", "If enabled, the Copy Parameters dialog will select all parameters on opening, else none will be selected.", None, -1))
         self.chk_copy_select_all.setText(QtWidgets.QApplication.translate("PCPrefsDlg", "Select all parameters by default on Copy", None, -1))
+        self.chk_skip_unchanged.setToolTip(QtWidgets.QApplication.translate("PCPrefsDlg", "If enabled, Paste and Variation recall only write parameters whose value or inheritance method differ\nfrom the destination node ones, which avoids needless graph updates and history entries.", None, -1))
+        self.chk_skip_unchanged.setText(QtWidgets.QApplication.translate("PCPrefsDlg", "Only write parameters whose value differs on Paste/Recall", None, -1))
         self.gb_shortcuts.setTitle(QtWidgets.QApplication.translate("PCPrefsDlg", "Shortcuts", None, -1))
         self.l_shc_copy_marams.setText(QtWidgets.QApplication.translate("PCPrefsDlg", "Copy Params:", None, -1))
         self.le_shc_copy_params.setPlaceholderText(QtWidgets.QApplication.translate("PCPrefsDlg", "Key sequence", None, -1))
@@ -121,6 +157,8 @@ class PCPrefsDlg(QtWidgets.QDialog):
         self.l_shc_store_var.setText(QtWidgets.QApplication.translate("PCPrefsDlg", "Store Variation:", None, -1))
         self.l_shc_show_var.setText(QtWidgets.QApplication.translate("PCPrefsDlg", "Show Variations:", None, -1))
         self.le_shc_show_var.setPlaceholderText(QtWidgets.QApplication.translate("PCPrefsDlg", "Key sequence", None, -1))
+        self.l_shc_undo.setText(QtWidgets.QApplication.translate("PCPrefsDlg", "Undo Operation:", None, -1))
+        self.le_shc_undo.setPlaceholderText(QtWidgets.QApplication.translate("PCPrefsDlg", "Key sequence", None, -1))
 
         self.l_version.setText(PCData.APP_NAME + " v" + PCData.VERSION)
 
@@ -132,14 +170,19 @@ class PCPrefsDlg(QtWidgets.QDialog):
         self.chk_compute_on_roll.setCheckState(Qt.Checked if prefs.computeGraphAfterRSRoll else Qt.Unchecked)
         self.chk_compute_on_paste.setCheckState(Qt.Checked if prefs.computeGraphAfterPaste else Qt.Unchecked)
         self.chk_compute_on_var_recall.setCheckState(Qt.Checked if prefs.computeGraphAfterVariationRecall else Qt.Unchecked)
+        self.chk_compute_on_sweep.setCheckState(Qt.Checked if prefs.computeGraphAfterSweep else Qt.Unchecked)
         self.chk_optional_confirm.setCheckState(Qt.Checked if prefs.optionalConfirmations else Qt.Unchecked)
         self.chk_copy_select_all.setCheckState(Qt.Checked if prefs.copyDlgSelectAll else Qt.Unchecked)
+        self.chk_skip_unchanged.setCheckState(Qt.Checked if prefs.skipUnchangedWrites else Qt.Unchecked)
+        self.sb_compute_budget.setValue(prefs.computeBudgetMs)
+        self.sb_compute_idle.setValue(prefs.computeIdleDelayMs)
 
         self.le_shc_copy_params.setText(prefs.copyParamsShortcut)
         self.le_shc_paste_params.setText(prefs.pasteParamsShortcut)
         self.le_shc_roll_seeds.setText(prefs.rollRandomSeedsShortcut)
         self.le_shc_store_var.setText(prefs.storeVariationShortcut)
         self.le_shc_show_var.setText(prefs.showVariationsShortcut)
+        self.le_shc_undo.setText(prefs.undoShortcut)
 
         super().show()
 
@@ -148,20 +191,26 @@ class PCPrefsDlg(QtWidgets.QDialog):
         prefs.computeGraphAfterRSRoll = self.chk_compute_on_roll.checkState() == Qt.Checked
         prefs.computeGraphAfterPaste = self.chk_compute_on_paste.checkState() == Qt.Checked
         prefs.computeGraphAfterVariationRecall = self.chk_compute_on_var_recall.checkState() == Qt.Checked
+        prefs.computeGraphAfterSweep = self.chk_compute_on_sweep.checkState() == Qt.Checked
         prefs.optionalConfirmations = self.chk_optional_confirm.checkState() == Qt.Checked
         prefs.copyDlgSelectAll = self.chk_copy_select_all.checkState() == Qt.Checked
+        prefs.skipUnchangedWrites = self.chk_skip_unchanged.checkState() == Qt.Checked
+        prefs.computeBudgetMs = self.sb_compute_budget.value()
+        prefs.computeIdleDelayMs = self.sb_compute_idle.value()
 
         prefs.copyParamsShortcut = self.le_shc_copy_params.text()
         prefs.pasteParamsShortcut = self.le_shc_paste_params.text()
         prefs.rollRandomSeedsShortcut = self.le_shc_roll_seeds.text()
         prefs.storeVariationShortcut = self.le_shc_store_var.text()
         prefs.showVariationsShortcut = self.le_shc_show_var.text()
+        prefs.undoShortcut = self.le_shc_undo.text()
 
         self.le_shc_copy_params.setText(prefs.copyParamsShortcut)
         self.le_shc_paste_params.setText(prefs.pasteParamsShortcut)
         self.le_shc_roll_seeds.setText(prefs.rollRandomSeedsShortcut)
         self.le_shc_store_var.setText(prefs.storeVariationShortcut)
         self.le_shc_show_var.setText(prefs.showVariationsShortcut)
+        self.le_shc_undo.setText(prefs.undoShortcut)
 
         from paramcopy.pcui.pcuimgr import PCUIMgr
         pcUIMgr = PCUIMgr.instance()
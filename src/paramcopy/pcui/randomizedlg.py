@@ -0,0 +1,130 @@
+# ---------------
+# ParamCopy - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+import random
+
+import sd
+if sd.getContext().getSDApplication().getVersion() < "14.0.0":
+    from PySide2 import QtCore, QtWidgets
+    from PySide2.QtCore import Qt
+else:
+    from PySide6 import QtCore, QtWidgets
+    from PySide6.QtCore import Qt
+
+from paramcopy.pccore import pclog
+from paramcopy.pccore.pcdata import PCData
+from paramcopy.pccore.pchelper import PCHelper
+from paramcopy.pccore.pcprefs import PCPrefs
+from paramcopy.pccore.pcrandomizer import PCRandomizer
+from paramcopy.pccore.pcstatemgr import PCStateMgr, PCNodeStateSet
+from paramcopy.pccore.pccomputesched import PCComputeScheduler
+
+class PCRandomizeDlg(QtWidgets.QDialog):
+    MAX_SEED = 2147483647 # QSpinBox range limit
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.nodeArray = None
+        self.setupStaticFields()
+
+    def setupStaticFields(self):
+        self.setObjectName("PCRandomizeDlg")
+        self.setWindowFlags(self.windowFlags() & ~Qt.WindowContextHelpButtonHint) # remove the Help icon in title bar
+        self.setWindowTitle(PCData.APP_NAME + " - Randomize Parameters")
+        self.resize(460, 420)
+        self.setModal(True)
+
+        self.verticalLayout = QtWidgets.QVBoxLayout(self)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.l_desc = QtWidgets.QLabel(self)
+        self.l_desc.setWordWrap(True)
+        self.l_desc.setObjectName("l_desc")
+        self.verticalLayout.addWidget(self.l_desc)
+        self.lw_params = QtWidgets.QListWidget(self)
+        self.lw_params.setObjectName("lw_params")
+        self.verticalLayout.addWidget(self.lw_params)
+        self.hl_seed = QtWidgets.QHBoxLayout()
+        self.hl_seed.setObjectName("hl_seed")
+        self.l_seed = QtWidgets.QLabel(self)
+        self.l_seed.setObjectName("l_seed")
+        self.hl_seed.addWidget(self.l_seed)
+        self.sb_seed = QtWidgets.QSpinBox(self)
+        self.sb_seed.setRange(0, PCRandomizeDlg.MAX_SEED)
+        self.sb_seed.setObjectName("sb_seed")
+        self.hl_seed.addWidget(self.sb_seed)
+        self.b_new_seed = QtWidgets.QPushButton(self)
+        self.b_new_seed.setObjectName("b_new_seed")
+        self.hl_seed.addWidget(self.b_new_seed)
+        self.verticalLayout.addLayout(self.hl_seed)
+        self.le_variation_name = QtWidgets.QLineEdit(self)
+        self.le_variation_name.setObjectName("le_variation_name")
+        self.verticalLayout.addWidget(self.le_variation_name)
+        self.bb_ok_cancel = QtWidgets.QDialogButtonBox(self)
+        self.bb_ok_cancel.setOrientation(QtCore.Qt.Horizontal)
+        self.bb_ok_cancel.setStandardButtons(QtWidgets.QDialogButtonBox.Cancel|QtWidgets.QDialogButtonBox.Ok)
+        self.bb_ok_cancel.setObjectName("bb_ok_cancel")
+        self.verticalLayout.addWidget(self.bb_ok_cancel)
+
+        self.l_desc.setText(QtWidgets.QApplication.translate("PCRandomizeDlg", "Numeric specific parameters having a min/max range. Checked parameters of the selected nodes are set to random values within their range.", None, -1))
+        self.l_seed.setText(QtWidgets.QApplication.translate("PCRandomizeDlg", "Seed:", None, -1))
+        self.sb_seed.setToolTip(QtWidgets.QApplication.translate("PCRandomizeDlg", "A same seed gives the same values for the same nodes and parameters, seeds and values are logged", None, -1))
+        self.b_new_seed.setText(QtWidgets.QApplication.translate("PCRandomizeDlg", "New Seed", None, -1))
+        self.le_variation_name.setPlaceholderText(QtWidgets.QApplication.translate("PCRandomizeDlg", "Store result as variation (optional)", None, -1))
+
+        self.b_new_seed.clicked.connect(self.onNewSeed)
+        self.bb_ok_cancel.rejected.connect(self.onClose)
+        self.bb_ok_cancel.accepted.connect(self.onOK)
+
+    def show(self, nodeArray):
+        self.nodeArray = nodeArray
+        self.lw_params.clear()
+        for propMeta in PCRandomizer.randomizableProps(self.nodes()):
+            encodedMin, encodedMax, _ = propMeta.valueRange
+            item = QtWidgets.QListWidgetItem(propMeta.name + "  [" + str(encodedMin[1]) + ", " + str(encodedMax[1]) + "]", self.lw_params)
+            item.setToolTip(propMeta.id)
+            item.setData(Qt.UserRole, propMeta.id)
+            item.setCheckState(Qt.Unchecked)
+        self.onNewSeed()
+        self.le_variation_name.clear()
+        super().show()
+
+    def nodes(self):
+        return [self.nodeArray.getItem(n) for n in range(0, self.nodeArray.getSize())]
+
+    def onNewSeed(self):
+        self.sb_seed.setValue(random.SystemRandom().randint(0, PCRandomizeDlg.MAX_SEED))
+
+    def onOK(self):
+        propertyIds = [self.lw_params.item(i).data(Qt.UserRole) for i in range(0, self.lw_params.count()) \
+                       if self.lw_params.item(i).checkState() == Qt.Checked]
+        if len(propertyIds) == 0:
+            PCHelper.displayErrorMsg("No parameter checked, nothing to randomize.", self)
+            return
+
+        randomizer = PCRandomizer(self.sb_seed.value())
+        randomizer.draw(self.nodes(), propertyIds)
+        randomizer.log()
+        stats = randomizer.write(PCPrefs.instance().skipUnchangedWrites)
+        pclog.log("Randomize parameters: " + stats.summary())
+
+        variationName = self.le_variation_name.text().strip()
+        if len(variationName) > 0:
+            stateMgr = PCStateMgr.instance()
+            if stateMgr.stateSetNameExists(variationName):
+                PCHelper.displayErrorMsg("A variation with this name already exists, result has not been stored.", self)
+            else:
+                graph = PCHelper.getCurrentGraph()
+                stateSet = PCNodeStateSet(graph, variationName)
+                stateSet.storeNodeStates(self.nodeArray, graph)
+                stateMgr.addStateSet(stateSet)
+                from paramcopy.pcui.pcuimgr import PCUIMgr
+                PCUIMgr.instance().onNodeStatesUpdated()
+
+        if PCPrefs.instance().computeGraphAfterRSRoll:
+            PCComputeScheduler.instance().requestCurrentGraphCompute()
+        self.close()
+
+    def onClose(self):
+        self.close()
@@ -18,15 +18,29 @@ else:
 from paramcopy.pccore import pclog
 from paramcopy.pccore.pcdata import PCData
 from paramcopy.pccore.pcstatemgr import PCStateMgr, PCNodeStateSet
+from paramcopy.pccore.pcvariationindex import PCVariationQuery
 from paramcopy.pccore.pchelper import PCHelper
 from paramcopy.pccore.pcprefs import PCPrefs
+from paramcopy.pccore.pcparam import PCWriteStats
+from paramcopy.pccore.pcnoderesolver import PCNodeResolver
+from paramcopy.pccore.pccomputesched import PCComputeScheduler
+from paramcopy.pccore.pcjob import PCJob
+from paramcopy.pccore.pcfingerprint import PCVariationMatch
+from paramcopy.pccore.pcrecallmerge import PCRecallMerge
+from paramcopy.pccore.pcrecallslots import PCRecallSlots
+from paramcopy.pccore.pcblend import PCVariationBlend
+from paramcopy.pccore.pcundo import PCUndoGroup
+from paramcopy.pccore.pcinputlock import PCInputLock
 
 class PCStatesTreeWidget(QtWidgets.QTreeWidget):
+    MATCH_COLUMN = 2
+
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setHeaderLabels(("Variation Name", "Nodes", "Context"))
+        self.setHeaderLabels(("Variation Name", "Nodes", "Match", "Context"))
         self.header().resizeSection(0,230)
         self.header().resizeSection(1,40)
+        self.header().resizeSection(2,50)
         #self.setDragEnabled(True)
         #self.setDragDropMode(QAbstractItemView.InternalMove)
         #elf.setAcceptDrops(True)
@@ -43,7 +57,7 @@ class PCStatesTreeWidget(QtWidgets.QTreeWidget):
         treeItem.setText(0, nodeStateSet.name)
 
         # Node count
-        treeItem.setText(1, str(len(nodeStateSet.nodeStates)))
+        treeItem.setText(1, str(nodeStateSet.nodeCount()))
 
         # Context
         contextPath = "PACKAGE: "
@@ -53,7 +67,14 @@ class PCStatesTreeWidget(QtWidgets.QTreeWidget):
             contextPath += "(no name)"
 
         contextPath += " > GRAPH: " + nodeStateSet.graphName
-        treeItem.setText(2, contextPath)
+        treeItem.setText(3, contextPath)
+
+    def setVariationMatch(self, treeItem, variationMatch):
+        treeItem.setText(PCStatesTreeWidget.MATCH_COLUMN, variationMatch.label())
+        toolTip = str(variationMatch.matchedParams) + " of " + str(variationMatch.totalParams) + " parameter(s) match the graph"
+        if variationMatch.missingNodes > 0:
+            toolTip += ", " + str(variationMatch.missingNodes) + " node(s) not found"
+        treeItem.setToolTip(PCStatesTreeWidget.MATCH_COLUMN, toolTip)
 
     # def dragEnterEvent(self, event):
     #     self.draggedItem = self.currentItem()
@@ -73,9 +94,29 @@ class PCStatesTreeWidget(QtWidgets.QTreeWidget):
     #             dParent.insertChild(droppedIndex.row(), self.draggedItem)
 
 class PCStatesDlg(QtWidgets.QDialog):
+    PAGE_SIZE = 200 # variations listed per page
+    BLEND_STEPS = 1000 # blend slider resolution
+
+    # scope combo box entries
+    SCOPE_ALL = 0
+    SCOPE_PACKAGE = 1
+    SCOPE_GRAPH = 2
+    SCOPE_SELECTED_NODES = 3
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.treeWidget = PCStatesTreeWidget(self)
+        self.job = None
+        self.matchJob = None # matches listed variations against the graph in idle time
+        self.blend = None # PCVariationBlend of the checked variations, built on first slider move
+        self.blendUndoGroup = None # open while the blend slider is dragged
+        self.blendInputLock = None # discards input outside the slider while the blend undo group is open
+        self.blendTimer = QTimer()
+        self.blendTimer.setSingleShot(True)
+        self.blendTimer.timeout.connect(self.flushBlend)
+        self.stats = None
+        self.page = 0
+        self.pageCount = 1
         self.setupStaticFields()
 
     def setupStaticFields(self):
@@ -87,6 +128,41 @@ class PCStatesDlg(QtWidgets.QDialog):
 
         self.verticalLayout = QtWidgets.QVBoxLayout(self)
         self.verticalLayout.setObjectName("verticalLayout")
+        self.hl_filter = QtWidgets.QHBoxLayout()
+        self.hl_filter.setObjectName("hl_filter")
+        self.cb_scope = QtWidgets.QComboBox(self)
+        self.cb_scope.setObjectName("cb_scope")
+        self.hl_filter.addWidget(self.cb_scope)
+        self.le_name_filter = QtWidgets.QLineEdit(self)
+        self.le_name_filter.setObjectName("le_name_filter")
+        self.hl_filter.addWidget(self.le_name_filter)
+        self.le_param_filter = QtWidgets.QLineEdit(self)
+        self.le_param_filter.setObjectName("le_param_filter")
+        self.hl_filter.addWidget(self.le_param_filter)
+        self.b_prev_page = QtWidgets.QPushButton(self)
+        self.b_prev_page.setMaximumSize(QtCore.QSize(30, 16777215))
+        self.b_prev_page.setObjectName("b_prev_page")
+        self.hl_filter.addWidget(self.b_prev_page)
+        self.l_page = QtWidgets.QLabel(self)
+        self.l_page.setAlignment(QtCore.Qt.AlignCenter)
+        self.l_page.setMinimumSize(QtCore.QSize(60, 0))
+        self.l_page.setObjectName("l_page")
+        self.hl_filter.addWidget(self.l_page)
+        self.b_next_page = QtWidgets.QPushButton(self)
+        self.b_next_page.setMaximumSize(QtCore.QSize(30, 16777215))
+        self.b_next_page.setObjectName("b_next_page")
+        self.hl_filter.addWidget(self.b_next_page)
+        self.verticalLayout.addLayout(self.hl_filter)
+        self.hl_blend = QtWidgets.QHBoxLayout()
+        self.hl_blend.setObjectName("hl_blend")
+        self.l_blend = QtWidgets.QLabel(self)
+        self.l_blend.setObjectName("l_blend")
+        self.hl_blend.addWidget(self.l_blend)
+        self.hs_blend = QtWidgets.QSlider(QtCore.Qt.Horizontal, self)
+        self.hs_blend.setRange(0, PCStatesDlg.BLEND_STEPS)
+        self.hs_blend.setObjectName("hs_blend")
+        self.hl_blend.addWidget(self.hs_blend)
+        self.verticalLayout.addLayout(self.hl_blend)
         self.l_status = QtWidgets.QLabel(self)
         self.l_status.setMinimumSize(QtCore.QSize(0, 30))
         self.l_status.setAlignment(QtCore.Qt.AlignCenter)
@@ -105,27 +181,56 @@ class PCStatesDlg(QtWidgets.QDialog):
         self.b_del_all = QtWidgets.QPushButton(self.gp_operations)
         self.b_del_all.setGeometry(QtCore.QRect(310, 10, 111, 23))
         self.b_del_all.setObjectName("b_del_all")
+        self.b_assign_slot = QtWidgets.QPushButton(self.gp_operations)
+        self.b_assign_slot.setGeometry(QtCore.QRect(460, 10, 111, 23))
+        self.b_assign_slot.setObjectName("b_assign_slot")
         self.verticalLayout.addWidget(self.gp_operations)
         self.bb_close = QtWidgets.QDialogButtonBox(self)
         self.bb_close.setOrientation(QtCore.Qt.Horizontal)
         self.bb_close.setStandardButtons(QtWidgets.QDialogButtonBox.Close)
         self.bb_close.setObjectName("bb_close")
+        self.b_abort = self.bb_close.addButton("Abort", QtWidgets.QDialogButtonBox.ActionRole)
+        self.b_abort.setVisible(False)
         self.verticalLayout.addWidget(self.bb_close)
 
         self.l_status.setText(QtWidgets.QApplication.translate("PCStatesDlg", "", None, -1))
         self.b_recall.setText(QtWidgets.QApplication.translate("PCStatesDlg", "Recall Variation(s)", None, -1))
         self.b_del.setText(QtWidgets.QApplication.translate("PCStatesDlg", "Delete Variation(s)", None, -1))
         self.b_del_all.setText(QtWidgets.QApplication.translate("PCStatesDlg", "Delete All", None, -1))
+        self.b_assign_slot.setText(QtWidgets.QApplication.translate("PCStatesDlg", "Assign to Slot...", None, -1))
+        self.cb_scope.addItem(QtWidgets.QApplication.translate("PCStatesDlg", "All variations", None, -1))
+        self.cb_scope.addItem(QtWidgets.QApplication.translate("PCStatesDlg", "Current package", None, -1))
+        self.cb_scope.addItem(QtWidgets.QApplication.translate("PCStatesDlg", "Current graph", None, -1))
+        self.cb_scope.addItem(QtWidgets.QApplication.translate("PCStatesDlg", "Selected node(s)", None, -1))
+        self.le_name_filter.setPlaceholderText(QtWidgets.QApplication.translate("PCStatesDlg", "Variation name", None, -1))
+        self.le_param_filter.setPlaceholderText(QtWidgets.QApplication.translate("PCStatesDlg", "Parameter id, i.e. $outputsize", None, -1))
+        self.b_prev_page.setText(QtWidgets.QApplication.translate("PCStatesDlg", "<", None, -1))
+        self.b_next_page.setText(QtWidgets.QApplication.translate("PCStatesDlg", ">", None, -1))
+        self.l_blend.setText(QtWidgets.QApplication.translate("PCStatesDlg", "Blend checked variations:", None, -1))
+        if not PCVariationBlend.isAvailable():
+            self.hs_blend.setEnabled(False)
+            self.hs_blend.setToolTip(QtWidgets.QApplication.translate("PCStatesDlg", "Variation blending requires NumPy", None, -1))
 
         self.setupDynamicFields()
 
         self.b_recall.clicked.connect(self.onRecall)
         self.b_del.clicked.connect(self.onDelete)
         self.b_del_all.clicked.connect(self.onDeleteAll)
+        self.b_assign_slot.clicked.connect(self.onAssignSlot)
+        self.b_abort.clicked.connect(self.onAbort)
         self.bb_close.rejected.connect(self.onClose)
+        self.cb_scope.currentIndexChanged.connect(self.onFilterChanged)
+        self.le_name_filter.textChanged.connect(self.onFilterChanged)
+        self.le_param_filter.textChanged.connect(self.onFilterChanged)
+        self.b_prev_page.clicked.connect(self.onPrevPage)
+        self.b_next_page.clicked.connect(self.onNextPage)
+        self.treeWidget.itemChanged.connect(self.onItemChanged)
+        self.hs_blend.valueChanged.connect(self.onBlendChanged)
+        self.hs_blend.sliderPressed.connect(self.onBlendPressed)
+        self.hs_blend.sliderReleased.connect(self.onBlendReleased)
 
     def setupDynamicFields(self):
-         self.verticalLayout.insertWidget(0, self.treeWidget)
+         self.verticalLayout.insertWidget(1, self.treeWidget)
 
     def show(self):
         self.populate()
@@ -138,10 +243,75 @@ class PCStatesDlg(QtWidgets.QDialog):
         self.setStatus("")
 
     def populate(self):
+        self.cancelMatchScan()
+        self.resetBlend()
         self.treeWidget.clear()
         stateMgr = PCStateMgr.instance()
-        for nodeStateSet in stateMgr.nodeStateSets.values():
+        nodeStateSets, total = stateMgr.queryStateSets(self.buildQuery(), self.page * PCStatesDlg.PAGE_SIZE, PCStatesDlg.PAGE_SIZE)
+        for nodeStateSet in nodeStateSets:
             self.treeWidget.addNodeStateSet(nodeStateSet)
+
+        self.pageCount = max(1, (total + PCStatesDlg.PAGE_SIZE - 1) // PCStatesDlg.PAGE_SIZE)
+        if self.page >= self.pageCount: # last page got emptied
+            self.page = self.pageCount - 1
+            self.populate()
+            return
+        self.l_page.setText(str(self.page + 1) + "/" + str(self.pageCount))
+        self.l_page.setToolTip(str(total) + " variation(s)")
+        self.b_prev_page.setEnabled(self.page > 0)
+        self.b_next_page.setEnabled(self.page < self.pageCount - 1)
+        self.startMatchScan()
+
+    def startMatchScan(self):
+        # variations are matched one per step, live node parameters being cached across scans (see PCLiveFingerprints)
+        self.cancelMatchScan()
+        if not PCPrefs.instance().variationMatchScan:
+            return
+        treeItems = []
+        iter = QTreeWidgetItemIterator(self.treeWidget)
+        while iter.value():
+            treeItems.append(iter.value())
+            iter += 1
+        resolver = PCNodeResolver()
+        self.matchJob = PCJob("Matching", treeItems, lambda treeItem: self.treeWidget.setVariationMatch(treeItem, \
+                                treeItem.data(0, Qt.UserRole).match(resolver)), itemName = "variation")
+        self.matchJob.start()
+
+    def cancelMatchScan(self):
+        if self.matchJob and self.matchJob.isRunning():
+            self.matchJob.cancel() # effective before next step, so no step runs on cleared tree items
+        self.matchJob = None
+
+    def buildQuery(self):
+        query = PCVariationQuery()
+        scope = self.cb_scope.currentIndex()
+        if scope != PCStatesDlg.SCOPE_ALL:
+            graph = PCHelper.getCurrentGraph()
+            query.packageId = PCHelper.getPackageId(graph.getPackage()) if graph else ""
+            if scope != PCStatesDlg.SCOPE_PACKAGE:
+                query.graphId = graph.getIdentifier() if graph else ""
+            if scope == PCStatesDlg.SCOPE_SELECTED_NODES:
+                nodes = sd.getContext().getSDApplication().getUIMgr().getCurrentGraphSelectedNodes()
+                query.nodeIds = [nodes.getItem(n).getIdentifier() for n in range(0, nodes.getSize())] if nodes else []
+                if len(query.nodeIds) == 0:
+                    query.nodeIds = [""] # no selection, nothing matches
+        query.nameFilter = self.le_name_filter.text().strip()
+        query.propertyId = self.le_param_filter.text().strip()
+        return query
+
+    def onFilterChanged(self):
+        self.page = 0
+        self.populate()
+
+    def onPrevPage(self):
+        if self.page > 0:
+            self.page -= 1
+            self.populate()
+
+    def onNextPage(self):
+        if self.page < self.pageCount - 1:
+            self.page += 1
+            self.populate()
     
     def onRecall(self):
         proceed = True
@@ -153,29 +323,66 @@ class PCStatesDlg(QtWidgets.QDialog):
             QTimer.singleShot(1, lambda:self.doRecall())
 
     def doRecall(self):
+        self.cancelMatchScan()
+        self.resetBlend()
         iter = QTreeWidgetItemIterator(self.treeWidget)
-        variationCount = 0
+        totalMisses = 0
+        merge = PCRecallMerge() # checked variations are merged in list order, the last one winning on overlapping parameters
         while iter.value():
             treeItem = iter.value()
             if treeItem.checkState(0) == Qt.Checked:
-                variationCount += 1
                 nodeStateSet = treeItem.data(0, Qt.UserRole)
-                misses = nodeStateSet.recallNodeStates()
+                misses = merge.add(nodeStateSet)
                 if misses > 0:
-                    PCHelper.displayInfoMsg("Partial variation recall, " + str(misses) + " node(s) could not be found and have not been restored.", self)
+                    totalMisses += misses
+                    PCHelper.displayInfoMsg("Partial variation recall, " + str(misses) + " node(s) could not be found and will not be restored.", self)
             iter += 1
-        
-        if misses > 0:
-            status = "Partial variation recall complete."
+        if merge.loadFailures:
+            PCHelper.displayErrorMsg("Variation(s) " + ", ".join(merge.loadFailures) + " could not be loaded from the library and will not be restored.", self)
+
+        self.stats = PCWriteStats()
+        skipUnchanged = PCPrefs.instance().skipUnchangedWrites
+        merge.logConflicts()
+        self.job = PCJob("Recalling", merge.steps(), lambda nodeWrite: PCRecallMerge.writeNode(nodeWrite, skipUnchanged, self.stats), undoName = "Variation Recall", inputOwner = self)
+        self.enableJobUI(True)
+        self.job.start(self.setStatus, lambda job: self.onRecallFinished(job, merge, totalMisses))
+
+    def onRecallFinished(self, job, merge, totalMisses):
+        self.enableJobUI(False)
+        summary = self.stats.summary()
+        conflictCount = merge.conflictCount()
+        if conflictCount > 0:
+            summary += ", " + str(conflictCount) + " conflict(s) resolved"
+        if job.isFailed() or job.isCancelled():
+            job.logDoneSteps(lambda nodeWrite: nodeWrite.nodeIdentifier.getName() + " (" + nodeWrite.nodeIdentifier.nodeId + ")")
+            status = job.interruptedText()
+        elif merge.loadFailures:
+            status = str(len(merge.loadFailures)) + " variation(s) could not be loaded, recall of the other ones complete (" + summary + ")."
+        elif totalMisses > 0:
+            status = "Partial variation recall complete (" + summary + ")."
         else:
-            status = str(variationCount) + " variation(s) successfully recalled!"
+            status = str(merge.variationCount) + " variation(s) successfully recalled (" + summary + ")."
         self.setStatus(status)
 
-        self.computeGraphIfNeeded()
+        if job.doneCount > 0:
+            self.computeGraphIfNeeded()
+        if self.isVisible():
+            self.startMatchScan() # recalled nodes are read again
+
+    def enableJobUI(self, jobRunning):
+        self.b_recall.setEnabled(not jobRunning)
+        self.b_del.setEnabled(not jobRunning) # recalled variations must not be deleted meanwhile
+        self.b_del_all.setEnabled(not jobRunning)
+        self.hs_blend.setEnabled(not jobRunning and PCVariationBlend.isAvailable()) # blend writes would be merged into the recall
+        self.b_abort.setVisible(jobRunning)
+
+    def onAbort(self):
+        if self.job and self.job.isRunning():
+            self.job.cancel()
 
     def computeGraphIfNeeded(self):
         if PCPrefs.instance().computeGraphAfterVariationRecall:
-            PCHelper.computeCurrentGraph()
+            PCComputeScheduler.instance().requestCurrentGraphCompute()
 
     def anySelected(self):
         iter = QTreeWidgetItemIterator(self.treeWidget)
@@ -202,18 +409,14 @@ class PCStatesDlg(QtWidgets.QDialog):
         if PCHelper.askYesNoQuestion("Delete selected variation(s)?", False, self):
             iter = QTreeWidgetItemIterator(self.treeWidget)
             pcStateMgr = PCStateMgr.instance()
-            indicesToDelete = []
             while iter.value():
                 treeItem = iter.value()
                 if treeItem.checkState(0) == Qt.Checked:
                     nodeStateSet = treeItem.data(0, Qt.UserRole)
-                    if pcStateMgr.deleteStateSet(nodeStateSet.name):
-                        indicesToDelete.append(self.treeWidget.indexOfTopLevelItem(treeItem))
+                    pcStateMgr.deleteStateSet(nodeStateSet.name)
                 iter += 1
 
-            for i in reversed(indicesToDelete): # need to delete from down to top as indices change after each removal
-                self.treeWidget.takeTopLevelItem(i)
-
+            self.populate() # next variations move up into the current page
             self.clearStatus()
 
     def onDeleteAll(self):
@@ -223,8 +426,126 @@ class PCStatesDlg(QtWidgets.QDialog):
             
         if PCHelper.askYesNoQuestion("Delete all variations?", False, self):
             PCStateMgr.instance().deleteAll()
-            self.treeWidget.clear()
+            self.page = 0
+            self.populate()
             self.clearStatus()
 
+    def onItemChanged(self, treeItem, column):
+        if column == 0:
+            self.resetBlend() # checked variations changed
+
+    def resetBlend(self):
+        self.blendTimer.stop()
+        self.endBlendUndo()
+        self.blend = None
+        self.hs_blend.blockSignals(True)
+        self.hs_blend.setValue(0)
+        self.hs_blend.blockSignals(False)
+
+    def blendWeights(self, variationCount):
+        # the slider goes through the checked variations in list order, blending each one with the next
+        position = self.hs_blend.value() / PCStatesDlg.BLEND_STEPS * (variationCount - 1)
+        index = min(int(position), variationCount - 2)
+        fraction = position - index
+        weights = [0.0] * variationCount
+        weights[index] = 1.0 - fraction
+        weights[index + 1] = fraction
+        return weights
+
+    def onBlendChanged(self, value):
+        if not self.blend:
+            stateSets = []
+            iter = QTreeWidgetItemIterator(self.treeWidget)
+            while iter.value():
+                treeItem = iter.value()
+                if treeItem.checkState(0) == Qt.Checked:
+                    stateSets.append(treeItem.data(0, Qt.UserRole))
+                iter += 1
+            if len(stateSets) < 2:
+                self.setStatus("Please check two or more variations to blend.")
+                return
+            self.cancelMatchScan()
+            blend = PCVariationBlend(stateSets)
+            loadFailures = [stateSet.name for stateSet in stateSets if stateSet.loadFailed]
+            if loadFailures:
+                self.setStatus("Variation(s) " + ", ".join(loadFailures) + " could not be loaded from the library, they cannot be blended.")
+                return
+            self.blend = blend
+        if not self.blendTimer.isActive(): # throttled, the latest slider value being written when the timer elapses
+            self.blendTimer.start(PCPrefs.instance().blendThrottleMs)
+
+    def onBlendPressed(self):
+        # writes performed while dragging are grouped into a single undo entry
+        self.blendInputLock = PCInputLock(self.hs_blend)
+        self.blendInputLock.lock()
+        self.blendUndoGroup = PCUndoGroup("Variation Blend")
+        self.blendUndoGroup.begin()
+
+    def onBlendReleased(self):
+        if self.blendTimer.isActive():
+            self.blendTimer.stop()
+            self.flushBlend()
+        self.endBlendUndo()
+        self.startMatchScan()
+
+    def endBlendUndo(self):
+        if self.blendUndoGroup:
+            self.blendUndoGroup.end()
+            self.blendUndoGroup = None
+        if self.blendInputLock:
+            self.blendInputLock.unlock()
+            self.blendInputLock = None
+
+    def flushBlend(self):
+        if not self.blend:
+            return
+        firstPass = self.blend.lastChoices is None
+        changes = self.blend.evaluate(self.blendWeights(self.blend.variationCount))
+        stats = PCWriteStats()
+        skipUnchanged = firstPass and PCPrefs.instance().skipUnchangedWrites # next passes only get changed parameters
+        with PCUndoGroup("Variation Blend"): # merged into the drag undo group if any
+            for change in changes:
+                PCVariationBlend.writeChange(change, skipUnchanged, stats)
+        status = "Blend " + str(int(100 * self.hs_blend.value() / PCStatesDlg.BLEND_STEPS)) + "% (" + stats.summary() + ")"
+        if self.blend.misses > 0:
+            status += ", " + str(self.blend.misses) + " node(s) not found"
+        self.setStatus(status)
+        if len(changes) > 0:
+            self.computeGraphIfNeeded()
+
+    def onAssignSlot(self):
+        checkedStateSets = []
+        iter = QTreeWidgetItemIterator(self.treeWidget)
+        while iter.value():
+            treeItem = iter.value()
+            if treeItem.checkState(0) == Qt.Checked:
+                checkedStateSets.append(treeItem.data(0, Qt.UserRole))
+            iter += 1
+        if len(checkedStateSets) != 1:
+            PCHelper.displayErrorMsg("Please select a single variation to assign to a quick recall slot.")
+            return
+
+        recallSlots = PCRecallSlots.instance()
+        menu = QtWidgets.QMenu(self)
+        for slot in range(0, PCRecallSlots.SLOT_COUNT):
+            slotName = recallSlots.slotName(slot)
+            action = menu.addAction("Slot " + str(slot + 1) + (" (" + slotName + ")" if slotName else " (empty)"))
+            action.setData(slot)
+        action = menu.exec_(self.b_assign_slot.mapToGlobal(self.b_assign_slot.rect().bottomLeft()))
+        if action:
+            slot = action.data()
+            recallSlots.assign(slot, checkedStateSets[0]) # recall plan is compiled now so the slot shortcut only performs writes
+            self.setStatus("Variation " + checkedStateSets[0].name + " assigned to quick recall slot " + str(slot + 1) + ".")
+
     def onClose(self):
-        self.close()
+        if self.job and self.job.isRunning():
+            self.job.cancel()
+        else:
+            self.close()
+
+    def closeEvent(self, event):
+        if self.job and self.job.isRunning():
+            self.job.cancel()
+        self.cancelMatchScan()
+        self.resetBlend()
+        super().closeEvent(event)
@@ -0,0 +1,216 @@
+# ---------------
+# ParamCopy - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+import sd
+if sd.getContext().getSDApplication().getVersion() < "14.0.0":
+    from PySide2 import QtCore, QtWidgets
+    from PySide2.QtCore import Qt
+else:
+    from PySide6 import QtCore, QtWidgets
+    from PySide6.QtCore import Qt
+
+from sd.api.apiexception import APIException
+
+from paramcopy.pccore import pclog
+from paramcopy.pccore.pcdata import PCData
+from paramcopy.pccore.pchelper import PCHelper
+from paramcopy.pccore.pcprefs import PCPrefs
+from paramcopy.pccore.pcparammeta import PCParamMetaCache
+from paramcopy.pccore.pcvalue import PCValueCodec
+from paramcopy.pccore.pcsweep import PCSweep, PCSweepAxis
+from paramcopy.pccore.pcstatemgr import PCStateMgr, PCNodeStateSet
+from paramcopy.pccore.pccomputesched import PCComputeScheduler
+
+class PCSweepDlg(QtWidgets.QDialog):
+    PARAM_COLUMN = 0
+    CURRENT_COLUMN = 1
+    VALUES_COLUMN = 2
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.nodeArray = None
+        self.graph = None # graph of the swept nodes
+        self.sweep = None
+        self.setupStaticFields()
+
+    def setupStaticFields(self):
+        self.setObjectName("PCSweepDlg")
+        self.setWindowFlags(self.windowFlags() & ~Qt.WindowContextHelpButtonHint) # remove the Help icon in title bar
+        self.setWindowTitle(PCData.APP_NAME + " - Parameter Sweep")
+        self.resize(560, 480)
+        self.setModal(False)
+
+        self.verticalLayout = QtWidgets.QVBoxLayout(self)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.l_desc = QtWidgets.QLabel(self)
+        self.l_desc.setWordWrap(True)
+        self.l_desc.setObjectName("l_desc")
+        self.verticalLayout.addWidget(self.l_desc)
+        self.tw_params = QtWidgets.QTableWidget(self)
+        self.tw_params.setColumnCount(3)
+        self.tw_params.setHorizontalHeaderLabels(("Parameter", "Current", "Values"))
+        self.tw_params.horizontalHeader().setStretchLastSection(True)
+        self.tw_params.verticalHeader().setVisible(False)
+        self.tw_params.setObjectName("tw_params")
+        self.verticalLayout.addWidget(self.tw_params)
+        self.hl_nav = QtWidgets.QHBoxLayout()
+        self.hl_nav.setObjectName("hl_nav")
+        self.b_start = QtWidgets.QPushButton(self)
+        self.b_start.setObjectName("b_start")
+        self.hl_nav.addWidget(self.b_start)
+        self.b_previous = QtWidgets.QPushButton(self)
+        self.b_previous.setObjectName("b_previous")
+        self.hl_nav.addWidget(self.b_previous)
+        self.b_next = QtWidgets.QPushButton(self)
+        self.b_next.setObjectName("b_next")
+        self.hl_nav.addWidget(self.b_next)
+        self.l_position = QtWidgets.QLabel(self)
+        self.l_position.setObjectName("l_position")
+        self.hl_nav.addWidget(self.l_position, 1)
+        self.verticalLayout.addLayout(self.hl_nav)
+        self.hl_save = QtWidgets.QHBoxLayout()
+        self.hl_save.setObjectName("hl_save")
+        self.le_variation_name = QtWidgets.QLineEdit(self)
+        self.le_variation_name.setObjectName("le_variation_name")
+        self.hl_save.addWidget(self.le_variation_name)
+        self.b_save = QtWidgets.QPushButton(self)
+        self.b_save.setObjectName("b_save")
+        self.hl_save.addWidget(self.b_save)
+        self.verticalLayout.addLayout(self.hl_save)
+        self.bb_close = QtWidgets.QDialogButtonBox(self)
+        self.bb_close.setOrientation(QtCore.Qt.Horizontal)
+        self.bb_close.setStandardButtons(QtWidgets.QDialogButtonBox.Close)
+        self.bb_close.setObjectName("bb_close")
+        self.verticalLayout.addWidget(self.bb_close)
+
+        self.l_desc.setText(QtWidgets.QApplication.translate("PCSweepDlg", "Check parameters and enter their values, separated by commas. Vector components are separated by spaces, ranges are written min..max:count (count optional for integers).", None, -1))
+        self.b_start.setText(QtWidgets.QApplication.translate("PCSweepDlg", "Start", None, -1))
+        self.b_previous.setText(QtWidgets.QApplication.translate("PCSweepDlg", "< Previous", None, -1))
+        self.b_next.setText(QtWidgets.QApplication.translate("PCSweepDlg", "Next >", None, -1))
+        self.le_variation_name.setPlaceholderText(QtWidgets.QApplication.translate("PCSweepDlg", "Variation name", None, -1))
+        self.b_save.setText(QtWidgets.QApplication.translate("PCSweepDlg", "Save as Variation", None, -1))
+
+        self.b_start.clicked.connect(self.onStart)
+        self.b_previous.clicked.connect(self.onPrevious)
+        self.b_next.clicked.connect(self.onNext)
+        self.b_save.clicked.connect(self.onSave)
+        self.bb_close.rejected.connect(self.onClose)
+
+    def show(self, nodeArray, graph):
+        self.nodeArray = nodeArray
+        self.graph = graph
+        self.sweep = None
+        self.tw_params.setRowCount(0)
+        for propMeta, sampleValue in self.sweepableProps():
+            row = self.tw_params.rowCount()
+            self.tw_params.insertRow(row)
+            item = QtWidgets.QTableWidgetItem(propMeta.name)
+            item.setFlags(Qt.ItemIsEnabled | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Unchecked)
+            item.setToolTip(propMeta.id)
+            item.setData(Qt.UserRole, (propMeta.id, propMeta.label, sampleValue))
+            self.tw_params.setItem(row, PCSweepDlg.PARAM_COLUMN, item)
+            item = QtWidgets.QTableWidgetItem(self.valueText(sampleValue))
+            item.setFlags(Qt.ItemIsEnabled)
+            self.tw_params.setItem(row, PCSweepDlg.CURRENT_COLUMN, item)
+            self.tw_params.setItem(row, PCSweepDlg.VALUES_COLUMN, QtWidgets.QTableWidgetItem(""))
+        self.tw_params.resizeColumnToContents(PCSweepDlg.PARAM_COLUMN)
+        self.le_variation_name.clear()
+        self.updateNavigation()
+        super().show()
+
+    def nodes(self):
+        return [self.nodeArray.getItem(n) for n in range(0, self.nodeArray.getSize())]
+
+    def sweepableProps(self):
+        # (PCPropMeta, current encoded value) of the visible parameters of the selected nodes which can be swept
+        props = {}
+        metaCache = PCParamMetaCache.instance()
+        for node in self.nodes():
+            for propMeta in metaCache.getDefMeta(node).props:
+                if propMeta.id in props or propMeta.hidden or propMeta.isFunctionOnly:
+                    continue
+                try:
+                    sampleValue = PCValueCodec.encode(node.getPropertyValue(propMeta.prop))
+                except APIException as e:
+                    PCHelper.logSDException(e)
+                    continue
+                if PCSweepAxis.isSweepable(sampleValue):
+                    props[propMeta.id] = (propMeta, sampleValue)
+        return list(props.values())
+
+    def valueText(self, encodedValue):
+        tag, payload = encodedValue
+        if tag == "enum":
+            payload = payload[1]
+        if isinstance(payload, tuple):
+            return " ".join(str(c) for c in payload)
+        return str(payload)
+
+    def updateNavigation(self):
+        self.b_previous.setEnabled(self.sweep != None and self.sweep.canMovePrevious())
+        self.b_next.setEnabled(self.sweep != None and self.sweep.canMoveNext())
+        self.b_save.setEnabled(self.sweep != None and self.sweep.position >= 0)
+        if self.sweep and self.sweep.position >= 0:
+            self.l_position.setText("Combination " + str(self.sweep.position + 1) + " / " + str(self.sweep.count()))
+            self.l_position.setToolTip("\n".join(axis.label + " = " + self.valueText(encodedValue) for axis, encodedValue in self.sweep.valuesAt(self.sweep.position)))
+        else:
+            self.l_position.setText("")
+            self.l_position.setToolTip("")
+
+    def onStart(self):
+        axes = []
+        for row in range(0, self.tw_params.rowCount()):
+            item = self.tw_params.item(row, PCSweepDlg.PARAM_COLUMN)
+            if item.checkState() != Qt.Checked:
+                continue
+            propertyId, label, sampleValue = item.data(Qt.UserRole)
+            try:
+                axes.append(PCSweepAxis.parse(propertyId, label, self.tw_params.item(row, PCSweepDlg.VALUES_COLUMN).text(), sampleValue))
+            except ValueError as e:
+                PCHelper.displayErrorMsg("Invalid values for parameter " + item.text() + ": " + str(e), self)
+                return
+        if len(axes) == 0:
+            PCHelper.displayErrorMsg("No parameter checked, nothing to sweep.", self)
+            return
+
+        self.sweep = PCSweep(self.nodes(), axes)
+        pclog.log("Parameter sweep: " + str(self.sweep.count()) + " combination(s) over " + str(len(axes)) + " parameter(s)")
+        self.applyStats(self.sweep.moveTo(0, PCPrefs.instance().skipUnchangedWrites))
+
+    def onPrevious(self):
+        if self.sweep and self.sweep.canMovePrevious():
+            self.applyStats(self.sweep.movePrevious(PCPrefs.instance().skipUnchangedWrites))
+
+    def onNext(self):
+        if self.sweep and self.sweep.canMoveNext():
+            self.applyStats(self.sweep.moveNext(PCPrefs.instance().skipUnchangedWrites))
+
+    def applyStats(self, stats):
+        pclog.log("Parameter sweep, combination " + str(self.sweep.position + 1) + ": " + stats.summary())
+        self.updateNavigation()
+        if PCPrefs.instance().computeGraphAfterSweep:
+            PCComputeScheduler.instance().requestCompute(self.graph)
+
+    def onSave(self):
+        variationName = self.le_variation_name.text().strip()
+        if len(variationName) == 0:
+            variationName = "Sweep " + str(self.sweep.position + 1)
+        stateMgr = PCStateMgr.instance()
+        if stateMgr.stateSetNameExists(variationName):
+            PCHelper.displayErrorMsg("A variation with this name already exists, please choose another name.", self)
+            return
+        stateSet = PCNodeStateSet(self.graph, variationName)
+        stateSet.storeNodeStates(self.nodeArray, self.graph)
+        stateMgr.addStateSet(stateSet)
+        self.le_variation_name.clear()
+        pclog.log("Parameter sweep: combination " + str(self.sweep.position + 1) + " saved as variation " + variationName)
+        from paramcopy.pcui.pcuimgr import PCUIMgr
+        PCUIMgr.instance().onNodeStatesUpdated()
+
+    def onClose(self):
+        self.sweep = None
+        self.graph = None
+        self.close()
@@ -0,0 +1,134 @@
+# ---------------
+# ParamCopy - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+# Measures the memory used by stored node states: compact representation (slotted classes, graph contexts,
+# column-oriented parameters) against the previous one, with same synthetic data. Runs with Designer's Python
+# interpreter or a regular one, the Designer API being stubbed then (see tests/sdstub.py):
+#     python tests/bench/membench.py [node count] [params per node]
+
+import importlib.util
+import os
+import sys
+import tracemalloc
+
+testsFolder = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(testsFolder), "src"))
+if importlib.util.find_spec("sd") == None:
+    sys.path.insert(0, testsFolder)
+    import sdstub
+    sdstub.install()
+
+from paramcopy.pccore.pcintern import PCIntern, PCInternPool
+from paramcopy.pccore.pcstatemgr import PCNodeState
+
+# --- Previous representation: data attributes of PCParam, PCParamCollection, PCNodeIdentifier and PCNodeState
+# as they were before the compact one, with their interning of values and node identifiers
+class BaselineParam:
+    def __init__(self, propertyId, propertyLabel, inheritanceMethod, encodedValue, groupName = None):
+        self.id = propertyId
+        self.label = propertyLabel
+        self.inheritanceMethod = inheritanceMethod
+        self.encodedValue = PCIntern.instance().internValue(encodedValue)
+        self.groupName = groupName
+
+    def release(self):
+        PCIntern.instance().releaseValue(self.encodedValue)
+
+class BaselineParamCollection:
+    def __init__(self):
+        self.params = {} # key: input param id, val: BaselineParam
+
+    def release(self):
+        for param in self.params.values():
+            param.release()
+        self.params = {}
+
+    @classmethod
+    def fromData(cls, data):
+        collection = BaselineParamCollection()
+        for propertyId, propertyLabel, inheritanceMethod, encodedValue, groupName in data:
+            collection.params[propertyId] = BaselineParam(propertyId, propertyLabel, inheritanceMethod, encodedValue, groupName)
+        return collection
+
+class BaselineNodeIdentifier:
+    def __init__(self):
+        self.nodeId = None
+        self.graphId = None
+        self.packageId = None
+        self.defId = None
+        self.defLabel = None
+
+    def toData(self):
+        return [self.nodeId, self.graphId, self.packageId, self.defId, self.defLabel]
+
+    @classmethod
+    def fromData(cls, data):
+        nodeIdentifier = BaselineNodeIdentifier()
+        nodeIdentifier.nodeId, nodeIdentifier.graphId, nodeIdentifier.packageId, nodeIdentifier.defId, nodeIdentifier.defLabel = data
+        return nodeIdentifier
+
+class BaselineNodeState:
+    nodeIdentifiers = PCInternPool() # key: node identifier data, val: BaselineNodeIdentifier
+
+    def __init__(self):
+        self.nodeIdentifier = None
+        self.paramCollection = BaselineParamCollection()
+        self.payloadLoader = None
+        self.indexEntry = None
+        self.defaultsId = None
+        self.defaultsScope = None
+
+    def release(self):
+        self.paramCollection.release()
+        BaselineNodeState.nodeIdentifiers.release(tuple(self.nodeIdentifier.toData()))
+
+    @classmethod
+    def fromData(cls, data):
+        nodeState = BaselineNodeState()
+        nodeIdentifier = BaselineNodeIdentifier.fromData(data["node"])
+        nodeState.nodeIdentifier = BaselineNodeState.nodeIdentifiers.acquire(tuple(nodeIdentifier.toData()), nodeIdentifier)
+        nodeState.paramCollection = BaselineParamCollection.fromData(data["params"])
+        return nodeState
+
+# --- Benchmark
+GRAPH_COUNT = 20
+DEF_COUNT = 30
+
+def nodeData(n, paramsPerNode, values):
+    # strings are rebuilt for each node, as when loaded from the library
+    graph = n % GRAPH_COUNT
+    definition = n % DEF_COUNT
+    node = [str(1000000 + n), "graph_" + str(graph), "D:/Packages/materials/package_" + str(graph % 4) + ".sbs",
+            "sbs::compositing::definition_" + str(definition), "Definition " + str(definition)]
+    params = [["param_" + str(p), "Parameter " + str(p), p % 3, values[(n + p) % len(values)], "Group " + str(p % 5)]
+              for p in range(0, paramsPerNode)]
+    return { "node": node, "params": params }
+
+def measure(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used, result
+
+def megabytes(byteCount):
+    return str(round(byteCount / (1024 * 1024), 1)) + " MB"
+
+def run(nodeCount = 20000, paramsPerNode = 40):
+    # interned values are shared by both representations, node data is built within the measures and only
+    # what the node states retain from it is counted
+    values = [PCIntern.instance().internValue(("float", i * 0.25)) for i in range(0, 64)]
+    baselineBytes, baselineStates = measure(lambda: [BaselineNodeState.fromData(nodeData(n, paramsPerNode, values)) for n in range(0, nodeCount)])
+    compactBytes, compactStates = measure(lambda: [PCNodeState.fromData(nodeData(n, paramsPerNode, values)) for n in range(0, nodeCount)])
+    for nodeState in baselineStates + compactStates:
+        nodeState.release()
+
+    print("Memory benchmark, " + str(nodeCount) + " node(s) with " + str(paramsPerNode) + " parameter(s) each:")
+    print("  previous: " + megabytes(baselineBytes) + ", compact: " + megabytes(compactBytes) + \
+          ", reduction: " + str(round(100 * (1 - compactBytes / baselineBytes))) + "%")
+    return baselineBytes, compactBytes
+
+if __name__ == "__main__":
+    run(*[int(arg) for arg in sys.argv[1:3]])
@@ -0,0 +1,110 @@
+# ---------------
+# ParamCopy - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+# Stand-ins for the Substance 3D Designer Python API and PySide, so that the parts of the plugin which do not
+# need a running Designer can be tested with a regular Python interpreter. Any attribute of a stubbed module
+# is a class accepting any call, the few SD types whose behavior matters to the plugin logic being defined below.
+
+import enum
+import importlib.abc
+import importlib.util
+import sys
+import types
+
+class StubObject:
+# accepts any attribute access, call or operation, so that module level setup code can run
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return StubObject()
+
+    def __call__(self, *args, **kwargs):
+        return StubObject()
+
+    def __or__(self, other):
+        return self
+
+    __ror__ = __and__ = __rand__ = __or__
+
+class StubClassMeta(type):
+    def __getattr__(cls, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return StubObject()
+
+class StubModule(types.ModuleType):
+    def __init__(self, name):
+        super().__init__(name)
+        self.__path__ = [] # every stubbed module is a package so that submodules can be imported
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        stubClass = StubClassMeta(name, (StubObject,), {})
+        setattr(self, name, stubClass)
+        return stubClass
+
+class StubFinder(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    def __init__(self, packageNames):
+        self.packageNames = packageNames
+
+    def find_spec(self, fullname, path, target = None):
+        if fullname.split(".")[0] in self.packageNames:
+            return importlib.util.spec_from_loader(fullname, self)
+        return None
+
+    def create_module(self, spec):
+        module = StubModule(spec.name)
+        setup = MODULE_SETUPS.get(spec.name)
+        if setup:
+            setup(module)
+        return module
+
+    def exec_module(self, module):
+        pass
+
+# --- SD types the plugin logic depends on
+class APIException(Exception):
+    pass
+
+class SDPropertyCategory(enum.IntEnum):
+    Annotation = 0
+    Input = 1
+    Output = 2
+
+class SDPropertyInheritanceMethod(enum.IntEnum):
+    RelativeToInput = 0
+    RelativeToParent = 1
+    Absolute = 2
+
+class StubApplication(StubObject):
+    def getVersion(self):
+        return "14.0.0" # PySide6 based Designer
+
+class StubContext(StubObject):
+    def getSDApplication(self):
+        return StubApplication()
+
+def setupSd(module):
+    module.IS_STUB = True # lets tests requiring actual SD values skip
+    module.getContext = lambda: StubContext()
+
+def setupApiException(module):
+    module.APIException = APIException
+
+def setupSdProperty(module):
+    module.SDPropertyCategory = SDPropertyCategory
+    module.SDPropertyInheritanceMethod = SDPropertyInheritanceMethod
+
+MODULE_SETUPS = { "sd": setupSd, "sd.api.apiexception": setupApiException, "sd.api.sdproperty": setupSdProperty }
+
+def install():
+    # stubs sd, and PySide if not installed either
+    packageNames = ["sd", "PySide2"]
+    if importlib.util.find_spec("PySide6") == None:
+        packageNames.append("PySide6")
+    sys.meta_path.insert(0, StubFinder(packageNames))
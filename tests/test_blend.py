@@ -0,0 +1,109 @@
+# ---------------
+# ParamCopy - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from paramcopy.pccore.pcblend import PCVariationBlend
+from paramcopy.pccore.pcparam import PCParam
+
+class NodeIdentifier:
+    def __init__(self, nodeId):
+        self.nodeId = nodeId
+        self.graphId = "graph"
+        self.packageId = "package.sbs"
+
+class Property:
+    def __init__(self, functionDriven):
+        self.functionDriven = functionDriven
+
+    def isFunctionOnly(self):
+        return False
+
+class Node:
+    def __init__(self, nodeId, functionDrivenIds = ()):
+        self.nodeId = nodeId
+        self.functionDrivenIds = functionDrivenIds
+
+    def getPropertyFromId(self, propertyId, category):
+        return Property(propertyId in self.functionDrivenIds)
+
+    def getPropertyGraph(self, prop):
+        return prop.functionDriven # stands for the function graph
+
+class NodeState:
+    def __init__(self, nodeId, params):
+        self.nodeIdentifier = NodeIdentifier(nodeId)
+        self.params = params
+
+    def effectiveParams(self):
+        return self.params
+
+class StateSet:
+# variation storing the given parameters of the given node, key: property id, val: encoded value or (encoded value, inheritance method)
+    def __init__(self, node, values):
+        params = {}
+        for propertyId, value in values.items():
+            encodedValue, inheritanceMethod = value if isinstance(value[0], tuple) else (value, -1)
+            params[propertyId] = PCParam.view(propertyId, None, inheritanceMethod, encodedValue)
+        self.steps = [(NodeState(node.nodeId, params), node)]
+
+    def recallSteps(self, resolver):
+        return self.steps, 0
+
+def blend(*variations, node = None):
+    node = node if node else Node("1")
+    return PCVariationBlend([StateSet(node, values) for values in variations], resolver = object())
+
+def values(changes):
+    return { entry.propertyId: encodedValue for entry, encodedValue, _ in changes }
+
+def test_numeric_values_are_interpolated():
+    variationBlend = blend({ "f": ("float", 0.0), "i": ("int", 0) }, { "f": ("float", 1.0), "i": ("int", 3) })
+    assert values(variationBlend.evaluate([0.25, 0.75])) == { "f": ("float", 0.75), "i": ("int", 2) }
+
+def test_weights_are_normalized():
+    variationBlend = blend({ "f": ("float", 0.0) }, { "f": ("float", 1.0) })
+    assert values(variationBlend.evaluate([2.0, 2.0])) == { "f": ("float", 0.5) }
+
+def test_vector_components_are_interpolated():
+    variationBlend = blend({ "v": ("float3", (0.0, 1.0, 2.0)) }, { "v": ("float3", (1.0, 1.0, 0.0)) })
+    assert values(variationBlend.evaluate([0.5, 0.5])) == { "v": ("float3", (0.5, 1.0, 1.0)) }
+
+def test_other_values_snap_to_highest_weight():
+    variationBlend = blend({ "s": ("string", "a"), "b": ("bool", False) }, { "s": ("string", "b"), "b": ("bool", True) })
+    assert values(variationBlend.evaluate([0.6, 0.4])) == { "s": ("string", "a"), "b": ("bool", False) }
+    assert values(variationBlend.evaluate([0.4, 0.6])) == { "s": ("string", "b"), "b": ("bool", True) }
+
+def test_mixed_types_snap():
+    variationBlend = blend({ "p": ("int", 1) }, { "p": ("float", 2.0) })
+    assert values(variationBlend.evaluate([0.4, 0.6])) == { "p": ("float", 2.0) }
+
+def test_inheritance_method_snaps_to_highest_weight():
+    variationBlend = blend({ "f": (("float", 0.0), 1) }, { "f": (("float", 1.0), 2) })
+    assert [inheritanceMethod for _, _, inheritanceMethod in variationBlend.evaluate([0.3, 0.7])] == [2]
+
+def test_params_blend_over_variations_storing_them():
+    variationBlend = blend({ "f": ("float", 0.2), "g": ("float", 0.0) }, { "g": ("float", 1.0) })
+    assert values(variationBlend.evaluate([0.5, 0.5])) == { "f": ("float", 0.2), "g": ("float", 0.5) }
+    assert values(variationBlend.evaluate([0.0, 1.0])) == { "g": ("float", 1.0) }
+
+def test_equal_values_are_kept_exact():
+    variationBlend = blend({ "f": ("float", 0.1) }, { "f": ("float", 0.1) }, { "f": ("float", 0.1) })
+    assert values(variationBlend.evaluate([0.3, 0.3, 0.4])) == { "f": ("float", 0.1) }
+
+def test_only_changed_values_are_returned():
+    variationBlend = blend({ "f": ("float", 0.0), "c": ("float", 5.0), "s": ("string", "a") }, { "f": ("float", 1.0), "c": ("float", 5.0), "s": ("string", "b") })
+    assert len(variationBlend.evaluate([0.4, 0.6])) == 3
+    assert variationBlend.evaluate([0.4, 0.6]) == []
+    assert values(variationBlend.evaluate([0.3, 0.7])) == { "f": ("float", 0.7) }
+    changes = values(variationBlend.evaluate([0.6, 0.4])) # snapping to another variation also reports inheritance methods
+    assert changes["f"] == ("float", 0.4) and changes["s"] == ("string", "a")
+
+def test_function_driven_params_are_left_out():
+    node = Node("1", functionDrivenIds = ("f",))
+    variationBlend = blend({ "f": ("float", 0.0), "g": ("float", 0.0) }, { "f": ("float", 1.0), "g": ("float", 1.0) }, node = node)
+    assert values(variationBlend.evaluate([0.5, 0.5])) == { "g": ("float", 0.5) }
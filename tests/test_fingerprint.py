@@ -0,0 +1,49 @@
+# ---------------
+# ParamCopy - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+# Requires the Substance 3D Designer Python API (run with Designer's Python interpreter)
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+sd = pytest.importorskip("sd")
+if getattr(sd, "IS_STUB", False):
+    pytest.skip("actual SD values required", allow_module_level=True)
+
+from sd.api.sdproperty import SDPropertyInheritanceMethod
+from sd.api.sdvaluefloat import SDValueFloat
+
+from paramcopy.pccore.pcfingerprint import PCFingerprint, PCLiveFingerprints
+from paramcopy.pccore.pcparam import PCParam, PCParamCollection
+
+class UnchangedNode:
+# node whose parameters have the values they were stored with
+    def __init__(self, values):
+        self.values = values # key: property id, val: (SDPropertyInheritanceMethod, SD value)
+
+    def getIdentifier(self):
+        return "1"
+
+    def getInputPropertyInheritanceMethodFromId(self, propertyId):
+        return self.values[propertyId][0]
+
+    def getInputPropertyValueFromId(self, propertyId):
+        return self.values[propertyId][1]
+
+def test_stored_digest_matches_unchanged_node():
+    node = UnchangedNode({ "opacity": (SDPropertyInheritanceMethod.Absolute, SDValueFloat.sNew(0.5)),
+                           "$outputsize": (SDPropertyInheritanceMethod.RelativeToParent, SDValueFloat.sNew(1.0)) })
+    collection = PCParamCollection()
+    for propertyId, (inheritanceMethod, sdValue) in node.values.items():
+        param = PCParam.fromSDValue(propertyId, None, inheritanceMethod, sdValue)
+        collection.params[propertyId] = param
+        param.release()
+
+    storedDigest = PCFingerprint.digest([param.stateKey() for param in collection.params.values()])
+    liveStates = [PCLiveFingerprints.instance().readState(node, propertyId) for propertyId in reversed(list(node.values))]
+    assert PCFingerprint.digest(liveStates) == storedDigest
+    collection.release()
@@ -0,0 +1,73 @@
+# ---------------
+# ParamCopy - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+import gc
+
+import pytest
+
+from paramcopy.pccore.pcintern import PCIntern, PCInternPool
+
+@pytest.fixture(autouse=True)
+def freshIntern():
+    PCIntern.inst = None
+    yield
+    PCIntern.inst = None
+
+def test_pool_counts_references():
+    pool = PCInternPool()
+    first = pool.acquire(("float", 0.5))
+    second = pool.acquire(("float", 0.5))
+    assert first is second
+    assert pool.size() == 1
+    pool.release(("float", 0.5))
+    assert pool.size() == 1
+    pool.release(("float", 0.5))
+    assert pool.size() == 0
+
+def test_pool_registers_given_object():
+    pool = PCInternPool()
+    obj = object()
+    assert pool.acquire("key", obj) is obj
+    assert pool.acquire("key", object()) is obj
+
+def test_pool_ignores_unknown_release():
+    pool = PCInternPool()
+    pool.release("unknown")
+    assert pool.size() == 0
+
+def test_equal_values_share_one_instance():
+    intern = PCIntern.instance()
+    first = intern.internValue(("float2", (0.5, 1.0)))
+    second = intern.internValue(("float2", (0.5, 1.0)))
+    assert first is second
+    assert intern.values.size() == 1
+    intern.releaseValue(first)
+    intern.releaseValue(second)
+    assert intern.values.size() == 0
+
+def test_none_value_is_not_interned():
+    intern = PCIntern.instance()
+    assert intern.internValue(None) is None
+    intern.releaseValue(None)
+    assert intern.values.size() == 0
+
+def test_graph_context_is_shared_and_freed_with_last_reference():
+    intern = PCIntern.instance()
+    context = intern.graphContext("package.sbs", "graph")
+    assert intern.graphContext("package.sbs", "graph") is context
+    assert intern.graphContext("package.sbs", "other") is not context
+    del context
+    gc.collect()
+    assert ("package.sbs", "graph") not in intern.graphContexts
+
+def test_property_indices_are_stable():
+    intern = PCIntern.instance()
+    index = intern.propertyIndex("opacity", "Opacity", None)
+    assert intern.propertyIndex("opacity", "Opacity", None) == index
+    relabeled = intern.propertyIndex("opacity", "Alpha", None)
+    assert relabeled != index
+    assert intern.propertyAt(relabeled) == ("opacity", "Alpha", None)
+    assert list(intern.propertyIdIndices("opacity")) == [index, relabeled]
+    assert list(intern.propertyIdIndices("unknown")) == []
@@ -0,0 +1,116 @@
+# ---------------
+# ParamCopy - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+from paramcopy.pccore.pcmulticlip import PCNodeMatcher, PCSelectionLayout
+
+class Items(list):
+# SDArray like list
+    def getSize(self):
+        return len(self)
+
+    def getItem(self, index):
+        return self[index]
+
+class Definition:
+    def __init__(self, defId):
+        self.defId = defId
+
+    def getId(self):
+        return self.defId
+
+    def getLabel(self):
+        return self.defId
+
+class Position:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+class Property:
+    def __init__(self, propertyId):
+        self.propertyId = propertyId
+
+    def getId(self):
+        return self.propertyId
+
+    def isConnectable(self):
+        return True
+
+class Connection:
+    def __init__(self, outputNode):
+        self.outputNode = outputNode
+
+    def getOutputPropertyNode(self):
+        return self.outputNode
+
+    def getOutputProperty(self):
+        return Property("output")
+
+class Node:
+# node whose "input" property is connected to the output of the given nodes
+    def __init__(self, nodeId, defId, x, y, inputNodes = ()):
+        self.nodeId = nodeId
+        self.definition = Definition(defId)
+        self.position = Position(x, y)
+        self.inputNodes = inputNodes
+
+    def getIdentifier(self):
+        return self.nodeId
+
+    def getDefinition(self):
+        return self.definition
+
+    def getPosition(self):
+        return self.position
+
+    def getProperties(self, category):
+        return Items([Property("input")])
+
+    def getPropertyConnections(self, prop):
+        return Items([Connection(node) for node in self.inputNodes])
+
+def matchIds(sources, dests, mode = PCNodeMatcher.POSITION):
+    assignment = PCNodeMatcher(mode).match(PCSelectionLayout(sources), PCSelectionLayout(dests))
+    return sorted((sources[s].getIdentifier(), dests[d].getIdentifier()) for s, d in assignment)
+
+def test_relative_positions():
+    layout = PCSelectionLayout([Node("1", "blur", 100, 50), Node("2", "blur", 300, 20)])
+    assert layout.positions == [(0, 30), (200, 0)]
+
+def test_single_candidates_match_by_definition():
+    sources = [Node("s1", "blur", 0, 0), Node("s2", "levels", 500, 0)]
+    dests = [Node("d1", "levels", 0, 0), Node("d2", "blur", 900, 900)]
+    assert matchIds(sources, dests) == [("s1", "d2"), ("s2", "d1")]
+
+def test_same_definitions_match_by_relative_position():
+    sources = [Node("s1", "blur", 0, 0), Node("s2", "blur", 200, 0), Node("s3", "blur", 0, 200)]
+    dests = [Node("d1", "blur", 1000, 1200), Node("d2", "blur", 1200, 1000), Node("d3", "blur", 1000, 1000)] # moved as a block
+    assert matchIds(sources, dests) == [("s1", "d3"), ("s2", "d2"), ("s3", "d1")]
+
+def test_moved_nodes_match_in_reading_order():
+    sources = [Node("s1", "blur", 0, 500), Node("s2", "blur", 0, 0), Node("s3", "blur", 1000, 0)]
+    dests = [Node("d1", "blur", 0, 0), Node("d2", "blur", 400, 0), Node("d3", "blur", 0, 900)]
+    assert matchIds(sources, dests) == [("s1", "d3"), ("s2", "d1"), ("s3", "d2")]
+
+def test_unmatched_nodes_are_left_out():
+    sources = [Node("s1", "blur", 0, 0)]
+    dests = [Node("d1", "blur", 0, 0), Node("d2", "blur", 100, 0), Node("d3", "levels", 0, 0)]
+    assert matchIds(sources, dests) == [("s1", "d1")]
+
+def test_connections_take_precedence_over_positions():
+    sourceOutput = Node("s1", "levels", 100, 0)
+    sources = [sourceOutput, Node("s2", "blur", 0, 0, [sourceOutput]), Node("s3", "blur", 0, 300)]
+    destOutput = Node("d1", "levels", 100, 0)
+    dests = [destOutput, Node("d2", "blur", 0, 300, [destOutput]), Node("d3", "blur", 0, 0)]
+    assert matchIds(sources, dests) == [("s1", "d1"), ("s2", "d3"), ("s3", "d2")]
+    assert matchIds(sources, dests, PCNodeMatcher.CONNECTIONS) == [("s1", "d1"), ("s2", "d2"), ("s3", "d3")]
+
+def test_identically_wired_blocks_get_identical_labels():
+    first = Node("1", "levels", 0, 0)
+    second = Node("3", "levels", 500, 500)
+    layout = PCSelectionLayout([first, Node("2", "blur", 0, 100, [first]), second, Node("4", "blur", 500, 600, [second])])
+    assert layout.topologyLabels[0] == layout.topologyLabels[2]
+    assert layout.topologyLabels[1] == layout.topologyLabels[3]
+    assert layout.topologyLabels[0] != layout.topologyLabels[1]
@@ -0,0 +1,118 @@
+# ---------------
+# ParamCopy - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+import pytest
+
+from sd.api.sdproperty import SDPropertyInheritanceMethod
+
+from paramcopy.pccore.pcintern import PCIntern
+from paramcopy.pccore.pcparam import PCParam, PCParamCollection, PCParamColumns
+
+@pytest.fixture(autouse=True)
+def freshIntern():
+    PCIntern.inst = None
+    yield
+    PCIntern.inst = None
+
+def refCount(encodedValue):
+    entry = PCIntern.instance().values.entries.get(encodedValue)
+    return entry[1] if entry else 0
+
+def store(columns, propertyId, encodedValue, inheritanceMethod = -1, label = None):
+    # stores a new parameter, columns keeping the only reference
+    param = PCParam(propertyId, label, inheritanceMethod, encodedValue)
+    columns[propertyId] = param
+    param.release()
+
+def test_parameters_keep_insertion_order():
+    columns = PCParamColumns()
+    store(columns, "b", ("int", 1))
+    store(columns, "a", ("int", 2))
+    store(columns, "c", ("int", 3))
+    assert list(columns) == ["b", "a", "c"]
+    assert [param.encodedValue for param in columns.values()] == [("int", 1), ("int", 2), ("int", 3)]
+    assert [propertyId for propertyId, _ in columns.items()] == ["b", "a", "c"]
+    assert len(columns) == 3
+    assert "a" in columns and not "d" in columns
+
+def test_access_builds_equivalent_param():
+    columns = PCParamColumns()
+    store(columns, "opacity", ("float", 0.5), SDPropertyInheritanceMethod.Absolute, "Opacity")
+    param = columns["opacity"]
+    assert (param.id, param.label, param.inheritanceMethod, param.encodedValue) == ("opacity", "Opacity", SDPropertyInheritanceMethod.Absolute, ("float", 0.5))
+    assert columns.get("unknown") is None
+    with pytest.raises(KeyError):
+        columns["unknown"]
+
+def test_stored_value_holds_one_reference():
+    columns = PCParamColumns()
+    store(columns, "opacity", ("float", 0.5))
+    assert refCount(("float", 0.5)) == 1
+
+def test_replaced_value_is_released():
+    columns = PCParamColumns()
+    store(columns, "opacity", ("float", 0.5))
+    store(columns, "opacity", ("float", 1.0))
+    assert len(columns) == 1
+    assert columns["opacity"].encodedValue == ("float", 1.0)
+    assert refCount(("float", 0.5)) == 0
+    assert refCount(("float", 1.0)) == 1
+
+def test_storing_own_param_again_keeps_reference():
+    columns = PCParamColumns()
+    store(columns, "opacity", ("float", 0.5))
+    columns["opacity"] = columns["opacity"]
+    assert refCount(("float", 0.5)) == 1
+    assert columns["opacity"].encodedValue == ("float", 0.5)
+
+def test_copied_param_holds_reference_in_each_collection():
+    source = PCParamColumns()
+    dest = PCParamColumns()
+    store(source, "opacity", ("float", 0.5))
+    dest["opacity"] = source["opacity"]
+    assert refCount(("float", 0.5)) == 2
+    source.release()
+    assert refCount(("float", 0.5)) == 1
+    assert dest["opacity"].encodedValue == ("float", 0.5)
+
+def test_relabeled_param_replaces_slot():
+    columns = PCParamColumns()
+    store(columns, "opacity", ("float", 0.5), label = "Opacity")
+    store(columns, "other", ("float", 0.25))
+    store(columns, "opacity", ("float", 0.5), label = "Alpha")
+    assert list(columns) == ["opacity", "other"]
+    assert columns["opacity"].label == "Alpha"
+    assert refCount(("float", 0.5)) == 1
+
+def test_deletion_releases_value_and_keeps_order():
+    columns = PCParamColumns()
+    store(columns, "a", ("int", 1))
+    store(columns, "b", ("int", 2))
+    store(columns, "c", ("int", 3))
+    del columns["a"]
+    assert list(columns) == ["b", "c"]
+    assert columns["c"].encodedValue == ("int", 3)
+    assert refCount(("int", 1)) == 0
+    with pytest.raises(KeyError):
+        del columns["a"]
+
+def test_release_frees_all_values():
+    columns = PCParamColumns()
+    store(columns, "a", ("int", 1))
+    store(columns, "b", ("int", 1))
+    assert refCount(("int", 1)) == 2
+    columns.release()
+    assert len(columns) == 0
+    assert PCIntern.instance().values.size() == 0
+
+def test_collection_from_data_and_diff():
+    collection = PCParamCollection.fromData([["a", None, -1, ["float2", [0.5, 1.0]], None], ["b", None, -1, ["int", 1], None]])
+    assert collection.params["a"].encodedValue == ("float2", (0.5, 1.0))
+    assert refCount(("float2", (0.5, 1.0))) == 1
+    other = PCParamCollection.fromData([["a", None, -1, ["float2", [0.5, 1.0]], None], ["c", None, -1, ["int", 1], None]])
+    assert sorted(collection.diff(other)) == ["b", "c"]
+    collection.release()
+    other.release()
+    assert PCIntern.instance().values.size() == 0
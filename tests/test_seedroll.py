@@ -0,0 +1,112 @@
+# ---------------
+# ParamCopy - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+import pytest
+
+from paramcopy.pccore.pchelper import PCHelper
+from paramcopy.pccore.pcintern import PCIntern
+from paramcopy.pccore.pcnoderesolver import PCNodeResolver
+from paramcopy.pccore.pcparam import PCWriteStats
+from paramcopy.pccore.pcseedroll import PCSeedRoll, PCSeedRoller
+
+class Value:
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+class Node:
+    def __init__(self, nodeId, seed):
+        self.nodeId = nodeId
+        self.seed = seed
+
+    def getIdentifier(self):
+        return self.nodeId
+
+    def getInputPropertyValueFromId(self, propertyId):
+        return Value(self.seed)
+
+class Graph:
+    def getPackage(self):
+        return None
+
+    def getIdentifier(self):
+        return "graph"
+
+@pytest.fixture
+def roller(monkeypatch):
+    # roller writing seeds into the fake nodes of a single graph
+    PCIntern.inst = None
+    nodes = { nodeId: Node(nodeId, seed) for nodeId, seed in (("0012", 5), ("12", 6), ("7", 7)) }
+    monkeypatch.setattr(PCHelper, "getPackageId", classmethod(lambda cls, package: "package.sbs"))
+    monkeypatch.setattr(PCNodeResolver, "getGraphNodes", lambda self, packageId, graphId: nodes)
+    roller = PCSeedRoller()
+    def writeSeeds(rolledNodes, seeds, undoName):
+        for node, seed in zip(rolledNodes, seeds):
+            if node:
+                node.seed = seed
+        return PCWriteStats()
+    roller.writeSeeds = writeSeeds
+    roller.nodes = nodes
+    yield roller
+    PCIntern.inst = None
+
+def seeds(roller):
+    return { nodeId: node.seed for nodeId, node in roller.nodes.items() }
+
+def test_node_ids_are_kept_verbatim():
+    assert list(PCSeedRoll(1, None, ["0012", "12", "7"], [0, 1, 2]).nodeIds) == ["0012", "12", "7"]
+    assert list(PCSeedRoll(1, None, ["0012", "a3f"], [0, 1]).nodeIds) == ["0012", "a3f"]
+
+def test_seeds_are_derived_from_master_seed():
+    seedRoll = PCSeedRoll(1234, None, ["1", "2", "3"], [0, 0, 0])
+    nodeSeeds = seedRoll.seeds()
+    assert nodeSeeds == PCSeedRoll(1234, None, ["4", "5", "6"], [0, 0, 0]).seeds()
+    assert nodeSeeds != PCSeedRoll(1235, None, ["1", "2", "3"], [0, 0, 0]).seeds()
+    assert all(-(1 << 31) <= seed < (1 << 31) for seed in nodeSeeds)
+
+def test_step_back_restores_previous_seeds(roller):
+    before = seeds(roller)
+    roller.roll(list(roller.nodes.values()), Graph())
+    rolled = seeds(roller)
+    assert rolled != before
+    assert roller.canStepBack()
+    _, missing = roller.stepBack()
+    assert missing == 0
+    assert seeds(roller) == before
+    assert not roller.canStepBack()
+
+def test_reroll_writes_same_seeds_again(roller):
+    roller.roll(list(roller.nodes.values()), Graph())
+    rolled = seeds(roller)
+    for node in roller.nodes.values():
+        node.seed = 0
+    roller.reroll()
+    assert seeds(roller) == rolled
+
+def test_missing_nodes_are_counted(roller):
+    roller.roll(list(roller.nodes.values()), Graph())
+    del roller.nodes["0012"]
+    _, missing = roller.stepBack()
+    assert missing == 1
+
+def test_rolling_after_step_back_discards_later_rolls(roller):
+    nodes = list(roller.nodes.values())
+    for _ in range(0, 3):
+        roller.roll(nodes, Graph())
+    roller.stepBack()
+    roller.stepBack()
+    roller.roll(nodes, Graph())
+    assert len(roller.history) == 2
+    assert roller.position == 1
+
+def test_history_is_bounded(roller, monkeypatch):
+    monkeypatch.setattr(PCSeedRoller, "MAX_HISTORY", 3)
+    nodes = list(roller.nodes.values())
+    for _ in range(0, 5):
+        roller.roll(nodes, Graph())
+    assert len(roller.history) == 3
+    assert roller.position == 2
@@ -0,0 +1,63 @@
+# ---------------
+# ParamCopy - Substance 3D Designer plugin
+# (c) 2019-2025 Eyosido Software SARL
+# ---------------
+
+import pytest
+
+from paramcopy.pccore.pcsweep import PCSweep, PCSweepAxis, PCSweepRange
+
+def test_range_values_include_bounds():
+    values = PCSweepRange("float", (0.0,), (1.0,), 5)
+    assert len(values) == 5
+    assert [values[i] for i in range(0, 5)] == [("float", 0.0), ("float", 0.25), ("float", 0.5), ("float", 0.75), ("float", 1.0)]
+    assert values[-1] == ("float", 1.0)
+    with pytest.raises(IndexError):
+        values[5]
+
+def test_single_value_range_gives_start():
+    assert list(PCSweepRange("float2", (1.0, 2.0), (3.0, 4.0), 1)) == [("float2", (1.0, 2.0))]
+
+def test_int_range_rounds_components():
+    assert list(PCSweepRange("int", (0.0,), (4.0,), 4)) == [("int", 0), ("int", 1), ("int", 3), ("int", 4)]
+
+def test_parse_value_list():
+    axis = PCSweepAxis.parse("opacity", "Opacity", "0.5, 1, 2", ("float", 0.0))
+    assert list(axis) == [("float", 0.5), ("float", 1.0), ("float", 2.0)]
+
+def test_parse_vector_values():
+    axis = PCSweepAxis.parse("offset", None, "0.5 0.25, 1", ("float2", (0.0, 0.0)))
+    assert list(axis) == [("float2", (0.5, 0.25)), ("float2", (1.0, 1.0))]
+
+def test_parse_ranges_and_values_are_chained():
+    axis = PCSweepAxis.parse("opacity", None, "0..1:3, 5", ("float", 0.0))
+    assert len(axis) == 4
+    assert list(axis) == [("float", 0.0), ("float", 0.5), ("float", 1.0), ("float", 5.0)]
+    with pytest.raises(IndexError):
+        axis[4]
+
+def test_parse_int_range_defaults_to_consecutive_values():
+    assert list(PCSweepAxis.parse("count", None, "1..4", ("int", 0))) == [("int", 1), ("int", 2), ("int", 3), ("int", 4)]
+    assert list(PCSweepAxis.parse("count", None, "3..1", ("int", 0))) == [("int", 3), ("int", 2), ("int", 1)]
+
+def test_parse_bool_and_enum():
+    assert list(PCSweepAxis.parse("flag", None, "true, 0", ("bool", False))) == [("bool", True), ("bool", False)]
+    assert list(PCSweepAxis.parse("mode", None, "2, 0", ("enum", ("enumType", 1)))) == [("enum", ("enumType", 2)), ("enum", ("enumType", 0))]
+
+@pytest.mark.parametrize("text, sampleValue", [
+    ("", ("float", 0.0)),
+    ("0..1", ("float", 0.0)),
+    ("0..1:0", ("float", 0.0)),
+    ("1 2 3", ("float2", (0.0, 0.0))),
+    ("yes", ("bool", False)),
+    ("a", ("float", 0.0)),
+])
+def test_parse_rejects_invalid_text(text, sampleValue):
+    with pytest.raises(ValueError):
+        PCSweepAxis.parse("param", None, text, sampleValue)
+
+def test_combination_indices_vary_last_axis_fastest():
+    sweep = PCSweep([], [PCSweepAxis.parse("a", None, "1, 2", ("int", 0)), PCSweepAxis.parse("b", None, "1..3", ("int", 0))])
+    assert sweep.count() == 6
+    assert [sweep.indicesAt(position) for position in range(0, 6)] == [[0, 0], [0, 1], [0, 2], [1, 0], [1, 1], [1, 2]]
+    assert [value for _, value in sweep.valuesAt(5)] == [("int", 2), ("int", 3)]